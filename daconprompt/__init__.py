@@ -0,0 +1,6 @@
+"""
+데이콘 자동차 뉴스 분류 프롬프트 실험용 공용 패키지
+
+각 스크립트는 필요한 모듈만 직접 import 한다.
+(예: from daconprompt.client import LLMClient)
+"""
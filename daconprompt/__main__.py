@@ -0,0 +1,5 @@
+"""python -m daconprompt"""
+
+from daconprompt.cli import main
+
+main()
@@ -0,0 +1,148 @@
+"""
+후보 프롬프트 평가 예산 배분 (successive halving + 신뢰구간 제거)
+모든 후보를 무작위 순서의 작은 샘플 묶음으로 먼저 채점하고, 라운드마다 하위 후보를
+버려 남은 호출을 상위 후보에 집중 → 46샘플 × 10개 예산으로 100개 이상 선별
+
+모든 후보가 같은 순서(seed 로 고정)의 샘플을 보므로 라운드 간 비교가 같은 샘플 기준
+"""
+
+import math
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from daconprompt.early_stop import wilson_upper_bound
+from daconprompt.engine import build_result
+from daconprompt.scoring import calculate_dacon_score
+
+
+class SuccessiveHalving:
+    """예산 제한 successive halving 스케줄러
+
+    engine: EvaluationEngine (evaluate_jobs 로 라운드마다 생존 후보를 동시 평가)
+    budget: 총 호출 수 상한 (프롬프트 × 샘플), 기본은 후보 10개 전수 평가 분량
+    eta: 라운드마다 상위 1/eta 만 남기고 생존 후보의 누적 샘플 수는 eta 배
+    confidence: 있으면 Wilson 신뢰상한 점수가 1위의 신뢰하한 점수보다 낮은 후보도 제거 (UCB)
+    """
+
+    def __init__(self, engine, df: pd.DataFrame, budget: Optional[int] = None,
+                 eta: int = 2, confidence: Optional[float] = None,
+                 seed: int = 0, verbose: bool = True):
+        self.engine = engine
+        self.df = df
+        self.budget = budget or len(df) * 10
+        self.eta = eta
+        self.confidence = confidence
+        self.seed = seed
+        self.verbose = verbose
+        self.order = np.random.default_rng(seed).permutation(len(df))
+
+    def _plan(self, n_arms: int, first: int) -> List[Tuple[int, int]]:
+        """첫 라운드 샘플 수 first 일 때 라운드별 (생존 후보 수, 누적 샘플 수) - 마지막은 전체 샘플"""
+        n_samples = len(self.df)
+        plan, arms, samples = [], n_arms, first
+        while True:
+            samples = min(samples, n_samples)
+            plan.append((arms, samples))
+            if samples == n_samples:
+                return plan
+            arms = max(1, math.ceil(arms / self.eta))
+            samples *= self.eta
+
+    @staticmethod
+    def _cost(plan: List[Tuple[int, int]]) -> int:
+        return sum(arms * (samples - prev) for (arms, samples), (_, prev)
+                   in zip(plan, [(0, 0)] + plan[:-1]))
+
+    def schedule(self, n_arms: int) -> List[Tuple[int, int]]:
+        """예산 안에 드는 가장 큰 첫 라운드 샘플 수의 계획 (1개로도 넘치면 예산까지 자름)"""
+        best = None
+        for first in range(1, len(self.df) + 1):
+            plan = self._plan(n_arms, first)
+            if self._cost(plan) > self.budget:
+                break
+            best = plan
+        if best is None:
+            best = self._plan(n_arms, 1)
+            while len(best) > 1 and self._cost(best) > self.budget:
+                best.pop()
+        return best
+
+    def _bounds(self, arm: Dict) -> Dict[str, float]:
+        """후보 점수 (평균, 신뢰하한, 신뢰상한)
+
+        채점된 샘플이 없으면 (요청이 모두 실패) 평균 0점, 구간은 정확도 0~1 전체
+        """
+        done, correct = len(arm['details']), arm['correct']
+        if done == 0:
+            bounds = {'mean': 0.0}
+            if self.confidence is not None:
+                bounds['upper'] = calculate_dacon_score(1.0, arm['length'])
+                bounds['lower'] = calculate_dacon_score(0.0, arm['length'])
+            return bounds
+
+        bounds = {'mean': calculate_dacon_score(correct / done, arm['length'])}
+        if self.confidence is not None:
+            upper = wilson_upper_bound(correct, done, self.confidence)
+            lower = 1 - wilson_upper_bound(done - correct, done, self.confidence)
+            bounds['upper'] = calculate_dacon_score(upper, arm['length'])
+            bounds['lower'] = calculate_dacon_score(lower, arm['length'])
+        return bounds
+
+    def _select(self, survivors: List[str], arms: Dict[str, Dict], keep: int) -> List[str]:
+        """점수 상위 keep 개 유지 (+ 신뢰구간이 1위와 겹치지 않는 후보 제거)"""
+        bounds = {name: self._bounds(arms[name]) for name in survivors}
+        ranked = sorted(survivors, key=lambda name: -bounds[name]['mean'])[:keep]
+        if self.confidence is not None:
+            leader = bounds[ranked[0]]['lower']
+            ranked = [name for name in ranked if bounds[name]['upper'] >= leader]
+        return ranked
+
+    def run(self, prompts: Dict[str, str]) -> Dict:
+        """선별 실행 → {'results': 순위순 결과, 'calls', 'full_cost', 'rounds'}"""
+        arms = {name: {'text': text, 'length': len(text), 'details': [], 'failed': [], 'correct': 0,
+                       'eliminated': None}
+                for name, text in prompts.items()}
+        survivors = list(prompts)
+        plan = self.schedule(len(survivors)) if survivors else []
+        if self.verbose and plan:
+            print(f"  계획: {' → '.join(f'{a}개×{s}' for a, s in plan)} "
+                  f"(호출 {self._cost(plan)}/{self.budget}, 전수 평가 {len(self.df) * len(prompts)})")
+
+        calls = done = 0
+        for round_no, (planned, samples) in enumerate(plan, 1):
+            if round_no > 1:
+                keep = self._select(survivors, arms, planned)
+                for name in survivors:
+                    if name not in keep:
+                        arms[name]['eliminated'] = round_no - 1
+                survivors = keep
+
+            batch = self.df.iloc[self.order[done:samples]]
+            results = self.engine.evaluate_jobs(
+                [(name, arms[name]['text'], batch) for name in survivors])
+            for name, result in zip(survivors, results):
+                arms[name]['details'].extend(result['detailed_results'])
+                arms[name]['correct'] += result['correct']
+                arms[name]['failed'].extend(result.get('failed', []))  # 요청 실패는 채점 제외
+            calls += len(batch) * len(survivors)
+            done = samples
+            if self.verbose:
+                print(f"  라운드 {round_no}: 후보 {len(survivors)}개 × {samples}샘플 "
+                      f"(누적 호출 {calls})")
+
+        results = []
+        for name, arm in arms.items():
+            result = build_result(name, arm['text'], arm['details'], arm['failed'])
+            result.update(evaluated=len(arm['details']), eliminated_round=arm['eliminated'])
+            results.append(result)
+        # 끝까지 남은 후보 → 늦게 탈락한 순, 같은 그룹 안에서는 점수순
+        results.sort(key=lambda r: (r['eliminated_round'] is not None,
+                                    -(r['eliminated_round'] or 0), -r['dacon_score']))
+        return {
+            'results': results,
+            'calls': calls,
+            'full_cost': len(self.df) * len(prompts),
+            'rounds': len(plan),
+        }
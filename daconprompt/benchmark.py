@@ -0,0 +1,174 @@
+"""
+평가 파이프라인 벤치마크
+(1) 규칙 분류기 처리량 - samples.csv 를 합성으로 늘린 데이터에서 RuleClassifier(기사별)와
+    VectorizedRules(출현 행렬 일괄) 기사/초
+(2) LLM 클라이언트 처리량 - 프로세스 안 모의 서버(mock_server)에 동시 수준별 요청/초
+(3) 결과 저장소 쓰기·읽기 행/초
+
+결과는 JSON 한 개 (metrics 는 모두 "클수록 좋음") 로 저장해 버전 간 회귀 비교 (compare)
+"""
+
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from daconprompt.client import LLMClient
+from daconprompt.engine import EvaluationEngine
+from daconprompt.incidence import VectorizedRules
+from daconprompt.mock_server import MockLLMServer
+from daconprompt.results_store import ResultsStore
+from daconprompt.rules import RuleClassifier, load_spec
+
+_SENTENCE_SPLIT = ". "
+
+
+def best_of(fn: Callable[[], object], repeat: int = 3) -> float:
+    """fn 을 repeat 번 실행한 최소 소요 시간 (초)"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def synthetic_samples(df: pd.DataFrame, scale: int, seed: int = 0) -> pd.DataFrame:
+    """샘플을 scale 배로 늘림 (복사본은 본문 문장 순서를 섞어 키워드·길이 분포는 유지)"""
+    rng = np.random.default_rng(seed)
+    frames = [df]
+    for copy in range(1, scale):
+        contents = []
+        for content in df['content']:
+            sentences = str(content).split(_SENTENCE_SPLIT)
+            contents.append(_SENTENCE_SPLIT.join(sentences[i] for i in rng.permutation(len(sentences))))
+        frames.append(df.assign(ID=[f"{i}_x{copy}" for i in df['ID']], content=contents))
+    return pd.concat(frames, ignore_index=True)
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def bench_rules(df: pd.DataFrame, rule_paths: Sequence[str], repeat: int = 3) -> List[Dict]:
+    """규칙 파일별 기사별 판정 / 일괄(행렬 구성 포함) 판정 처리량"""
+    titles, contents = df['title'].tolist(), df['content'].tolist()
+    rows = []
+    for path in rule_paths:
+        spec = load_spec(path)
+        classifier = RuleClassifier(spec)
+        scalar = best_of(lambda: [classifier.predict(t, c) for t, c in zip(titles, contents)], repeat)
+        vectorized = best_of(lambda: VectorizedRules(spec, titles, contents).predict(), repeat)
+        rows.append({
+            'rules': spec.get('name', path),
+            'articles': len(df),
+            'scalar_per_s': len(df) / scalar,
+            'vectorized_per_s': len(df) / vectorized,
+        })
+    return rows
+
+
+def bench_client(df: pd.DataFrame, concurrency_levels: Sequence[int], latency: str = "fixed:0.02",
+                 ttft: bool = False) -> List[Dict]:
+    """모의 서버(슬롯 = 최대 동시 수준)에 동시 수준별로 샘플 전체를 평가 → 요청/초"""
+    rows = []
+    with MockLLMServer(latency=latency, parallel=max(concurrency_levels)) as server:
+        for concurrency in concurrency_levels:
+            client = LLMClient(server.url, verbose=False, circuit_breaker=False)
+            engine = EvaluationEngine(client, concurrency=concurrency, verbose=False, measure_ttft=ttft)
+            start = time.perf_counter()
+            result = engine.evaluate_prompt("bench", "벤치마크", df)
+            elapsed = time.perf_counter() - start
+            rows.append({
+                'concurrency': concurrency,
+                'requests': len(df),
+                'failed': len(result.get('failed', [])),
+                'seconds': elapsed,
+                'requests_per_s': len(df) / elapsed,
+            })
+    return rows
+
+
+def bench_store(n_prompts: int = 20, n_samples: int = 500) -> Dict:
+    """임시 DB 에 프롬프트 n_prompts × 샘플 n_samples 결과 쓰기/읽기"""
+    results = [{
+        'name': f"prompt_{p}", 'length': 300, 'accuracy': 0.5, 'correct': n_samples // 2,
+        'total': n_samples, 'dacon_score': 0.5, 'errors': [],
+        'detailed_results': [{'id': f"S{s}", 'title': "제목", 'actual': s % 2, 'predicted': (s * p) % 2,
+                              'correct': s % 2 == (s * p) % 2, 'response': "1"} for s in range(n_samples)],
+    } for p in range(n_prompts)]
+    rows = n_prompts * n_samples
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = ResultsStore(os.path.join(directory, "bench.sqlite"))
+        start = time.perf_counter()
+        run_id = store.start_run("benchmark")
+        store.add_results(run_id, results)
+        write = time.perf_counter() - start
+        read = best_of(lambda: store.load_results(run_id))
+        query = best_of(lambda: store.correctness(run_id=run_id))
+        store.close()
+
+    return {'rows': rows, 'write_rows_per_s': rows / write,
+            'load_rows_per_s': rows / read, 'correctness_rows_per_s': rows / query}
+
+
+def run_suite(df: pd.DataFrame, rule_paths: Sequence[str], scale: int = 20,
+              concurrency_levels: Sequence[int] = (1, 2, 4, 8, 16), latency: str = "fixed:0.02",
+              client_samples: int = 200, store_size=(20, 500), verbose: bool = True) -> Dict:
+    """전체 벤치마크 → {'meta', 'rules', 'client', 'store', 'metrics'}"""
+    def log(message: str):
+        if verbose:
+            print(message)
+
+    report = {'meta': {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'scale': scale,
+        'latency': latency,
+    }}
+
+    synthetic = synthetic_samples(df, scale)
+    log(f"규칙 분류기: 기사 {len(synthetic)}개 (×{scale})")
+    report['rules'] = bench_rules(synthetic, rule_paths)
+
+    client_df = synthetic.head(client_samples)
+    log(f"LLM 클라이언트: 요청 {len(client_df)}개 × 동시 {list(concurrency_levels)} (모의 서버 {latency})")
+    report['client'] = bench_client(client_df, concurrency_levels, latency)
+
+    log(f"결과 저장소: 프롬프트 {store_size[0]} × 샘플 {store_size[1]}")
+    report['store'] = bench_store(*store_size)
+
+    metrics = {}
+    for row in report['rules']:
+        metrics[f"rules.{row['rules']}.scalar_per_s"] = row['scalar_per_s']
+        metrics[f"rules.{row['rules']}.vectorized_per_s"] = row['vectorized_per_s']
+    for row in report['client']:
+        metrics[f"client.c{row['concurrency']}.requests_per_s"] = row['requests_per_s']
+    for key in ('write_rows_per_s', 'load_rows_per_s', 'correctness_rows_per_s'):
+        metrics[f"store.{key}"] = report['store'][key]
+    report['metrics'] = metrics
+    return report
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float = 0.1) -> pd.DataFrame:
+    """두 보고서의 metrics 비교 (ratio = 현재/기준, tolerance 이상 느려지면 regression)"""
+    rows = []
+    for name, value in current['metrics'].items():
+        old = baseline.get('metrics', {}).get(name)
+        ratio = value / old if old else None
+        rows.append({'metric': name, 'baseline': old, 'current': value, 'ratio': ratio,
+                     'regression': ratio is not None and ratio < 1 - tolerance})
+    return pd.DataFrame(rows)
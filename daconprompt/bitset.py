@@ -0,0 +1,194 @@
+"""
+샘플 × 프롬프트 × 실행 정오 비트 행렬
+샘플 축을 비트로 묶어(np.packbits) 프롬프트 수백 개·실행 수백 회도 작은 배열 하나로 들고,
+실패 합집합/교집합, 샘플 난이도, 프롬프트 쌍 상호보완성을 비트 연산으로 바로 계산
+(앙상블 조합 탐색은 predictions() 로 복원한 예측을 daconprompt.ensemble 에서 사용)
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+if hasattr(np, "bitwise_count"):
+    _popcount = np.bitwise_count
+else:  # numpy < 2.0
+    _POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def _popcount(array: np.ndarray) -> np.ndarray:
+        return _POPCOUNT_TABLE[array]
+
+
+def _pack(bits: np.ndarray) -> np.ndarray:
+    """마지막 축(샘플)을 비트로 압축"""
+    return np.packbits(bits.astype(bool), axis=-1, bitorder="little")
+
+
+class CorrectnessMatrix:
+    """정오 비트 행렬
+
+    correct / known: (실행, 프롬프트, ⌈샘플/8⌉) uint8
+      known 은 해당 (실행, 프롬프트)가 그 샘플을 평가했는지 (조기 중단·누락 구분)
+    labels: 샘플별 정답 레이블
+    """
+
+    def __init__(self, sample_ids: Sequence[str], prompts: Sequence[str], runs: Sequence[str],
+                 correct: np.ndarray, known: np.ndarray, labels: np.ndarray):
+        self.sample_ids = [str(s) for s in sample_ids]
+        self.prompts = list(prompts)
+        self.runs = list(runs)
+        self.correct = correct
+        self.known = known
+        self.labels = np.asarray(labels, dtype=np.int8)
+        self.n_samples = len(self.sample_ids)
+        self._prompt_index = {p: i for i, p in enumerate(self.prompts)}
+        self._run_index = {r: i for i, r in enumerate(self.runs)}
+
+    # ---- 생성 ----
+
+    @classmethod
+    def from_runs(cls, runs: Dict[str, List[Dict]]) -> "CorrectnessMatrix":
+        """{run_id: evaluate_prompt 결과 목록} → 행렬"""
+        sample_ids: Dict[str, int] = {}
+        prompts: Dict[str, int] = {}
+        labels: Dict[str, int] = {}
+        for results in runs.values():
+            for result in results:
+                prompts.setdefault(result['name'], len(prompts))
+                for d in result['detailed_results']:
+                    sample_ids.setdefault(str(d['id']), len(sample_ids))
+                    labels[str(d['id'])] = int(d['actual'])
+
+        shape = (len(runs), len(prompts), len(sample_ids))
+        correct = np.zeros(shape, dtype=bool)
+        known = np.zeros(shape, dtype=bool)
+        for r, results in enumerate(runs.values()):
+            for result in results:
+                p = prompts[result['name']]
+                for d in result['detailed_results']:
+                    s = sample_ids[str(d['id'])]
+                    known[r, p, s] = True
+                    correct[r, p, s] = bool(d['correct'])
+
+        return cls(list(sample_ids), list(prompts), list(runs), _pack(correct), _pack(known),
+                   np.array([labels[s] for s in sample_ids]))
+
+    @classmethod
+    def from_results(cls, results: List[Dict], run_id: str = "run") -> "CorrectnessMatrix":
+        """실행 1회 결과 목록 → 행렬"""
+        return cls.from_runs({run_id: results})
+
+    @classmethod
+    def from_store(cls, store, run_ids: Optional[Iterable[str]] = None,
+                   script: Optional[str] = None) -> "CorrectnessMatrix":
+        """ResultsStore 의 outcomes → 행렬 (run_ids 없으면 script 의 전체 실행)"""
+        if run_ids is None:
+            run_ids = store.runs(script)['run_id'].tolist()[::-1]  # 오래된 순
+        frames = [store.outcomes(run_id=run_id) for run_id in run_ids]
+        frames = [f for f in frames if len(f)]
+        if not frames:
+            return cls([], [], [], np.zeros((0, 0, 0), np.uint8), np.zeros((0, 0, 0), np.uint8), np.zeros(0))
+
+        frame = pd.concat(frames, ignore_index=True)
+        sample_ids = list(dict.fromkeys(frame['sample_id']))
+        prompts = list(dict.fromkeys(frame['prompt']))
+        runs = list(dict.fromkeys(frame['run_id']))
+
+        s = frame['sample_id'].map({v: i for i, v in enumerate(sample_ids)}).to_numpy()
+        p = frame['prompt'].map({v: i for i, v in enumerate(prompts)}).to_numpy()
+        r = frame['run_id'].map({v: i for i, v in enumerate(runs)}).to_numpy()
+
+        shape = (len(runs), len(prompts), len(sample_ids))
+        correct = np.zeros(shape, dtype=bool)
+        known = np.zeros(shape, dtype=bool)
+        known[r, p, s] = True
+        correct[r, p, s] = frame['correct'].to_numpy().astype(bool)
+        labels = frame.drop_duplicates('sample_id').set_index('sample_id')['actual']
+        return cls(sample_ids, prompts, runs, _pack(correct), _pack(known),
+                   labels.loc[sample_ids].to_numpy())
+
+    # ---- 기본 연산 ----
+
+    def _unpack(self, packed: np.ndarray) -> np.ndarray:
+        return np.unpackbits(packed, axis=-1, count=self.n_samples, bitorder="little").astype(bool)
+
+    def _select(self, array: np.ndarray, prompts: Optional[Iterable[str]],
+                runs: Optional[Iterable[str]]) -> np.ndarray:
+        """(실행, 프롬프트) 부분 선택"""
+        run_ids = [self._run_index[r] for r in runs] if runs is not None else slice(None)
+        prompt_ids = [self._prompt_index[p] for p in prompts] if prompts is not None else slice(None)
+        return array[run_ids][:, prompt_ids]
+
+    def failures(self, prompts: Optional[Iterable[str]] = None,
+                 runs: Optional[Iterable[str]] = None) -> np.ndarray:
+        """평가했는데 틀린 샘플 비트 (실행, 프롬프트, 바이트)"""
+        return self._select(self.known & ~self.correct, prompts, runs)
+
+    def ids(self, packed: np.ndarray) -> List[str]:
+        """비트 벡터 1개 → 샘플 ID 목록"""
+        return [self.sample_ids[i] for i in np.flatnonzero(self._unpack(packed))]
+
+    def failure_union(self, prompts: Optional[Iterable[str]] = None,
+                      runs: Optional[Iterable[str]] = None) -> np.ndarray:
+        """하나라도 틀린 샘플"""
+        failures = self.failures(prompts, runs)
+        return np.bitwise_or.reduce(failures, axis=(0, 1))
+
+    def failure_intersection(self, prompts: Optional[Iterable[str]] = None,
+                             runs: Optional[Iterable[str]] = None) -> np.ndarray:
+        """평가한 (실행, 프롬프트) 모두가 틀린 샘플 (한 번도 평가 안 된 샘플 제외)"""
+        correct = self._select(self.known & self.correct, prompts, runs)
+        known = self._select(self.known, prompts, runs)
+        any_correct = np.bitwise_or.reduce(correct, axis=(0, 1))
+        any_known = np.bitwise_or.reduce(known, axis=(0, 1))
+        return any_known & ~any_correct
+
+    def success_intersection(self, prompts: Optional[Iterable[str]] = None,
+                             runs: Optional[Iterable[str]] = None) -> np.ndarray:
+        """평가한 (실행, 프롬프트) 모두가 맞춘 샘플"""
+        known = self._select(self.known, prompts, runs)
+        any_known = np.bitwise_or.reduce(known, axis=(0, 1))
+        return any_known & ~self.failure_union(prompts, runs)
+
+    def accuracy(self) -> np.ndarray:
+        """(실행, 프롬프트) 정확도 (평가 샘플 기준)"""
+        correct = _popcount(self.correct & self.known).sum(axis=-1)
+        known = _popcount(self.known).sum(axis=-1)
+        return np.divide(correct, known, out=np.zeros(correct.shape), where=known > 0)
+
+    def hardness(self, prompts: Optional[Iterable[str]] = None,
+                 runs: Optional[Iterable[str]] = None) -> np.ndarray:
+        """샘플별 오답률 (틀린 횟수 / 평가 횟수)"""
+        wrong = self._unpack(self.failures(prompts, runs)).sum(axis=(0, 1))
+        seen = self._unpack(self._select(self.known, prompts, runs)).sum(axis=(0, 1))
+        return np.divide(wrong, seen, out=np.zeros(self.n_samples), where=seen > 0)
+
+    def predictions(self, run: Optional[str] = None) -> np.ndarray:
+        """(프롬프트, 샘플) 예측값 복원 - 정답이면 레이블, 오답이면 반대 (미평가는 -1)"""
+        r = self._run_index[run] if run is not None else 0
+        correct = self._unpack(self.correct[r])
+        known = self._unpack(self.known[r])
+        predicted = np.where(correct, self.labels, 1 - self.labels).astype(np.int8)
+        return np.where(known, predicted, -1)
+
+    # ---- 상호보완성 ----
+
+    def both_wrong(self, run: Optional[str] = None) -> np.ndarray:
+        """프롬프트 쌍별 함께 틀린 샘플 수 (프롬프트×프롬프트)"""
+        r = self._run_index[run] if run is not None else 0
+        failures = self.known[r] & ~self.correct[r]
+        return _popcount(failures[:, None, :] & failures[None, :, :]).sum(axis=-1, dtype=np.int64)
+
+    def complementary_pairs(self, run: Optional[str] = None, top: int = 10) -> List[Tuple[str, str, int, int]]:
+        """서로의 오답을 가장 잘 메우는 쌍 [(프롬프트A, 프롬프트B, 둘 중 하나라도 맞춘 수, 함께 틀린 수)]
+
+        모든 샘플을 평가한 프롬프트만 대상
+        """
+        r = self._run_index[run] if run is not None else 0
+        complete = np.flatnonzero(_popcount(self.known[r]).sum(axis=-1) == self.n_samples)
+        both = self.both_wrong(run)[np.ix_(complete, complete)]
+        i, j = np.triu_indices(len(complete), k=1)
+        order = np.argsort(both[i, j], kind="stable")[:top]
+        return [(self.prompts[complete[i[k]]], self.prompts[complete[j[k]]],
+                 self.n_samples - int(both[i[k], j[k]]), int(both[i[k], j[k]]))
+                for k in order]
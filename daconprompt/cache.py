@@ -0,0 +1,112 @@
+"""
+LLM 응답 디스크 캐시 (SQLite)
+요청 payload 전체의 해시를 키로 응답 JSON을 저장하고, 항목 수 상한을 넘으면
+가장 오래 사용하지 않은 항목부터 삭제(LRU)
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+DEFAULT_CACHE_PATH = "results/cache/llm_cache.sqlite"
+
+
+def payload_key(payload: Dict, namespace: str = "") -> str:
+    """요청 payload 해시 키 (model·메시지·temperature·max_tokens 등 전체 포함)"""
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(f"{namespace}\n{canonical}".encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """payload 해시 → 응답 JSON 캐시
+
+    max_entries: 최대 항목 수 (초과 시 LRU 순으로 10%씩 정리)
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_entries: int = 200_000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " response TEXT NOT NULL,"
+            " created REAL NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_access ON responses(last_access)"
+        )
+        self._conn.commit()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def get(self, key: str) -> Optional[Dict]:
+        """캐시 조회 (적중 시 최근 사용 시각 갱신)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, response: Dict):
+        """응답 저장"""
+        now = time.time()
+        with self._lock:
+            exists = self._conn.execute(
+                "SELECT 1 FROM responses WHERE key = ?", (key,)
+            ).fetchone() is not None
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created, last_access)"
+                " VALUES (?, ?, ?, ?)",
+                (key, json.dumps(response, ensure_ascii=False), now, now)
+            )
+            if not exists:  # 덮어쓰기는 항목 수 그대로
+                self._count += 1
+            if self._count > self.max_entries:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """오래 사용하지 않은 항목 정리 (상한의 90%까지)"""
+        # 다른 프로세스가 같은 파일에 쓴 항목까지 포함해 실제 행 수 기준으로 삭제
+        self._count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        if self._count <= self.max_entries:
+            return
+        self._conn.execute(
+            "DELETE FROM responses WHERE key IN ("
+            " SELECT key FROM responses ORDER BY last_access LIMIT ?)",
+            (self._count - int(self.max_entries * 0.9),)
+        )
+        self._count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def clear(self):
+        """전체 삭제"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self._count = 0
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,65 @@
+"""
+P(1) 기반 임계값 탐색·여유(margin) 분석
+샘플별 P(1)(logprobs)만 저장해 두면 모델을 다시 돌리지 않고 임계값별 정확도를 한 번에
+계산해 운영점을 고르고, 0.5 근처에서 흔들리는 샘플을 프롬프트 수정 우선순위로 뽑음
+"""
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+def threshold_sweep(p_one: Sequence[float], labels: Sequence[int],
+                    thresholds: Optional[Sequence[float]] = None) -> pd.DataFrame:
+    """임계값별 (P(1) ≥ t → 1) 정확도·혼동행렬
+
+    thresholds 가 없으면 0, 관측된 P(1) 사이 중간값들, 1 을 후보로 (정확도가 바뀌는 모든 지점)
+    """
+    p = np.asarray(p_one, dtype=float)
+    y = np.asarray(labels, dtype=bool)
+    if thresholds is None:
+        values = np.unique(p)
+        thresholds = np.concatenate([[0.0], (values[1:] + values[:-1]) / 2, [0.5], [1.0 + 1e-9]])
+        thresholds = np.unique(thresholds)
+    t = np.asarray(thresholds, dtype=float)
+
+    predicted = p[None, :] >= t[:, None]                   # (임계값, 샘플)
+    tp = (predicted & y).sum(axis=1)
+    fp = (predicted & ~y).sum(axis=1)
+    fn = (~predicted & y).sum(axis=1)
+    tn = (~predicted & ~y).sum(axis=1)
+    return pd.DataFrame({
+        'threshold': t,
+        'accuracy': (tp + tn) / len(p) if len(p) else np.zeros(len(t)),
+        'tp': tp, 'fp': fp, 'fn': fn, 'tn': tn,
+    })
+
+
+def best_threshold(sweep: pd.DataFrame) -> Dict:
+    """정확도 최고 임계값 (동률이면 0.5 에 가장 가까운 값)"""
+    top = sweep[sweep['accuracy'] == sweep['accuracy'].max()]
+    row = top.loc[(top['threshold'] - 0.5).abs().idxmin()]
+    return {'threshold': float(row['threshold']), 'accuracy': float(row['accuracy'])}
+
+
+def calibration_stats(p_one: Sequence[float], labels: Sequence[int], bins: int = 10) -> Dict:
+    """Brier 점수와 ECE (구간별 평균 P(1) vs 실제 1 비율의 가중 평균 차이)"""
+    p = np.asarray(p_one, dtype=float)
+    y = np.asarray(labels, dtype=float)
+    if not len(p):
+        return {'brier': None, 'ece': None}
+    which = np.minimum((p * bins).astype(int), bins - 1)
+    counts = np.bincount(which, minlength=bins)
+    mean_p = np.bincount(which, weights=p, minlength=bins)
+    mean_y = np.bincount(which, weights=y, minlength=bins)
+    filled = counts > 0
+    ece = np.abs(mean_p[filled] - mean_y[filled]).sum() / len(p)
+    return {'brier': float(np.mean((p - y) ** 2)), 'ece': float(ece)}
+
+
+def low_margin(frame: pd.DataFrame, threshold: float = 0.5, top: int = 10) -> pd.DataFrame:
+    """임계값에 가장 가까운(확신 낮은) 샘플 - frame: sample_id, p_one, actual 열"""
+    frame = frame.assign(margin=(frame['p_one'] - threshold).abs(),
+                         correct=(frame['p_one'] >= threshold) == frame['actual'].astype(bool))
+    return frame.sort_values('margin', kind='stable').head(top)
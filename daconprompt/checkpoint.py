@@ -0,0 +1,97 @@
+"""
+평가 체크포인트 (JSON Lines)
+(프롬프트, 샘플) 결과를 끝날 때마다 한 줄씩 덧붙여 두고, --resume 으로 다시 실행하면
+이미 끝난 쌍은 호출하지 않고 기록을 재사용
+
+프롬프트 본문 해시를 키에 포함해, 같은 이름이라도 본문이 바뀌면 다시 평가
+"""
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+DEFAULT_CHECKPOINT_DIR = "results/checkpoints"
+
+
+def prompt_hash(prompt_text: str) -> str:
+    """프롬프트 본문 해시 (앞 12자리)"""
+    return hashlib.sha256(prompt_text.encode("utf-8")).hexdigest()[:12]
+
+
+def _to_builtin(value):
+    """numpy 스칼라 등 JSON 직렬화 (pandas 행 값 대응)"""
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"JSON 직렬화 불가: {type(value).__name__}")
+
+
+class Checkpoint:
+    """append-only (프롬프트, 샘플) 결과 기록
+
+    resume=False 면 기존 파일을 비우고 새로 시작
+    """
+
+    def __init__(self, path: str, resume: bool = False):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._records: Dict[Tuple[str, str, str], Dict] = {}
+        self._lock = threading.Lock()
+
+        if resume and self.path.exists():
+            self._load()
+        else:
+            self.path.write_text("", encoding="utf-8")
+        self.resumed = len(self._records)
+        self._file = open(self.path, "a", encoding="utf-8")
+        if self.path.stat().st_size and not self._ends_with_newline():
+            self._file.write("\n")  # 잘린 줄 뒤에 이어 쓰지 않도록
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as f:
+            f.seek(-1, 2)
+            return f.read(1) == b"\n"
+
+    def _load(self):
+        """기존 기록 읽기 (중단 시 잘린 마지막 줄은 무시)"""
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                key = (entry["prompt"], entry["prompt_hash"], entry["sample"])
+                self._records[key] = entry["result"]
+
+    @staticmethod
+    def _key(prompt_name: str, prompt_text: str, sample_id) -> Tuple[str, str, str]:
+        return prompt_name, prompt_hash(prompt_text), str(sample_id)
+
+    def get(self, prompt_name: str, prompt_text: str, sample_id) -> Optional[Dict]:
+        """완료된 결과 (없으면 None)"""
+        return self._records.get(self._key(prompt_name, prompt_text, sample_id))
+
+    def append(self, prompt_name: str, prompt_text: str, sample_id, result: Dict):
+        """결과 1건 기록 (한 줄 단위로 즉시 flush)"""
+        key = self._key(prompt_name, prompt_text, sample_id)
+        line = json.dumps(
+            {"prompt": key[0], "prompt_hash": key[1], "sample": key[2], "result": result},
+            ensure_ascii=False, default=_to_builtin
+        )
+        with self._lock:
+            self._records[key] = result
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,375 @@
+"""
+daconprompt 명령줄 도구
+스크립트마다 따로 두던 프롬프트 사전·엔드포인트·출력 경로 대신 하위 명령이 같은
+클라이언트(단일/풀)·응답 캐시·데이터 로더·결과 저장소를 공유
+
+  daconprompt prompts --duplicates
+  daconprompt evaluate prompts/versions/v3.6_SAMPLE_VERIFIED.txt --concurrency 4
+  daconprompt sweep prompts/versions --bandit 460
+  daconprompt simulate rules/v3.6.json
+  daconprompt analyze --thresholds
+  daconprompt compress prompts/versions/v3.2_COMPRESSED.txt --budget 100
+  daconprompt bench --quick
+  daconprompt serve --port 1234
+
+pandas·numpy·requests 는 하위 명령 안에서 import - `daconprompt --help` 는 표준 라이브러리만 로드
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+DEFAULT_CSV = "data/samples.csv"
+DEFAULT_PROMPT_DIRS = ("prompts/versions", "prompts/final")
+MAX_PROMPT_LENGTH = 3000  # 대회 제출 한도 (넘으면 점수 계산 불가)
+
+
+# ---- 공용 구성 요소 ----
+
+def load_dataset(path: str):
+    """샘플 CSV (ID, title, content, label)"""
+    import pandas as pd
+    return pd.read_csv(path)
+
+
+def read_prompts(paths: List[str]) -> Dict[str, str]:
+    """프롬프트 파일·디렉터리 → {이름: 본문} (레지스트리로 같은 본문은 한 번만, 제출 한도 초과는 제외)"""
+    from daconprompt.registry import PromptRegistry
+
+    registry = PromptRegistry(paths)
+    for entry in registry:
+        if len(entry['names']) > 1:
+            print(f"같은 본문: {', '.join(entry['names'])} → {entry['names'][0]} 로 1회 평가")
+        if entry['length'] > MAX_PROMPT_LENGTH:
+            print(f"⚠️ {entry['names'][0]}: {entry['length']}자 > {MAX_PROMPT_LENGTH}자 - 제외")
+    return registry.prompts(max_length=MAX_PROMPT_LENGTH)
+
+
+def make_client(args):
+    """--endpoints 가 있으면 엔드포인트 풀, 아니면 단일 LLMClient (응답 캐시·제한 시간 공통)"""
+    from daconprompt.cache import ResponseCache
+    from daconprompt.client import DEFAULT_ENDPOINT, LLMClient
+
+    settings = dict(timeout=args.timeout, verbose=False)
+    if args.model:
+        settings['model'] = args.model
+    if not args.no_cache:
+        settings['cache'] = ResponseCache()
+    if args.endpoints:
+        from daconprompt.pool import EndpointPool
+        return EndpointPool.from_config(args.endpoints, **settings)
+    return LLMClient(args.endpoint or DEFAULT_ENDPOINT, **settings)
+
+
+def make_engine(args, client, **options):
+    from daconprompt.engine import EvaluationEngine
+    concurrency = args.concurrency or getattr(client, 'capacity', 4)
+    return EvaluationEngine(client, concurrency=concurrency, **options)
+
+
+def save_results(args, command: str, results: List[Dict], prompts: Dict[str, str], meta: Optional[Dict] = None) -> str:
+    """결과 저장소에 실행 1회 기록 → run_id"""
+    from daconprompt.results_store import ResultsStore
+    store = ResultsStore(args.db)
+    run_id = store.start_run(f"cli.{command}", args.model, meta=meta)
+    store.add_results(run_id, results, prompts)
+    store.close()
+    print(f"\n결과 저장: {args.db} (run {run_id})")
+    return run_id
+
+
+def print_ranking(results: List[Dict]):
+    """전체 샘플을 평가한 후보만 점수순, 조기 중단·선별 탈락 후보는 아래에 따로"""
+    from daconprompt.results_store import is_partial
+
+    ranked = sorted((r for r in results if not is_partial(r)), key=lambda r: r['dacon_score'], reverse=True)
+    print(f"\n{'순위':<4} {'점수':>7} {'정확도':>8} {'길이':>6}  프롬프트")
+    for rank, result in enumerate(ranked, 1):
+        failed = f"  (요청 실패 {len(result['failed'])}건)" if result.get('failed') else ""
+        print(f"{rank:<4} {result['dacon_score']:>7.4f} {result['accuracy']:>8.2%} {result['length']:>6}  "
+              f"{result['name']}{failed}")
+    for result in results:
+        if is_partial(result):
+            reason = (f"{result['eliminated_round']}라운드 탈락" if result.get('eliminated_round') is not None
+                      else "조기 중단")
+            print(f"{'-':<4} {'':>7} {result['accuracy']:>8.2%} {result['length']:>6}  "
+                  f"{result['name']}  ({reason}, {result['total']}샘플 기준)")
+
+
+# ---- 하위 명령 ----
+
+def cmd_prompts(args):
+    from daconprompt.registry import DEFAULT_PROMPT_ROOTS, PromptRegistry
+    from daconprompt.results_store import ResultsStore
+
+    registry = PromptRegistry(args.paths or DEFAULT_PROMPT_ROOTS)
+    if Path(args.db).exists():
+        store = ResultsStore(args.db)
+        registry.link_results(store)
+        store.close()
+
+    entries = registry.duplicates() if args.duplicates else list(registry)
+    print(f"프롬프트 {len(registry)}개 (이름 {len(registry.by_name)}개)\n")
+    print(f"{'해시':<12} {'길이':>5} {'토큰':>5} {'실행':>4} {'최고점':>7}  이름")
+    for entry in sorted(entries, key=lambda e: e['length']):
+        scores = [r['dacon_score'] for r in entry['results'] if r['dacon_score'] is not None]
+        best = f"{max(scores):.4f}" if scores else "-"
+        print(f"{entry['hash']:<12} {entry['length']:>5} {entry['tokens']:>5} {len(entry['results']):>4} "
+              f"{best:>7}  {', '.join(entry['names'])}")
+
+
+def cmd_evaluate(args):
+    from daconprompt.checkpoint import DEFAULT_CHECKPOINT_DIR, Checkpoint
+
+    df = load_dataset(args.csv)
+    prompts = read_prompts(args.prompts)
+    client = make_client(args)
+    if args.constrain:
+        client.constrain = args.constrain
+    ordering = "grouped" if args.grouped else "interleaved"
+    client.cache_prompt = client.slot_hints = args.grouped
+
+    checkpoint = Checkpoint(args.checkpoint or f"{DEFAULT_CHECKPOINT_DIR}/cli_evaluate.jsonl", resume=args.resume)
+    with checkpoint:
+        engine = make_engine(args, client, checkpoint=checkpoint, ordering=ordering, batch_size=args.batch)
+        print(f"프롬프트 {len(prompts)}개 × 샘플 {len(df)}개 (동시 {engine.concurrency})")
+        results = engine.sweep(prompts, df)
+
+    print_ranking(results)
+    save_results(args, "evaluate", results, prompts, meta={'ordering': ordering, 'batch': args.batch})
+
+
+def cmd_sweep(args):
+    df = load_dataset(args.csv)
+    prompts = read_prompts(args.prompts or list(DEFAULT_PROMPT_DIRS))
+    engine = make_engine(args, make_client(args))
+    print(f"프롬프트 {len(prompts)}개 × 샘플 {len(df)}개")
+
+    if args.bandit is not None:
+        from daconprompt.bandit import SuccessiveHalving
+        screening = SuccessiveHalving(engine, df, budget=args.bandit or None, seed=args.seed).run(prompts)
+        print(f"호출 {screening['calls']}회 (전수 평가 {screening['full_cost']}회)")
+        results = screening['results']
+    elif args.early_stop:
+        results = engine.sweep_early_stop(prompts, df)
+    else:
+        results = engine.sweep(prompts, df)
+
+    print_ranking(results)
+    save_results(args, "sweep", results, prompts,
+                 meta={'bandit': args.bandit, 'early_stop': args.early_stop, 'seed': args.seed})
+
+
+def cmd_simulate(args):
+    import glob
+    import time
+    from daconprompt.rules import load_rules
+
+    samples = load_dataset(args.csv).to_dict('records')
+    for path in args.rules or sorted(glob.glob("rules/*.json")):
+        classifier = load_rules(path)
+        start = time.perf_counter()
+        result = classifier.evaluate(samples)
+        elapsed = time.perf_counter() - start
+        print(f"{result['accuracy']:>7.2%} ({result['correct']}/{result['total']})  "
+              f"{elapsed * 1000:6.1f}ms  {classifier.name} ({path})")
+        if args.verbose:
+            for sample, predicted in zip(samples, result['predictions']):
+                if predicted != int(sample['label']):
+                    _, reason, _ = classifier.explain(sample['title'], sample['content'])
+                    print(f"    ❌ {sample['ID']} 정답={sample['label']} {str(sample['title'])[:40]} - {reason}")
+
+
+def cmd_analyze(args):
+    from daconprompt.results_store import ResultsStore
+
+    store = ResultsStore(args.db)
+    run_id = args.run or store.latest_run(args.script)
+    if run_id is None:
+        print(f"저장된 실행이 없습니다: {args.db}")
+        return
+    # 일부 샘플만 평가한 후보(partial)는 점수순 목록 뒤로
+    summaries = store.query("SELECT prompt, length, accuracy, correct, total, dacon_score, partial"
+                            " FROM prompt_results WHERE run_id = ? ORDER BY partial, dacon_score DESC", (run_id,))
+    outcomes = store.outcomes(run_id=run_id, prompt=args.prompt)
+    store.close()
+
+    print(f"실행 {run_id}\n")
+    print(summaries.to_string(index=False))
+
+    # 여러 프롬프트가 함께 틀린 샘플 = 프롬프트 수정 우선순위
+    wrong = outcomes[outcomes['correct'] == 0].groupby(['sample_id', 'title']).size()
+    if len(wrong):
+        print(f"\n가장 많이 틀린 샘플 (프롬프트 {outcomes['prompt'].nunique()}개 중):")
+        for (sample_id, title), n in wrong.sort_values(ascending=False).head(args.top).items():
+            print(f"  {n:>3}  {sample_id}  {str(title)[:50]}")
+
+    if args.thresholds:
+        from daconprompt.calibration import best_threshold, threshold_sweep
+        print("\nP(1) 임계값:")
+        for prompt, frame in outcomes[outcomes['p_one'].notna()].groupby('prompt', sort=False):
+            best = best_threshold(threshold_sweep(frame['p_one'], frame['actual']))
+            print(f"  {prompt}: {best['threshold']:.3f} → 정확도 {best['accuracy']:.2%}")
+
+
+def cmd_compress(args):
+    import json
+    import time
+    from daconprompt.compression import PromptCompressor, engine_evaluator
+
+    df = load_dataset(args.csv)
+    text = Path(args.prompt).read_text(encoding="utf-8").strip()
+    engine = make_engine(args, make_client(args), verbose=False)
+    compressor = PromptCompressor(engine_evaluator(engine, df), beam_width=args.beam, budget=args.budget,
+                                  max_accuracy_drop=args.max_drop)
+    result = compressor.search(text)
+    original, best = result['original'], result['best']
+    print(f"\n{original['length']}자 → {best['length']}자, 정확도 {original['accuracy']:.2%} → "
+          f"{best['accuracy']:.2%}, 점수 {original['score']:.4f} → {best['score']:.4f}")
+    print("-" * 60)
+    print(best['text'])
+    print("-" * 60)
+
+    output = args.output or f"results/compression_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({key: result[key] for key in ('original', 'best', 'front', 'evaluations', 'rounds')},
+                  f, ensure_ascii=False, indent=2)
+    print(f"저장: {output}")
+
+
+def cmd_bench(args):
+    import glob
+    import json
+    import time
+    from daconprompt.benchmark import compare, run_suite
+
+    levels = [int(c) for c in args.concurrency.split(",")]
+    scale, requests = (2, 46) if args.quick else (args.scale, args.requests)
+    report = run_suite(load_dataset(args.csv), sorted(glob.glob("rules/*.json")), scale=scale,
+                       concurrency_levels=levels[:3] if args.quick else levels, latency=args.latency,
+                       client_samples=requests, store_size=(5, 200) if args.quick else (20, 500))
+    for name, value in report['metrics'].items():
+        print(f"  {name:<50} {value:>12.1f}")
+
+    output = args.output or f"results/benchmark_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"저장: {output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            table = compare(report, json.load(f), args.tolerance)
+        regressions = table[table['regression']]
+        for row in regressions.itertuples():
+            print(f"  ⚠️ 회귀 {row.metric}: {row.baseline:.1f} → {row.current:.1f} ({row.ratio:.2f}배)")
+        if len(regressions):
+            sys.exit(1)
+
+
+def cmd_serve(args):
+    from daconprompt.mock_server import MockLLMServer
+    from daconprompt.rules import load_rules
+
+    server = MockLLMServer(args.host, args.port, classifier=load_rules(args.rules), latency=args.latency,
+                           error_rate=args.error_rate, parallel=args.parallel, seed=args.seed)
+    print(f"모의 LLM 서버: {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.httpd.server_close()
+
+
+# ---- 인자 ----
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="daconprompt", description="데이콘 프롬프트 평가 도구")
+    commands = parser.add_subparsers(dest="command", required=True, metavar="COMMAND")
+
+    data = argparse.ArgumentParser(add_help=False)
+    data.add_argument("--csv", default=DEFAULT_CSV, help="샘플 CSV")
+    data.add_argument("--db", default="results/results.sqlite", help="결과 저장소")
+
+    llm = argparse.ArgumentParser(add_help=False)
+    llm.add_argument("--endpoint", help="LLM 엔드포인트 (기본: DACON_LLM_ENDPOINT 또는 LM Studio)")
+    llm.add_argument("--endpoints", help="여러 서버 설정 JSON (daconprompt/pool.py 형식)")
+    llm.add_argument("--model")
+    llm.add_argument("--concurrency", type=int, default=None, help="동시 요청 수 (기본: 4 또는 풀 전체 한도)")
+    llm.add_argument("--timeout", type=float, default=120, help="요청당 제한 시간 (초)")
+    llm.add_argument("--no-cache", action="store_true", help="응답 캐시 미사용")
+
+    p = commands.add_parser("prompts", parents=[data], help="프롬프트 목록 (길이·토큰 수·해시·저장된 결과)")
+    p.add_argument("paths", nargs="*", help="프롬프트 .txt 또는 디렉터리 (기본: prompts/ 아래 전체)")
+    p.add_argument("--duplicates", action="store_true", help="여러 곳에 같은 본문이 있는 것만")
+    p.set_defaults(func=cmd_prompts)
+
+    p = commands.add_parser("evaluate", parents=[data, llm], help="프롬프트 파일을 LLM 으로 평가")
+    p.add_argument("prompts", nargs="+", help="프롬프트 .txt 또는 디렉터리")
+    p.add_argument("--grouped", action="store_true", help="슬롯마다 프롬프트 하나씩 (prefix 캐시 재사용)")
+    p.add_argument("--batch", type=int, default=1, help="요청당 기사 수")
+    p.add_argument("--constrain", choices=("grammar", "logprobs"), help="0/1 한 토큰 강제")
+    p.add_argument("--checkpoint", help="샘플별 체크포인트 경로")
+    p.add_argument("--resume", action="store_true")
+    p.set_defaults(func=cmd_evaluate)
+
+    p = commands.add_parser("sweep", parents=[data, llm], help="여러 프롬프트 선별 (전수/조기 중단/successive halving)")
+    p.add_argument("prompts", nargs="*", help=f"프롬프트 .txt 또는 디렉터리 (기본: {', '.join(DEFAULT_PROMPT_DIRS)})")
+    mode = p.add_mutually_exclusive_group()
+    mode.add_argument("--bandit", nargs="?", type=int, const=0, help="successive halving (예산 호출 수)")
+    mode.add_argument("--early-stop", action="store_true", help="1위를 넘을 수 없는 후보 조기 중단")
+    p.add_argument("--seed", type=int, default=0)
+    p.set_defaults(func=cmd_sweep)
+
+    p = commands.add_parser("simulate", parents=[data], help="규칙 JSON 을 LLM 없이 평가")
+    p.add_argument("rules", nargs="*", help="규칙 JSON (기본: rules/*.json)")
+    p.add_argument("--verbose", action="store_true", help="오분류와 판정 근거 출력")
+    p.set_defaults(func=cmd_simulate)
+
+    p = commands.add_parser("analyze", parents=[data], help="저장된 실행 분석")
+    p.add_argument("--run", help="run_id (기본: 최근 실행)")
+    p.add_argument("--script", help="--run 없을 때 최근 실행을 고를 스크립트 (예: cli.sweep)")
+    p.add_argument("--prompt", help="특정 프롬프트만")
+    p.add_argument("--top", type=int, default=10)
+    p.add_argument("--thresholds", action="store_true", help="P(1) 임계값 탐색")
+    p.set_defaults(func=cmd_analyze)
+
+    p = commands.add_parser("compress", parents=[data, llm], help="프롬프트 빔 서치 압축")
+    p.add_argument("prompt", help="프롬프트 .txt")
+    p.add_argument("--beam", type=int, default=4)
+    p.add_argument("--budget", type=int, default=60)
+    p.add_argument("--max-drop", type=float, default=0.0)
+    p.add_argument("--output")
+    p.set_defaults(func=cmd_compress)
+
+    p = commands.add_parser("bench", parents=[data], help="평가 파이프라인 벤치마크")
+    p.add_argument("--quick", action="store_true")
+    p.add_argument("--scale", type=int, default=20)
+    p.add_argument("--concurrency", default="1,2,4,8,16")
+    p.add_argument("--latency", default="fixed:0.02")
+    p.add_argument("--requests", type=int, default=200)
+    p.add_argument("--output")
+    p.add_argument("--compare", help="이전 결과 JSON (회귀 시 종료 코드 1)")
+    p.add_argument("--tolerance", type=float, default=0.1, help="이 비율 이상 느려지면 회귀")
+    p.set_defaults(func=cmd_bench)
+
+    p = commands.add_parser("serve", help="모의 LLM 서버 실행")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=1234)
+    p.add_argument("--rules", default="rules/v3.6.json")
+    p.add_argument("--latency", default="fixed:0")
+    p.add_argument("--error-rate", type=float, default=0.0)
+    p.add_argument("--parallel", type=int, default=4)
+    p.add_argument("--seed", type=int, default=0)
+    p.set_defaults(func=cmd_serve)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,404 @@
+"""
+LM Studio / Ollama 공용 LLM 클라이언트
+엔드포인트별 keep-alive 세션 풀을 재사용해 샘플마다 TCP 연결을 새로 맺지 않음
+
+llama.cpp 계열 서버는 cache_prompt / id_slot 힌트로 같은 시스템 프롬프트의 KV 캐시를
+슬롯에 남겨 재사용 (힌트는 응답 캐시 키에서 제외)
+
+constrain 을 지정하면 grammar / logit_bias 로 출력을 "0"·"1" 한 토큰으로 강제하고
+logprobs 로 P(1) 을 함께 받음 (classify_binary)
+
+요청은 retry 정책(지수 백오프)과 엔드포인트별 서킷 브레이커를 거침 (daconprompt/resilience.py)
+HTTP 요청마다 TTFB·지연·토큰 수를 telemetry 레지스트리에 기록 (daconprompt/telemetry.py)
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from daconprompt.cache import ResponseCache, payload_key
+from daconprompt.resilience import RetryPolicy, call_with_retry, get_breaker
+from daconprompt.telemetry import REGISTRY, MetricsRegistry
+
+# 기본 엔드포인트 (환경변수로 덮어쓰기 가능)
+LM_STUDIO_URL = "http://localhost:1234/v1/chat/completions"
+OLLAMA_URL = "http://localhost:11434/api/generate"
+REMOTE_LM_STUDIO_URL = "http://203.234.62.45:1234/v1/chat/completions"
+
+DEFAULT_ENDPOINT = os.environ.get("DACON_LLM_ENDPOINT", LM_STUDIO_URL)
+DEFAULT_MODEL = os.environ.get("DACON_LLM_MODEL") or None
+
+# 서버 힌트 - 결과에 영향 없으므로 응답 캐시 키에서 제외
+_HINT_KEYS = ("cache_prompt", "id_slot")
+
+# 0/1 한 토큰 강제 방식
+#   grammar:    llama.cpp GBNF (LM Studio llama.cpp 엔진 포함)
+#   logit_bias: 토크나이저별 "0"/"1" 토큰 ID 에 +100 (binary_token_ids 필요)
+#   logprobs:   강제 없이 1토큰 생성 + 확률만
+CONSTRAIN_MODES = ("grammar", "logit_bias", "logprobs")
+BINARY_GRAMMAR = 'root ::= "0" | "1"'
+_OLLAMA_CONSTRAIN_ERROR = "constrain 은 openai 백엔드만 지원 (ollama /api/generate 는 grammar·logprobs 없음)"
+
+# (호스트(scheme://host:port), 연결 풀 크기)별 공유 세션
+_sessions: Dict[Tuple[str, int], requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(endpoint: str, pool_size: int = 16) -> requests.Session:
+    """엔드포인트 호스트·풀 크기별 keep-alive 세션 반환 (프로세스 내 공유)"""
+    parts = urlsplit(endpoint)
+    host = f"{parts.scheme}://{parts.netloc}"
+
+    with _sessions_lock:
+        session = _sessions.get((host, pool_size))
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            session.mount(host, adapter)
+            _sessions[(host, pool_size)] = session
+        return session
+
+
+class LLMClient:
+    """(prompt, user_input) -> str 계약을 유지하는 공용 분류 호출기
+
+    backend:
+      - "openai": LM Studio / llama.cpp / Ollama(/v1) 등 OpenAI 호환 chat completions
+      - "ollama": Ollama /api/generate
+    cache_prompt: 요청에 cache_prompt=true (llama.cpp 서버 프롬프트 prefix 캐시)
+    slot_hints: slot 이 주어지면 id_slot 지정 (같은 시스템 프롬프트를 같은 슬롯으로)
+    constrain: CONSTRAIN_MODES 중 하나면 max_tokens=1 + logprobs 로 0/1 한 토큰만 생성 (openai 백엔드만)
+      (추론 모델처럼 답 앞에 다른 토큰을 내는 모델에는 부적합)
+    binary_token_ids: logit_bias 용 {"0": 토큰ID, "1": 토큰ID}
+    timeout: 요청당 제한 시간 (초, 또는 requests 의 (연결, 읽기) 튜플)
+    retry: 일시적 오류 재시도 정책 (None 이면 재시도 없음)
+    circuit_breaker: 엔드포인트별 서킷 브레이커 사용 (연속 실패 시 일정 시간 즉시 실패)
+    telemetry: 요청별 계측을 기록할 레지스트리 (None 이면 기록 안 함)
+    """
+
+    def __init__(self,
+                 endpoint: str = DEFAULT_ENDPOINT,
+                 model: Optional[str] = DEFAULT_MODEL,
+                 temperature: float = 0.1,
+                 max_tokens: int = 10,
+                 timeout: Optional[float] = 30,
+                 user_prefix: str = "[기사]\n",
+                 api_key: Optional[str] = None,
+                 backend: str = "openai",
+                 options: Optional[Dict] = None,
+                 pool_size: int = 16,
+                 cache: Optional[ResponseCache] = None,
+                 cache_prompt: bool = False,
+                 slot_hints: bool = False,
+                 constrain: Optional[str] = None,
+                 binary_token_ids: Optional[Dict[str, int]] = None,
+                 top_logprobs: int = 5,
+                 retry: Optional[RetryPolicy] = RetryPolicy(),
+                 circuit_breaker: bool = True,
+                 telemetry: Optional[MetricsRegistry] = REGISTRY,
+                 verbose: bool = True):
+        if constrain is not None and constrain not in CONSTRAIN_MODES:
+            raise ValueError(f"알 수 없는 constrain: {constrain} (가능: {', '.join(CONSTRAIN_MODES)})")
+        if constrain == "logit_bias" and not binary_token_ids:
+            raise ValueError("constrain='logit_bias' 는 binary_token_ids 가 필요함")
+        if constrain is not None and backend == "ollama":
+            raise ValueError(_OLLAMA_CONSTRAIN_ERROR)
+        self.endpoint = endpoint
+        self.model = model
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.timeout = timeout
+        self.user_prefix = user_prefix
+        self.api_key = api_key
+        self.backend = backend
+        self.options = options or {}
+        self.cache = cache
+        self.cache_prompt = cache_prompt
+        self.slot_hints = slot_hints
+        self.constrain = constrain
+        self.binary_token_ids = binary_token_ids or {}
+        self.top_logprobs = top_logprobs
+        self.retry = retry
+        self.breaker = get_breaker(endpoint) if circuit_breaker else None
+        self.telemetry = telemetry
+        self.verbose = verbose
+        self.session = get_session(endpoint, pool_size)
+
+        self.headers = {"Content-Type": "application/json"}
+        if api_key:
+            self.headers["Authorization"] = f"Bearer {api_key}"
+
+    def build_payload(self, prompt: str, user_input: str, slot: Optional[int] = None,
+                      max_tokens: Optional[int] = None) -> Dict:
+        """요청 본문 생성 (slot: 슬롯 힌트, max_tokens: 이번 요청만 덮어쓰기 - ollama 는 options.num_predict)"""
+        if self.backend == "ollama":
+            if self.constrain:  # 생성 후 constrain 을 바꾼 경우
+                raise ValueError(_OLLAMA_CONSTRAIN_ERROR)
+            payload = {
+                "prompt": f"{prompt}\n\n{self.user_prefix}{user_input}",
+                "stream": False,
+                "options": {"temperature": self.temperature, "num_predict": max_tokens or self.max_tokens,
+                            **self.options}
+            }
+        else:
+            payload = {
+                "messages": [
+                    {"role": "system", "content": prompt},
+                    {"role": "user", "content": f"{self.user_prefix}{user_input}"}
+                ],
+                "temperature": self.temperature,
+                "max_tokens": max_tokens or self.max_tokens,
+                "stream": False,
+                **self.options
+            }
+            if self.constrain:
+                payload.update(max_tokens=1, logprobs=True, top_logprobs=self.top_logprobs)
+                if self.constrain == "grammar":
+                    payload["grammar"] = BINARY_GRAMMAR
+                elif self.constrain == "logit_bias":
+                    payload["logit_bias"] = {str(token_id): 100 for token_id in self.binary_token_ids.values()}
+            if self.cache_prompt:
+                payload["cache_prompt"] = True
+            if self.slot_hints and slot is not None:
+                payload["id_slot"] = slot
+
+        if self.model:
+            payload["model"] = self.model
+        return payload
+
+    def parse_response(self, result: Dict) -> str:
+        """응답 JSON에서 생성 텍스트 추출"""
+        if self.backend == "ollama":
+            return result['response'].strip()
+        return result['choices'][0]['message']['content'].strip()
+
+    def post(self, payload: Dict, user_input: str = "") -> Dict:
+        """공유 세션으로 요청 전송 (HTTP 오류는 예외로 올림)
+
+        cache 가 있으면 같은 payload 는 서버에 다시 묻지 않음
+        (model 미지정 시 엔드포인트를 키에 포함)
+        user_input: 계측의 느린 요청 목록에 남길 입력 (선택)
+        """
+        key = None
+        if self.cache is not None:
+            request = {k: v for k, v in payload.items() if k not in _HINT_KEYS}
+            key = payload_key(request, "" if self.model else self.endpoint)
+            cached = self.cache.get(key)
+            if cached is not None:
+                self._count("cache_hits")
+                return cached
+
+        def send() -> Dict:
+            start = time.perf_counter()
+            try:
+                response = self.session.post(
+                    self.endpoint,
+                    headers=self.headers,
+                    json=payload,
+                    timeout=self.timeout
+                )
+                response.raise_for_status()
+                result = response.json()
+            except Exception:
+                self._count("errors")
+                raise
+            if self.telemetry is not None:
+                prompt_tokens, completion_tokens = self._usage(result)
+                self._observe(user_input, response.elapsed.total_seconds(), time.perf_counter() - start,
+                              prompt_tokens, completion_tokens)
+            return result
+
+        result = call_with_retry(send, self.retry, self.breaker, self.endpoint)
+
+        if key is not None:
+            self.cache.put(key, result)
+        return result
+
+    def complete(self, prompt: str, user_input: str, slot: Optional[int] = None,
+                 max_tokens: Optional[int] = None) -> str:
+        """단일 호출 - 실패 시 예외 발생"""
+        payload = self.build_payload(prompt, user_input, slot, max_tokens)
+        return self.parse_response(self.post(payload, user_input))
+
+    def call(self, prompt: str, user_input: str, slot: Optional[int] = None,
+             max_tokens: Optional[int] = None) -> str:
+        """(레거시) 단일 호출 - 실패 시 기존 스크립트와 동일하게 "0" 반환
+
+        실패가 예측 "0" 으로 섞여 정확도를 왜곡하므로 저장소 안 평가 코드는 쓰지 않음 -
+        정확도를 재는 코드는 complete 를 쓰고 실패를 따로 기록
+        """
+        try:
+            return self.complete(prompt, user_input, slot, max_tokens)
+        except Exception as e:
+            if self.verbose:
+                print(f"    API 에러: {e}")
+            return "0"
+
+    __call__ = call
+
+    def classify_binary(self, prompt: str, user_input: str,
+                        slot: Optional[int] = None) -> Tuple[int, Optional[float], str]:
+        """(예측 0/1, P(1), 원본 응답) - P(1) 은 logprobs 가 없으면 None, 실패 시 예외"""
+        result = self.post(self.build_payload(prompt, user_input, slot), user_input)
+        text = self.parse_response(result)
+        p_one = binary_probability(result)
+        if text[:1] in ("0", "1"):
+            label = int(text[0])
+        elif p_one is not None:
+            label = int(p_one >= 0.5)
+        else:
+            label = 1 if "1" in text[:10] else 0
+        return label, p_one, text
+
+    def call_binary(self, prompt: str, user_input: str,
+                    slot: Optional[int] = None) -> Tuple[int, Optional[float], str]:
+        """(레거시) classify_binary - 실패 시 (0, None, "0"), 평가에는 classify_binary 사용"""
+        try:
+            return self.classify_binary(prompt, user_input, slot)
+        except Exception as e:
+            if self.verbose:
+                print(f"    API 에러: {e}")
+            return 0, None, "0"
+
+    def complete_timed(self, prompt: str, user_input: str, slot: Optional[int] = None,
+                       max_tokens: Optional[int] = None) -> Tuple[str, Dict]:
+        """스트리밍 호출로 첫 토큰 시간(TTFT) 측정 - 응답 캐시 미사용, 실패 시 예외
+
+        timing: ttft / total (초), 서버가 주면 prompt_ms (prefill 시간)·prompt_tokens·cached_tokens
+        """
+        payload = self.build_payload(prompt, user_input, slot, max_tokens)
+        payload["stream"] = True
+
+        def send() -> Tuple[str, Dict]:
+            start = time.perf_counter()
+            ttft = None
+            pieces = []
+            timing: Dict = {}
+
+            try:
+                with self.session.post(self.endpoint, headers=self.headers, json=payload,
+                                       timeout=self.timeout, stream=True) as response:
+                    response.raise_for_status()
+                    for line in response.iter_lines():
+                        chunk = self._parse_stream_line(line)
+                        if chunk is None:
+                            continue
+                        text = self._stream_text(chunk)
+                        if text and ttft is None:
+                            ttft = time.perf_counter() - start
+                        pieces.append(text)
+                        timing.update(self._stream_timing(chunk))
+            except Exception:
+                self._count("errors")
+                raise
+
+            total = time.perf_counter() - start
+            timing.update(ttft=ttft if ttft is not None else total, total=total)
+            if self.telemetry is not None:
+                self._observe(user_input, response.elapsed.total_seconds(), total,
+                              timing.get("prompt_tokens"), timing.get("completion_tokens"))
+            return "".join(pieces).strip(), timing
+
+        return call_with_retry(send, self.retry, self.breaker, self.endpoint)
+
+    def call_timed(self, prompt: str, user_input: str, slot: Optional[int] = None,
+                   max_tokens: Optional[int] = None) -> Tuple[str, Optional[Dict]]:
+        """(레거시) complete_timed - 실패 시 ("0", None), 평가에는 complete_timed 사용"""
+        try:
+            return self.complete_timed(prompt, user_input, slot, max_tokens)
+        except Exception as e:
+            if self.verbose:
+                print(f"    API 에러: {e}")
+            return "0", None
+
+    def _usage(self, result: Dict) -> Tuple[Optional[int], Optional[int]]:
+        """응답의 (프롬프트 토큰, 생성 토큰) - openai usage / ollama *_eval_count"""
+        if self.backend == "ollama":
+            return result.get("prompt_eval_count"), result.get("eval_count")
+        usage = result.get("usage") or {}
+        return usage.get("prompt_tokens"), usage.get("completion_tokens")
+
+    def _count(self, name: str):
+        if self.telemetry is not None:
+            self.telemetry.count(self.endpoint, name)
+
+    def _observe(self, user_input: str, ttfb: float, latency: float,
+                 prompt_tokens: Optional[int], completion_tokens: Optional[int]):
+        """성공한 요청 1건 계측 (느린 요청 목록용으로 사용자 입력 앞부분을 함께)"""
+        self.telemetry.record_request(self.endpoint, ttfb, latency, prompt_tokens, completion_tokens,
+                                      input_chars=len(user_input), input_head=user_input[:60])
+
+    def _parse_stream_line(self, line: bytes) -> Optional[Dict]:
+        """스트림 한 줄 → JSON (openai: "data: {...}" SSE, ollama: JSON Lines)"""
+        if not line:
+            return None
+        text = line.decode("utf-8")
+        if self.backend != "ollama":
+            if not text.startswith("data:"):
+                return None
+            text = text[len("data:"):].strip()
+            if text == "[DONE]":
+                return None
+        return json.loads(text)
+
+    def _stream_text(self, chunk: Dict) -> str:
+        if self.backend == "ollama":
+            return chunk.get("response", "")
+        choices = chunk.get("choices") or [{}]
+        return (choices[0].get("delta") or {}).get("content") or ""
+
+    def _stream_timing(self, chunk: Dict) -> Dict:
+        """서버 측 prefill 정보 (llama.cpp timings, Ollama prompt_eval_*)"""
+        if self.backend == "ollama":
+            if not chunk.get("done"):
+                return {}
+            return {"prompt_ms": chunk.get("prompt_eval_duration", 0) / 1e6,
+                    "prompt_tokens": chunk.get("prompt_eval_count"),
+                    "completion_tokens": chunk.get("eval_count")}
+        timing = {}
+        timings = chunk.get("timings")
+        if timings:
+            timing.update(prompt_ms=timings.get("prompt_ms"), prompt_tokens=timings.get("prompt_n"),
+                          cached_tokens=timings.get("cache_n"))
+            if timings.get("predicted_n") is not None:
+                timing["completion_tokens"] = timings["predicted_n"]
+        usage = chunk.get("usage") or {}
+        cached = (usage.get("prompt_tokens_details") or {}).get("cached_tokens")
+        if cached is not None:
+            timing["cached_tokens"] = cached
+        if usage.get("completion_tokens") is not None:
+            timing["completion_tokens"] = usage["completion_tokens"]
+        return timing
+
+
+def binary_probability(result: Dict) -> Optional[float]:
+    """OpenAI 형식 logprobs 의 첫 토큰 후보에서 P(1) (0·1 두 토큰으로 재정규화)
+
+    한쪽만 후보에 있으면 나머지 확률을 다른 쪽으로 간주, 둘 다 없으면 None
+    """
+    try:
+        first = result['choices'][0]['logprobs']['content'][0]
+    except (KeyError, IndexError, TypeError):
+        return None
+
+    candidates = first.get('top_logprobs') or [first]
+    probs: Dict[str, float] = {}
+    for candidate in candidates + [first]:
+        token = candidate.get('token', '').strip()
+        if token in ("0", "1") and token not in probs:
+            probs[token] = math.exp(candidate['logprob'])
+
+    if "0" in probs and "1" in probs:
+        return probs["1"] / (probs["0"] + probs["1"])
+    if "1" in probs:
+        return probs["1"]
+    if "0" in probs:
+        return 1 - probs["0"]
+    return None
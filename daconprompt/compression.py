@@ -0,0 +1,189 @@
+"""
+프롬프트 자동 압축 (빔 서치)
+줄 삭제·목록 항목 삭제·괄호 삭제·축약 치환으로 후보를 만들고, 캐시된 LLM 평가기로
+채점해 최종 점수 0.9 × 정확도 + 0.1 × sqrt(1 - (L/3000)²) 가 높은 후보만 빔에 남김
+
+평가 횟수(budget)를 넘지 않으며, 이미 채점한 본문은 해시로 다시 평가하지 않음
+"""
+
+import re
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from daconprompt.checkpoint import prompt_hash
+from daconprompt.scoring import calculate_final_score
+
+# 출력 형식 지시 줄은 삭제 후보에서 제외
+DEFAULT_PROTECT = r'"[01]"'
+
+# 축약 치환 (정규식, 대체) - 팀이 수동 압축(Lv1~Lv3, M12)에서 쓰던 표기
+ABBREVIATIONS: List[Tuple[str, str]] = [
+    (r"(\S+)가 (\S+)에 속함", r"\1∈\2"),
+    (r"(\S+)와 (\S+) 동일 ?문장", r"\1∧\2동시"),
+    (r" 또는 ", "/"),
+    (r" 그리고 ", "&"),
+    (r"이면서", "∧"),
+    (r"자동차", "車"),
+    (r"\.(?=\n|$)", ""),                 # 줄 끝 마침표
+    (r" *([:=·/→,+∧]) *", r"\1"),        # 기호 주변 공백
+    (r"(?<=\S)  +", " "),                # 연속 공백
+    (r"\n{2,}", "\n"),                   # 빈 줄
+]
+
+# 목록 항목: A·B·C 또는 A/B/C
+_LIST_RE = re.compile(r"[^\s=·/()\[\]:,]+(?:[·/][^\s=·/()\[\]:,]+)+")
+_PAREN_RE = re.compile(r" ?\([^()\n]*\)")
+
+# 같은 라운드에서 종류별로 번갈아 평가 (축약 → 항목 → 괄호 → 줄)
+_KIND_ORDER = ("abbreviate", "term", "paren", "line")
+
+
+def candidate_edits(text: str, protect: str = DEFAULT_PROTECT,
+                    abbreviations: Sequence[Tuple[str, str]] = ABBREVIATIONS) -> Iterator[Tuple[str, str, str]]:
+    """편집 후보 (종류, 설명, 결과 본문) - 결과가 원문보다 짧은 것만"""
+    protected = re.compile(protect) if protect else None
+
+    for pattern, replacement in abbreviations:
+        edited = re.sub(pattern, replacement, text)
+        if len(edited) < len(text):
+            yield "abbreviate", f"{pattern} → {replacement}", edited
+
+    for match in _LIST_RE.finditer(text):
+        terms = re.split(r"([·/])", match.group())
+        for i in range(0, len(terms), 2):
+            # 항목과 앞(첫 항목이면 뒤) 구분자를 함께 삭제
+            rest = terms[:i - 1] + terms[i + 1:] if i else terms[2:]
+            edited = text[:match.start()] + "".join(rest) + text[match.end():]
+            yield "term", f"-{terms[i]}", edited
+
+    for match in _PAREN_RE.finditer(text):
+        yield "paren", f"-{match.group().strip()}", text[:match.start()] + text[match.end():]
+
+    lines = text.split("\n")
+    for i, line in enumerate(lines):
+        if not line.strip() or (protected and protected.search(line)):
+            continue
+        yield "line", f"-{line.strip()[:30]}", "\n".join(lines[:i] + lines[i + 1:])
+
+
+def engine_evaluator(engine, df: pd.DataFrame) -> Callable[[Dict[str, str]], Dict[str, float]]:
+    """EvaluationEngine → {이름: 본문} 을 한 번에 동시 평가해 {이름: 정확도} 반환하는 함수"""
+    def evaluate(prompts: Dict[str, str]) -> Dict[str, float]:
+        return {result['name']: result['accuracy'] for result in engine.sweep(prompts, df)}
+    return evaluate
+
+
+class PromptCompressor:
+    """예산 제한 빔 서치 압축기
+
+    evaluate: {이름: 본문} → {이름: 정확도} (engine_evaluator 등, 응답 캐시 사용 권장)
+    beam_width: 라운드마다 남길 후보 수
+    budget: 원문 포함 최대 평가 프롬프트 수
+    per_round: 라운드당 최대 평가 수 (기본: beam_width × 4)
+    max_accuracy_drop: 원문 대비 허용 정확도 하락 (넘으면 빔에서 제외)
+    patience: 최고 점수가 오르지 않아도 계속할 라운드 수
+    """
+
+    def __init__(self, evaluate: Callable[[Dict[str, str]], Dict[str, float]],
+                 beam_width: int = 4, budget: int = 60, per_round: Optional[int] = None,
+                 max_accuracy_drop: float = 0.0, patience: int = 1,
+                 protect: str = DEFAULT_PROTECT,
+                 abbreviations: Sequence[Tuple[str, str]] = ABBREVIATIONS,
+                 score: Callable[[float, int], float] = calculate_final_score,
+                 verbose: bool = True):
+        self.evaluate = evaluate
+        self.beam_width = beam_width
+        self.budget = budget
+        self.per_round = per_round or beam_width * 4
+        self.max_accuracy_drop = max_accuracy_drop
+        self.patience = patience
+        self.protect = protect
+        self.abbreviations = abbreviations
+        self.score = score
+        self.verbose = verbose
+        self.scored: Dict[str, Dict] = {}  # 본문 해시 → 후보
+
+    @property
+    def evaluations(self) -> int:
+        return len(self.scored)
+
+    def _score_batch(self, batch: List[Dict]) -> List[Dict]:
+        """후보 묶음 평가 (이름은 본문 해시)"""
+        accuracies = self.evaluate({c['hash']: c['text'] for c in batch})
+        for candidate in batch:
+            accuracy = accuracies[candidate['hash']]
+            candidate.update(accuracy=accuracy,
+                             score=self.score(accuracy, candidate['length']))
+            self.scored[candidate['hash']] = candidate
+        return batch
+
+    def _propose(self, beam: List[Dict]) -> List[Dict]:
+        """빔의 모든 후보에서 새 편집 후보 생성 → 종류별로 번갈아 정렬 (종류 안에서는 많이 줄인 순)"""
+        by_kind: Dict[str, List[Dict]] = {kind: [] for kind in _KIND_ORDER}
+        seen = set()
+        for parent in beam:
+            for kind, description, text in candidate_edits(parent['text'], self.protect, self.abbreviations):
+                key = prompt_hash(text)
+                if key in self.scored or key in seen:
+                    continue
+                seen.add(key)
+                by_kind[kind].append({
+                    'hash': key,
+                    'text': text,
+                    'length': len(text),
+                    'edits': parent['edits'] + [description],
+                })
+
+        queues = [sorted(by_kind[kind], key=lambda c: c['length']) for kind in _KIND_ORDER]
+        ordered = []
+        while any(queues):
+            for queue in queues:
+                if queue:
+                    ordered.append(queue.pop(0))
+        return ordered
+
+    def search(self, text: str) -> Dict:
+        """빔 서치 실행 → {'original', 'best', 'front', 'evaluations', 'rounds'}"""
+        root = self._score_batch([{'hash': prompt_hash(text), 'text': text,
+                                   'length': len(text), 'edits': []}])[0]
+        floor = root['accuracy'] - self.max_accuracy_drop
+        beam, best = [root], root
+        stale = rounds = 0
+        if self.verbose:
+            print(f"원문: {root['length']}자, 정확도 {root['accuracy']:.2%}, 점수 {root['score']:.4f}")
+
+        while self.evaluations < self.budget and stale <= self.patience:
+            proposals = self._propose(beam)
+            if not proposals:
+                break
+            batch = proposals[:min(self.per_round, self.budget - self.evaluations)]
+            self._score_batch(batch)
+            rounds += 1
+
+            pool = beam + [c for c in batch if c['accuracy'] >= floor]
+            beam = sorted(pool, key=lambda c: (-c['score'], c['length']))[:self.beam_width]
+            if beam[0]['score'] > best['score']:
+                best, stale = beam[0], 0
+            else:
+                stale += 1
+            if self.verbose:
+                print(f"  라운드 {rounds}: {len(batch)}개 평가 (누적 {self.evaluations}/{self.budget}) - "
+                      f"최고 {best['length']}자, 정확도 {best['accuracy']:.2%}, 점수 {best['score']:.4f}")
+
+        return {
+            'original': root,
+            'best': best,
+            'front': self.front(),
+            'evaluations': self.evaluations,
+            'rounds': rounds,
+        }
+
+    def front(self) -> List[Dict]:
+        """평가한 후보 중 길이 vs 정확도 파레토 프런트 (짧은 순)"""
+        front, best_accuracy = [], -1.0
+        for candidate in sorted(self.scored.values(), key=lambda c: (c['length'], -c['accuracy'])):
+            if candidate['accuracy'] > best_accuracy:
+                front.append(candidate)
+                best_accuracy = candidate['accuracy']
+        return front
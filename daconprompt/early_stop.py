@@ -0,0 +1,79 @@
+"""
+순차 조기 중단 (early stopping)
+샘플을 하나씩 채점하면서 남은 샘플을 모두 맞혀도 현재 1위 점수를 넘을 수 없는
+후보 프롬프트는 나머지 호출을 생략
+"""
+
+import math
+from statistics import NormalDist
+from typing import Optional
+
+from daconprompt.scoring import calculate_dacon_score
+
+
+def max_achievable_score(correct: int, done: int, total: int, prompt_length: int) -> float:
+    """남은 샘플을 전부 맞혔을 때의 Dacon 점수 (도달 가능한 최대값)"""
+    return calculate_dacon_score((correct + (total - done)) / total, prompt_length)
+
+
+def wilson_upper_bound(correct: int, n: int, confidence: float) -> float:
+    """정확도의 단측 Wilson 신뢰상한"""
+    if n == 0:
+        return 1.0
+    z = NormalDist().inv_cdf(confidence)
+    p = correct / n
+    denom = 1 + z * z / n
+    center = p + z * z / (2 * n)
+    margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n))
+    return min(1.0, (center + margin) / denom)
+
+
+class EarlyStopper:
+    """후보 1개의 조기 중단 판정기
+
+    incumbent: 현재 1위 Dacon 점수 (None 이면 중단하지 않음)
+    confidence: None 이면 결정적 상한(남은 샘플 전부 정답)으로만 판정,
+                값이 있으면 남은 샘플 정확도를 Wilson 신뢰상한으로 추정해 더 일찍 중단
+    min_samples: 통계적 판정을 시작할 최소 채점 샘플 수
+    """
+
+    def __init__(self, total: int, prompt_length: int, incumbent: Optional[float],
+                 confidence: Optional[float] = None, min_samples: int = 10):
+        self.total = total
+        self.prompt_length = prompt_length
+        self.incumbent = incumbent
+        self.confidence = confidence
+        self.min_samples = min_samples
+        self.correct = 0
+        self.done = 0
+        self.failed = 0
+        self.stopped = False
+
+    @property
+    def upper_bound(self) -> float:
+        """현재 판정 기준 최대 도달 점수"""
+        if self.confidence is None or self.done < self.min_samples:
+            return max_achievable_score(self.correct, self.done, self.total, self.prompt_length)
+
+        remaining = self.total - self.done
+        p_upper = wilson_upper_bound(self.correct, self.done, self.confidence)
+        projected = (self.correct + p_upper * remaining) / self.total
+        return calculate_dacon_score(projected, self.prompt_length)
+
+    @property
+    def calls_saved(self) -> int:
+        """생략한 호출 수 (요청 실패 샘플은 보낸 호출이므로 제외)"""
+        return self.total - self.done - self.failed
+
+    def record_failure(self):
+        """요청 실패 샘플 1건 (채점 제외, 호출은 한 것으로 계산)"""
+        self.failed += 1
+
+    def update(self, is_correct: bool) -> bool:
+        """샘플 1건 반영 - 중단해야 하면 True"""
+        self.done += 1
+        if is_correct:
+            self.correct += 1
+        if self.incumbent is not None and self.done + self.failed < self.total:
+            self.stopped = self.upper_bound <= self.incumbent
+        return self.stopped
@@ -0,0 +1,351 @@
+"""
+asyncio 기반 동시 평가 엔진
+프롬프트 × 샘플 요청을 엔드포인트별 동시 처리 한도 안에서 병렬로 보내고,
+결과는 샘플 순서대로 기존 evaluate_prompt 와 같은 dict 형식으로 반환
+
+ordering="grouped" 면 프롬프트 하나의 샘플을 한 슬롯에서 연속으로 보내
+서버 prefix(KV) 캐시가 같은 시스템 프롬프트를 재사용하도록 함
+
+batch_size=K 면 기사 K건을 번호 붙여 한 요청으로 분류하고, 형식이 깨진 칸만 단건 호출로 재시도
+
+재시도까지 실패한 요청은 "0" 예측으로 채점하지 않고 결과의 'failed' 에 따로 기록
+(정확도는 응답받은 샘플 기준, 체크포인트에 남기지 않아 --resume 때 다시 시도)
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from daconprompt.checkpoint import Checkpoint, prompt_hash
+from daconprompt.client import LLMClient
+from daconprompt.early_stop import EarlyStopper
+from daconprompt.scoring import (calculate_dacon_score, format_article, format_batch,
+                                 parse_batch_predictions, parse_prediction)
+
+# 일괄 요청 max_tokens (기사 1건 "12: 1\n" 기준 여유 있게)
+BATCH_TOKENS_PER_ARTICLE = 8
+
+
+def sample_id_of(row: pd.Series, idx) -> object:
+    """샘플 ID (ID 또는 id 또는 인덱스)"""
+    return row.get('ID', row.get('id', idx))
+
+
+def build_result(prompt_name: str, prompt_text: str, detailed_results: List[Dict],
+                 failed: Optional[List[Dict]] = None) -> Dict:
+    """샘플별 결과로 프롬프트 평가 결과 dict 생성 (failed: 요청 실패 샘플, 있으면 'failed' 키로)"""
+    correct = sum(1 for r in detailed_results if r['correct'])
+    total = len(detailed_results)
+    accuracy = correct / total if total else 0.0
+    errors = [
+        {'id': r['id'], 'title': r['title'][:50], 'actual': r['actual'], 'predicted': r['predicted']}
+        for r in detailed_results if not r['correct']
+    ]
+
+    result = {
+        'name': prompt_name,
+        'length': len(prompt_text),
+        'accuracy': accuracy,
+        'correct': correct,
+        'total': total,
+        'dacon_score': calculate_dacon_score(accuracy, len(prompt_text)),
+        'errors': errors[:5],  # 상위 5개 오류만
+        'detailed_results': detailed_results  # 전체 상세 결과
+    }
+    if failed:
+        result['failed'] = failed
+    return result
+
+
+def is_failure(record: Dict) -> bool:
+    """요청 실패로 채점하지 못한 샘플인지"""
+    return 'error' in record
+
+
+class EvaluationEngine:
+    """프롬프트 × 샘플 동시 평가기
+
+    concurrency: 엔드포인트당 동시 요청 수 (서버 parallel slot 수에 맞춤)
+    checkpoint: 있으면 샘플마다 결과를 기록하고, 이미 기록된 (프롬프트, 샘플)은 호출 생략
+    ordering: "interleaved" (모든 프롬프트×샘플 동시) 또는 "grouped" (슬롯마다 프롬프트 1개씩 연속)
+    measure_ttft: 스트리밍 호출로 요청별 첫 토큰 시간을 self.timings 에 기록
+    batch_size: 1 보다 크면 요청 하나에 기사 batch_size 건 (조기 중단 평가에는 미적용)
+    """
+
+    def __init__(self, client: Optional[LLMClient] = None, concurrency: int = 4,
+                 verbose: bool = True, checkpoint: Optional[Checkpoint] = None,
+                 ordering: str = "interleaved", measure_ttft: bool = False,
+                 batch_size: int = 1):
+        if ordering not in ("interleaved", "grouped"):
+            raise ValueError(f"알 수 없는 ordering: {ordering}")
+        self.client = client or LLMClient()
+        self.concurrency = concurrency
+        self.verbose = verbose
+        self.checkpoint = checkpoint
+        self.ordering = ordering
+        self.measure_ttft = measure_ttft
+        self.timings: List[Dict] = []
+        if batch_size > 1 and self.client.constrain:
+            raise ValueError("일괄 분류(batch_size>1)는 0/1 한 토큰 강제(constrain)와 함께 쓸 수 없음")
+        self.batch_size = batch_size
+        self.batch_stats = {'requests': 0, 'articles': 0, 'fallbacks': 0}
+        self._limits: Dict[str, asyncio.Semaphore] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _limit_for(self, endpoint: str) -> asyncio.Semaphore:
+        """엔드포인트별 동시 처리 한도"""
+        if endpoint not in self._limits:
+            self._limits[endpoint] = asyncio.Semaphore(self.concurrency)
+        return self._limits[endpoint]
+
+    async def classify(self, prompt_text: str, user_input: str, slot: Optional[int] = None,
+                       max_tokens: Optional[int] = None) -> str:
+        """단일 분류 요청 (블로킹 HTTP 호출은 스레드 풀에서 실행) - 재시도까지 실패하면 예외"""
+        loop = asyncio.get_running_loop()
+        async with self._limit_for(self.client.endpoint):
+            if not self.measure_ttft:
+                return await loop.run_in_executor(
+                    self._executor, self.client.complete, prompt_text, user_input, slot, max_tokens
+                )
+            response, timing = await loop.run_in_executor(
+                self._executor, self.client.complete_timed, prompt_text, user_input, slot, max_tokens
+            )
+            self.timings.append({'prompt_hash': prompt_hash(prompt_text), 'slot': slot, **timing})
+            return response
+
+    async def classify_binary(self, prompt_text: str, user_input: str,
+                              slot: Optional[int] = None) -> Tuple[int, Optional[float], str]:
+        """0/1 한 토큰 분류 → (예측, P(1), 응답) - client.constrain 설정 시 사용, 실패하면 예외"""
+        loop = asyncio.get_running_loop()
+        async with self._limit_for(self.client.endpoint):
+            return await loop.run_in_executor(
+                self._executor, self.client.classify_binary, prompt_text, user_input, slot
+            )
+
+    async def _evaluate_sample(self, prompt_name: str, prompt_text: str, idx,
+                               row: pd.Series, slot: Optional[int] = None) -> Dict:
+        """샘플 1건 평가 (체크포인트에 있으면 재사용, 요청 실패 시 실패 기록)"""
+        sample_id = sample_id_of(row, idx)
+        if self.checkpoint is not None:
+            cached = self.checkpoint.get(prompt_name, prompt_text, sample_id)
+            if cached is not None:
+                return cached
+
+        user_input = format_article(row['title'], row['content'])
+        try:
+            if self.client.constrain:
+                predicted, p_one, response = await self.classify_binary(prompt_text, user_input, slot)
+                return self._record(prompt_name, prompt_text, sample_id, row, predicted, response, p_one)
+            response = await self.classify(prompt_text, user_input, slot)
+        except Exception as e:
+            return self._failure(prompt_name, sample_id, row, e)
+        return self._record(prompt_name, prompt_text, sample_id, row, parse_prediction(response), response)
+
+    def _failure(self, prompt_name: str, sample_id, row: pd.Series, error: Exception) -> Dict:
+        """요청 실패 기록 (채점·체크포인트 제외)"""
+        if self.verbose:
+            print(f"    요청 실패 [{prompt_name}] {sample_id}: {error}")
+        return {
+            'id': sample_id,
+            'title': row['title'][:80],
+            'actual': int(row['label']),
+            'error': f"{type(error).__name__}: {error}"[:200]
+        }
+
+    def _record(self, prompt_name: str, prompt_text: str, sample_id, row: pd.Series,
+                predicted: int, response: str, p_one: Optional[float] = None) -> Dict:
+        """샘플 결과 dict 생성 + 체크포인트 기록 (p_one: logprobs 로 얻은 P(1), 있을 때만)"""
+        actual = int(row['label'])
+        result = {
+            'id': sample_id,
+            'title': row['title'][:80],
+            'actual': actual,
+            'predicted': predicted,
+            'correct': predicted == actual,
+            'response': response[:100]  # LLM 원본 응답 일부
+        }
+        if p_one is not None:
+            result['p_one'] = p_one
+        if self.checkpoint is not None:
+            self.checkpoint.append(prompt_name, prompt_text, sample_id, result)
+        return result
+
+    async def _evaluate_batch(self, prompt_name: str, prompt_text: str, rows: List,
+                              slot: Optional[int] = None) -> List[Dict]:
+        """기사 여러 건을 요청 하나로 평가 (형식이 깨진 칸은 단건 호출로 재시도)"""
+        results: Dict[int, Dict] = {}
+        pending = []
+        for position, (idx, row) in enumerate(rows):
+            cached = (self.checkpoint.get(prompt_name, prompt_text, sample_id_of(row, idx))
+                      if self.checkpoint is not None else None)
+            if cached is not None:
+                results[position] = cached
+            else:
+                pending.append((position, idx, row))
+
+        if len(pending) == 1:
+            position, idx, row = pending[0]
+            results[position] = await self._evaluate_sample(prompt_name, prompt_text, idx, row, slot)
+        elif pending:
+            user_input = format_batch([(row['title'], row['content']) for _, _, row in pending])
+            try:
+                response = await self.classify(prompt_text, user_input, slot,
+                                               max_tokens=BATCH_TOKENS_PER_ARTICLE * len(pending))
+                labels = parse_batch_predictions(response, len(pending))
+            except Exception:
+                response, labels = "", [None] * len(pending)  # 일괄 요청 실패 → 전부 단건으로
+            self.batch_stats['requests'] += 1
+            self.batch_stats['articles'] += len(pending)
+
+            retry = []
+            for (position, idx, row), label in zip(pending, labels):
+                if label is None:
+                    retry.append((position, idx, row))
+                else:
+                    results[position] = self._record(prompt_name, prompt_text, sample_id_of(row, idx),
+                                                     row, label, response)
+            self.batch_stats['fallbacks'] += len(retry)
+            retried = await asyncio.gather(
+                *[self._evaluate_sample(prompt_name, prompt_text, idx, row, slot) for _, idx, row in retry]
+            )
+            for (position, _, _), result in zip(retry, retried):
+                results[position] = result
+
+        return [results[position] for position in range(len(rows))]
+
+    async def evaluate_prompt_async(self, prompt_name: str, prompt_text: str,
+                                    df: pd.DataFrame,
+                                    stopper: Optional[EarlyStopper] = None,
+                                    slot: Optional[int] = None) -> Dict:
+        """프롬프트 1개를 전체 샘플에 대해 동시 평가
+
+        stopper 가 있으면 concurrency 개씩 묶어 보내고, 묶음마다 조기 중단 여부 확인
+        slot 이 있으면 그 슬롯에서 샘플을 순서대로 하나씩 (prefix 캐시 재사용)
+        """
+        start_time = time.time()
+        rows = list(df.iterrows())
+
+        if self.batch_size > 1 and stopper is None:
+            chunks = [rows[i:i + self.batch_size] for i in range(0, len(rows), self.batch_size)]
+            if slot is None:
+                batches = await asyncio.gather(
+                    *[self._evaluate_batch(prompt_name, prompt_text, chunk) for chunk in chunks]
+                )
+            else:
+                batches = [await self._evaluate_batch(prompt_name, prompt_text, chunk, slot) for chunk in chunks]
+            detailed_results = [r for batch in batches for r in batch]
+        elif slot is not None:
+            detailed_results = []
+            for idx, row in rows:
+                detailed_results.append(await self._evaluate_sample(prompt_name, prompt_text, idx, row, slot))
+        elif stopper is None:
+            tasks = [self._evaluate_sample(prompt_name, prompt_text, idx, row) for idx, row in rows]
+            detailed_results = list(await asyncio.gather(*tasks))  # gather는 입력 순서 유지
+        else:
+            detailed_results = []
+            for start in range(0, len(rows), self.concurrency):
+                chunk = rows[start:start + self.concurrency]
+                chunk_results = await asyncio.gather(
+                    *[self._evaluate_sample(prompt_name, prompt_text, idx, row) for idx, row in chunk]
+                )
+                for r in chunk_results:
+                    detailed_results.append(r)
+                    if is_failure(r):
+                        stopper.record_failure()
+                    else:
+                        stopper.update(r['correct'])
+                if stopper.stopped:
+                    break
+
+        failed = [r for r in detailed_results if is_failure(r)]
+        if failed:
+            detailed_results = [r for r in detailed_results if not is_failure(r)]
+        result = build_result(prompt_name, prompt_text, detailed_results, failed)
+        result['elapsed'] = time.time() - start_time
+        if stopper is not None and stopper.stopped:
+            # 중단된 후보: accuracy·dacon_score 는 채점한 샘플 기준 관측값, 도달 가능 상한은 upper_bound
+            result.update({
+                'upper_bound': stopper.upper_bound,
+                'stopped_early': True,
+                'calls_saved': stopper.calls_saved
+            })
+        if self.verbose:
+            status = f" - 조기 중단 ({stopper.calls_saved}회 절약)" if result.get('stopped_early') else ""
+            if failed:
+                status += f" - 요청 실패 {len(failed)}건 제외"
+            print(f"  [{prompt_name}] {result['correct']}/{result['total']} "
+                  f"({result['accuracy']:.2%}) - {result['elapsed']:.1f}초{status}")
+        return result
+
+    async def sweep_async(self, prompts: Dict[str, str], df: pd.DataFrame) -> List[Dict]:
+        """여러 프롬프트를 한꺼번에 동시 평가 (결과는 prompts 순서)"""
+        if self.ordering == "grouped":
+            return await self._sweep_grouped_async(prompts, df)
+        tasks = [self.evaluate_prompt_async(name, text, df) for name, text in prompts.items()]
+        return list(await asyncio.gather(*tasks))
+
+    async def _sweep_grouped_async(self, prompts: Dict[str, str], df: pd.DataFrame) -> List[Dict]:
+        """슬롯 concurrency 개가 프롬프트를 하나씩 가져가 그 샘플 전체를 연속 처리"""
+        pending = list(prompts.items())
+        results: Dict[str, Dict] = {}
+
+        async def worker(slot: int):
+            while pending:
+                name, text = pending.pop(0)
+                results[name] = await self.evaluate_prompt_async(name, text, df, slot=slot)
+
+        await asyncio.gather(*[worker(slot) for slot in range(min(self.concurrency, len(pending)))])
+        return [results[name] for name in prompts]
+
+    async def evaluate_jobs_async(self, jobs: List[Tuple[str, str, pd.DataFrame]]) -> List[Dict]:
+        """(이름, 본문, 샘플 부분집합) 묶음을 한꺼번에 동시 평가 (결과는 jobs 순서)"""
+        tasks = [self.evaluate_prompt_async(name, text, df) for name, text, df in jobs]
+        return list(await asyncio.gather(*tasks))
+
+    async def sweep_early_stop_async(self, prompts: Dict[str, str], df: pd.DataFrame,
+                                     confidence: Optional[float] = None) -> List[Dict]:
+        """프롬프트를 차례로 평가하며 현재 1위를 넘을 수 없는 후보는 조기 중단"""
+        results = []
+        incumbent = None
+        for name, text in prompts.items():
+            stopper = EarlyStopper(len(df), len(text), incumbent, confidence)
+            result = await self.evaluate_prompt_async(name, text, df, stopper)
+            results.append(result)
+            if not result.get('stopped_early'):
+                incumbent = max(incumbent or 0.0, result['dacon_score'])
+
+        if self.verbose:
+            saved = sum(r.get('calls_saved', 0) for r in results)
+            print(f"  조기 중단으로 절약한 호출: {saved}/{len(df) * len(prompts)}회")
+        return results
+
+    def _run(self, coro):
+        """동시 처리 한도 크기의 스레드 풀로 코루틴 실행"""
+        self._limits = {}
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            self._executor = executor
+            try:
+                return asyncio.run(coro)
+            finally:
+                self._executor = None
+
+    def evaluate_prompt(self, prompt_name: str, prompt_text: str, df: pd.DataFrame,
+                        stopper: Optional[EarlyStopper] = None) -> Dict:
+        """동기 래퍼 - evaluate_prompt_async"""
+        return self._run(self.evaluate_prompt_async(prompt_name, prompt_text, df, stopper))
+
+    def sweep(self, prompts: Dict[str, str], df: pd.DataFrame) -> List[Dict]:
+        """동기 래퍼 - sweep_async"""
+        return self._run(self.sweep_async(prompts, df))
+
+    def evaluate_jobs(self, jobs: List[Tuple[str, str, pd.DataFrame]]) -> List[Dict]:
+        """동기 래퍼 - evaluate_jobs_async"""
+        return self._run(self.evaluate_jobs_async(jobs))
+
+    def sweep_early_stop(self, prompts: Dict[str, str], df: pd.DataFrame,
+                         confidence: Optional[float] = None) -> List[Dict]:
+        """동기 래퍼 - sweep_early_stop_async"""
+        return self._run(self.sweep_early_stop_async(prompts, df, confidence))
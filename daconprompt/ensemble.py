@@ -0,0 +1,153 @@
+"""
+프롬프트 앙상블·오라클 조합 탐색
+저장된 샘플별 예측(CorrectnessMatrix)으로 크기 k 이하 모든 프롬프트 조합의
+다수결/가중 투표/any/all 정확도와 오라클 상한(하나라도 맞히면 정답)을 일괄 계산해
+추가 호출 비용 대비 정확도 이득을 보고
+
+주의: 가중치와 평가가 같은 샘플이라 가중 투표·오라클 수치는 낙관적인 값
+"""
+
+import itertools
+import math
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from daconprompt.bitset import CorrectnessMatrix
+
+VOTE_RULES = ("majority", "weighted", "any", "all", "oracle")
+
+
+def accuracy_weights(predictions: np.ndarray, labels: np.ndarray) -> np.ndarray:
+    """프롬프트별 가중치 = 정확도 로그 오즈 (가중 다수결)"""
+    accuracy = (predictions == labels).mean(axis=1)
+    accuracy = np.clip(accuracy, 0.01, 0.99)
+    return np.log(accuracy / (1 - accuracy))
+
+
+def _combinations(n: int, size: int, chunk_size: int):
+    """크기 size 조합 인덱스를 (chunk, size) 배열로 나눠 생성"""
+    iterator = itertools.combinations(range(n), size)
+    while True:
+        chunk = np.array(list(itertools.islice(iterator, chunk_size)), dtype=np.int32)
+        if not len(chunk):
+            return
+        yield chunk.reshape(-1, size)
+
+
+def vote_accuracy(correct: np.ndarray, labels: np.ndarray, combos: np.ndarray,
+                  weights: Optional[np.ndarray] = None, tie: int = 0) -> Dict[str, np.ndarray]:
+    """조합 묶음(m × k)별 투표 규칙 정확도
+
+    correct: (프롬프트, 샘플) 정오 bool. 이진 분류라 투표 결과의 정오는
+    "정답 쪽 표 수"만으로 정해지므로 예측값 대신 정오 행렬 하나만 모아서 계산
+    tie: 다수결 동률 시 예측 (모호하면 0)
+    """
+    size = combos.shape[1]
+    n = correct.shape[1]
+    right = correct[combos].sum(axis=1, dtype=np.int16)   # (m, 샘플) 정답 쪽 표 수
+    positive = labels.astype(bool)
+    tie_right = labels == tie                             # 동률일 때 맞는 샘플
+
+    def rate(hit: np.ndarray) -> np.ndarray:
+        return np.count_nonzero(hit, axis=1) / n
+
+    results = {
+        "majority": rate((2 * right > size) | ((2 * right == size) & tie_right)),
+    }
+    if weights is not None:
+        # 정답 쪽 가중치 합 - 오답 쪽 가중치 합
+        signed = np.where(correct, weights[:, None], -weights[:, None]).astype(np.float32)
+        margin = signed[combos].sum(axis=1)
+        results["weighted"] = rate((margin > 0) | ((margin == 0) & tie_right))
+    # any: 한 표라도 1이면 1 → 정답 1 은 한 표라도 맞으면, 정답 0 은 모두 맞아야 정답
+    results["any"] = rate(np.where(positive, right > 0, right == size))
+    # all: 모두 1이어야 1 → 반대
+    results["all"] = rate(np.where(positive, right == size, right > 0))
+    results["oracle"] = rate(right > 0)
+    return results
+
+
+class EnsemblePlanner:
+    """저장된 예측으로 앙상블 후보를 평가
+
+    matrix: CorrectnessMatrix (run 의 모든 샘플을 평가한 프롬프트만 사용)
+    lengths: 프롬프트 이름 → 길이 (토큰 비용 근사, 없으면 생략)
+    """
+
+    def __init__(self, matrix: CorrectnessMatrix, run: Optional[str] = None,
+                 lengths: Optional[Dict[str, int]] = None, chunk_size: int = 20_000):
+        predictions = matrix.predictions(run)
+        complete = np.flatnonzero((predictions >= 0).all(axis=1))
+        self.prompts = [matrix.prompts[i] for i in complete]
+        self.predictions = predictions[complete].astype(np.int8)
+        self.labels = matrix.labels.astype(np.int8)
+        self.lengths = lengths or {}
+        self.chunk_size = chunk_size
+        self.correct = self.predictions == self.labels
+        self.weights = accuracy_weights(self.predictions, self.labels)
+        self.single_accuracy = self.correct.mean(axis=1)
+
+    @property
+    def best_single(self) -> Dict:
+        i = int(np.argmax(self.single_accuracy))
+        return {"prompts": [self.prompts[i]], "accuracy": float(self.single_accuracy[i])}
+
+    def search(self, max_size: int = 3, top: int = 5, tie: int = 0) -> Dict[int, Dict[str, List[Dict]]]:
+        """크기 2..max_size 조합 전수 평가 → {크기: {규칙: 상위 조합 목록}}"""
+        n = len(self.prompts)
+        baseline = self.best_single["accuracy"]
+        report: Dict[int, Dict[str, List[Dict]]] = {}
+
+        for size in range(2, min(max_size, n) + 1):
+            best: Dict[str, List] = {rule: [] for rule in VOTE_RULES}
+            for combos in _combinations(n, size, self.chunk_size):
+                scores = vote_accuracy(self.correct, self.labels, combos, self.weights, tie)
+                for rule, accuracy in scores.items():
+                    # 묶음별 상위 top 개만 후보로 유지
+                    keep = np.argsort(-accuracy, kind="stable")[:top]
+                    best[rule].extend((float(accuracy[i]), combos[i].tolist()) for i in keep)
+
+            report[size] = {}
+            for rule, candidates in best.items():
+                candidates.sort(key=lambda c: -c[0])
+                report[size][rule] = [
+                    self._describe(combo, accuracy, baseline, size)
+                    for accuracy, combo in candidates[:top]
+                ]
+        return report
+
+    def _describe(self, combo: Sequence[int], accuracy: float, baseline: float, size: int) -> Dict:
+        names = [self.prompts[i] for i in combo]
+        gain = accuracy - baseline
+        entry = {
+            "prompts": names,
+            "accuracy": accuracy,
+            "gain": gain,
+            "calls_per_sample": size,
+            "gain_per_extra_call": gain / (size - 1),
+        }
+        if all(name in self.lengths for name in names):
+            entry["total_prompt_chars"] = sum(self.lengths[name] for name in names)
+        return entry
+
+
+def print_plan(planner: EnsemblePlanner, report: Dict[int, Dict[str, List[Dict]]],
+               rules: Sequence[str] = VOTE_RULES):
+    """탐색 결과 요약 출력"""
+    single = planner.best_single
+    print(f"\n[단일 최고] {single['prompts'][0]}: {single['accuracy']:.2%} (호출 1회/샘플)")
+    for size, by_rule in report.items():
+        print(f"\n[{size}개 조합] 호출 {size}회/샘플")
+        for rule in rules:
+            if not by_rule.get(rule):
+                continue
+            best = by_rule[rule][0]
+            label = "오라클 상한" if rule == "oracle" else rule
+            print(f"  {label:<10} {best['accuracy']:.2%} ({best['gain']:+.2%}, "
+                  f"추가 호출당 {best['gain_per_extra_call']:+.2%}) - {' + '.join(best['prompts'])}")
+
+
+def combinations_count(n: int, max_size: int) -> int:
+    """평가할 조합 수"""
+    return sum(math.comb(n, k) for k in range(2, max_size + 1))
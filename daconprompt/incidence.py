@@ -0,0 +1,213 @@
+"""
+샘플 × 키워드 출현 행렬
+데이터셋 전체를 한 번만 스캔해 (샘플, 키워드) 출현 좌표와 제목 전용·같은 문장 동시 출현
+변형을 만들어 두고, 가중치 규칙 채점을 NumPy 행렬-벡터 곱으로 수행
+
+프롬프트마다 기사 전체를 다시 훑던 시뮬레이터(full_evaluation, v2_500char_experiments)와
+가중치/임계값 탐색은 이 행렬만 재사용
+"""
+
+import bisect
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from daconprompt.matcher import KeywordMatcher
+from daconprompt.rules import _SENTENCE_RE, _ExprCompiler
+
+
+class KeywordIncidence:
+    """카테고리별 키워드 출현 행렬
+
+    keyword_coords / title_keyword_coords: 샘플×키워드 희소 좌표 (rows, cols)
+    text / title: 샘플×집합 bool 행렬 (집합 키워드 중 하나라도 등장)
+    cooccur: 샘플×집합×집합 bool (두 집합이 같은 문장에 함께 등장)
+    """
+
+    def __init__(self, sets: Dict[str, Iterable[str]], titles: Sequence[str],
+                 contents: Sequence[str], lowercase: bool = True):
+        self.matcher = KeywordMatcher(sets, lowercase=lowercase)
+        self.set_names: List[str] = list(self.matcher.categories)
+        self.set_index = {name: i for i, name in enumerate(self.set_names)}
+        self.keywords: List[str] = list(self.matcher.keyword_categories)
+        self.keyword_index = {keyword: i for i, keyword in enumerate(self.keywords)}
+        self.n_samples = len(titles)
+
+        # 키워드 → 소속 집합 (키워드×집합)
+        self.membership = np.zeros((len(self.keywords), len(self.set_names)), dtype=bool)
+        for keyword, names in self.matcher.keyword_categories.items():
+            for name in names:
+                self.membership[self.keyword_index[keyword], self.set_index[name]] = True
+
+        self.cooccur = np.zeros((self.n_samples, len(self.set_names), len(self.set_names)), dtype=bool)
+        text_coords: List[Tuple[int, int]] = []
+        title_coords: List[Tuple[int, int]] = []
+
+        for i, (title, content) in enumerate(zip(titles, contents)):
+            text = f"{title} {content}"
+            if lowercase:
+                text = text.lower()
+            bounds = [m.end() for m in _SENTENCE_RE.finditer(text)]
+
+            found = set()
+            sentences: Dict[int, set] = {}
+            for pos, keyword in self.matcher.iter_matches(text):
+                j = self.keyword_index[keyword]
+                found.add(j)
+                sentences.setdefault(bisect.bisect_right(bounds, pos), set()).add(j)
+            text_coords.extend((i, j) for j in found)
+            title_coords.extend((i, self.keyword_index[k]) for k in self.matcher.found(title))
+
+            for keyword_ids in sentences.values():
+                in_sentence = self.membership[list(keyword_ids)].any(axis=0)
+                self.cooccur[i] |= np.outer(in_sentence, in_sentence)
+
+        self.keyword_coords = self._coords(text_coords)
+        self.title_keyword_coords = self._coords(title_coords)
+        self.text = self._set_view(self.keyword_coords)
+        self.title = self._set_view(self.title_keyword_coords)
+
+    @staticmethod
+    def _coords(pairs: List[Tuple[int, int]]) -> Tuple[np.ndarray, np.ndarray]:
+        if not pairs:
+            return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32)
+        array = np.asarray(pairs, dtype=np.int32)
+        return array[:, 0], array[:, 1]
+
+    def _set_view(self, coords: Tuple[np.ndarray, np.ndarray]) -> np.ndarray:
+        """희소 키워드 좌표 → 샘플×집합 bool 행렬"""
+        rows, cols = coords
+        counts = np.zeros((self.n_samples, len(self.set_names)), dtype=np.int32)
+        sample_ids, set_ids = np.nonzero(self.membership[cols])
+        np.add.at(counts, (rows[sample_ids], set_ids), 1)
+        return counts > 0
+
+    def keyword_matrix(self, where: str = "text") -> np.ndarray:
+        """샘플×키워드 dense bool 행렬 (where: "text" | "title")"""
+        rows, cols = self.keyword_coords if where == "text" else self.title_keyword_coords
+        matrix = np.zeros((self.n_samples, len(self.keywords)), dtype=bool)
+        matrix[rows, cols] = True
+        return matrix
+
+    def column(self, name: str, where: str = "text") -> np.ndarray:
+        """집합 1개의 샘플별 출현 여부"""
+        view = self.text if where == "text" else self.title
+        return view[:, self.set_index[name]]
+
+    def pair(self, left: str, right: str) -> np.ndarray:
+        """두 집합의 같은 문장 동시 출현 여부"""
+        return self.cooccur[:, self.set_index[left], self.set_index[right]]
+
+    def score(self, weights: Dict[str, float], where: str = "text") -> np.ndarray:
+        """집합별 가중치 합계 (샘플×집합 행렬 @ 가중치 벡터)"""
+        vector = np.zeros(len(self.set_names))
+        for name, weight in weights.items():
+            vector[self.set_index[name]] = weight
+        view = self.text if where == "text" else self.title
+        return view @ vector
+
+
+class _VectorExprCompiler(_ExprCompiler):
+    """조건식 → NumPy bool 배열 식"""
+
+    OR = " | "
+    AND = " & "
+    NOT = "(~{})"
+    SET = "p[{!r}]"
+    TITLE = "t[{!r}]"
+    COOCCUR = "c[{!r}, {!r}]"
+
+
+class VectorizedRules:
+    """RuleClassifier 와 같은 규칙 JSON 을 출현 행렬 위에서 일괄 채점
+
+    scores 조건들을 샘플×특징 행렬 F 로 미리 계산해 두고,
+    가중치 행렬 W(설정 m개 × 특징 f개)에 대해 total = F @ W.T 로 m개 설정을 한 번에 판정
+    """
+
+    def __init__(self, spec: Dict, titles: Sequence[str], contents: Sequence[str],
+                 incidence: Optional[KeywordIncidence] = None):
+        self.spec = spec
+        self.name = spec.get("name", "rules")
+        self.tiers: List[Dict] = spec.get("tiers", [])
+        self.scores: List[Dict] = spec.get("scores", [])
+        self.decision: Optional[str] = spec.get("decision")
+        self.default = int(spec.get("default", 0))
+        self.incidence = incidence or KeywordIncidence(
+            spec["sets"], titles, contents, lowercase=spec.get("lowercase", True))
+
+        names = set(spec["sets"])
+        self.feature_names = [score["if"] for score in self.scores]
+        self.weights = np.array([score["weight"] for score in self.scores], dtype=float)
+
+        # 특징 행렬 (샘플×특징)
+        columns = [self._eval(_VectorExprCompiler(expr, names).compile()) for expr in self.feature_names]
+        self.features = (np.column_stack(columns).astype(float) if columns
+                         else np.zeros((self.incidence.n_samples, 0)))
+
+        self._decide = self._compile_decision(names)
+
+    def _namespace(self) -> Dict:
+        """조건식 평가용 (샘플, 1) 열 벡터 - (샘플, 설정) total 과 브로드캐스트"""
+        incidence = self.incidence
+        return {
+            "np": np,
+            "p": {name: incidence.column(name)[:, None] for name in incidence.set_names},
+            "t": {name: incidence.column(name, "title")[:, None] for name in incidence.set_names},
+            "c": _PairView(incidence),
+        }
+
+    def _eval(self, source: str) -> np.ndarray:
+        return eval(source, self._namespace())[:, 0]
+
+    def _compile_decision(self, names) -> callable:
+        """tiers/decision → total(샘플×설정) 을 받아 label 행렬을 돌려주는 함수"""
+        if self.decision:
+            label = f"np.where({_VectorExprCompiler(self.decision, names).compile()}, 1, 0)"
+        else:
+            label = f"np.full(total.shape, {self.default})"
+        lines = ["def _decide(total):", f"    label = {label}"]
+        # 위 단계가 우선하므로 아래 단계부터 덮어씀
+        for tier in reversed(self.tiers):
+            condition = _VectorExprCompiler(tier["if"], names).compile()
+            lines.append(f"    label = np.where({condition}, {int(tier['label'])}, label)")
+        lines.append("    return np.broadcast_to(label, total.shape)")
+
+        namespace = self._namespace()
+        exec(compile("\n".join(lines), f"<vector-rules:{self.name}>", "exec"), namespace)
+        return namespace["_decide"]
+
+    def totals(self, weights: Optional[np.ndarray] = None, bias=0.0) -> np.ndarray:
+        """샘플×설정 total 행렬
+
+        weights: (특징,) 또는 (설정, 특징). None 이면 규칙 파일의 가중치
+        bias: total 에 더할 값 (설정별 배열 가능) - 임계값 탐색은 bias 로 수행
+        """
+        weights = self.weights if weights is None else np.asarray(weights, dtype=float)
+        matrix = np.atleast_2d(weights)
+        return self.features @ matrix.T + np.asarray(bias, dtype=float)
+
+    def predict(self, weights: Optional[np.ndarray] = None, bias=0.0) -> np.ndarray:
+        """샘플×설정 예측 (가중치가 1차원이면 샘플 벡터)"""
+        labels = self._decide(self.totals(weights, bias))
+        if weights is None or np.ndim(weights) == 1:
+            return labels[:, 0]
+        return labels
+
+    def accuracy(self, labels: Sequence[int], weights: Optional[np.ndarray] = None, bias=0.0):
+        """설정별 정확도 (가중치가 1차원이면 스칼라)"""
+        predictions = self.predict(weights, bias)
+        actual = np.asarray(labels, dtype=int)
+        if predictions.ndim == 1:
+            return float((predictions == actual).mean())
+        return (predictions == actual[:, None]).mean(axis=0)
+
+
+class _PairView:
+    """c['A', 'Act'] → 같은 문장 동시 출현 (샘플, 1) 열 벡터"""
+
+    def __init__(self, incidence: KeywordIncidence):
+        self.incidence = incidence
+
+    def __getitem__(self, key: Tuple[str, str]) -> np.ndarray:
+        return self.incidence.pair(*key)[:, None]
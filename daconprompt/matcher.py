@@ -0,0 +1,111 @@
+"""
+다중 키워드 매처
+규칙 기반 분류기의 키워드 목록(회사명, T1/T3, 위험 케이스, A/Act/B 집합 등)을
+하나의 트라이로 컴파일해 본문을 한 번만 훑어 모든 적중 위치를 찾음
+
+결과는 Aho–Corasick 오토마톤과 같음(겹치는 키워드 포함 전부). 순수 파이썬 AC 는
+글자마다 인터프리터 루프를 돌아 `keyword in text` 반복보다 오히려 느려서,
+트라이를 정규식으로 컴파일해 스캔 자체는 C 엔진(re)이 한 번에 수행하도록 함
+"""
+
+import re
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+def _trie_pattern(node: Dict) -> str:
+    """트라이 → 정규식 (공통 접두사 공유, 가장 긴 키워드 우선)"""
+    branches = [re.escape(ch) + _trie_pattern(child)
+                for ch, child in sorted(node.items()) if ch]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    return f"(?:{body})?" if "" in node else body
+
+
+class KeywordMatcher:
+    """카테고리별 키워드 목록을 한 번에 찾는 매처
+
+    categories: {카테고리명: 키워드 목록}
+    같은 키워드가 여러 카테고리에 있어도 되고, 겹치는 키워드(예: "전기차", "전기차시장")도
+    모두 찾음. 기존 `keyword in text` 와 같은 부분 문자열 의미.
+    lowercase=True 면 키워드와 입력을 모두 소문자로 맞춤
+    """
+
+    def __init__(self, categories: Dict[str, Iterable[str]], lowercase: bool = True):
+        self.lowercase = lowercase
+        self.categories = {
+            name: [k.lower() if lowercase else k for k in keywords]
+            for name, keywords in categories.items()
+        }
+
+        # 키워드 → 속한 카테고리
+        self.keyword_categories: Dict[str, List[str]] = {}
+        for name, keywords in self.categories.items():
+            for keyword in keywords:
+                if keyword:
+                    self.keyword_categories.setdefault(keyword, []).append(name)
+
+        self._build(list(self.keyword_categories))
+
+    def _build(self, keywords: List[str]):
+        """트라이 정규식과 접두사 키워드 표 생성"""
+        trie: Dict = {}
+        for keyword in keywords:
+            node = trie
+            for ch in keyword:
+                node = node.setdefault(ch, {})
+            node[""] = True
+
+        # 한 위치에서는 가장 긴 키워드만 잡히므로, 그 키워드의 접두사인 키워드도 함께 보고
+        self._prefixes: Dict[str, Tuple[str, ...]] = {}
+        for keyword in keywords:
+            node, found = trie, []
+            for i, ch in enumerate(keyword, 1):
+                node = node[ch]
+                if "" in node:
+                    found.append(keyword[:i])
+            self._prefixes[keyword] = tuple(found)
+
+        if keywords:
+            first_chars = re.escape("".join(sorted({k[0] for k in keywords})))
+            # 선두 문자 집합으로 후보 위치만 거른 뒤 전방탐색으로 겹치는 매치까지 모두 수집
+            self._pattern = re.compile(f"(?=[{first_chars}])(?=({_trie_pattern(trie)}))")
+        else:
+            self._pattern = None
+
+    def iter_matches(self, text: str) -> Iterable[Tuple[int, str]]:
+        """(시작 위치, 키워드) 를 텍스트 순서대로 생성"""
+        if self._pattern is None:
+            return
+        if self.lowercase:
+            text = text.lower()
+        prefixes = self._prefixes
+        for m in self._pattern.finditer(text):
+            pos = m.start()
+            for keyword in prefixes[m.group(1)]:
+                yield pos, keyword
+
+    def found(self, text: str) -> Set[str]:
+        """텍스트에 등장한 키워드 집합"""
+        if self._pattern is None:
+            return set()
+        if self.lowercase:
+            text = text.lower()
+        prefixes = self._prefixes
+        result: Set[str] = set()
+        for longest in set(self._pattern.findall(text)):
+            result.update(prefixes[longest])
+        return result
+
+    def find_all(self, text: str) -> Dict[str, Dict[str, List[int]]]:
+        """카테고리별 {키워드: 시작 위치 목록}"""
+        hits: Dict[str, Dict[str, List[int]]] = {name: {} for name in self.categories}
+        for pos, keyword in self.iter_matches(text):
+            for name in self.keyword_categories[keyword]:
+                hits[name].setdefault(keyword, []).append(pos)
+        return hits
+
+
+def first_found(keywords: Iterable[str], found: Set[str]) -> str:
+    """목록 순서상 처음으로 등장한 키워드 (없으면 빈 문자열)"""
+    return next((k for k in keywords if k in found), "")
@@ -0,0 +1,226 @@
+"""
+로컬 모의 LLM 서버 (표준 라이브러리만 사용, GPU 불필요)
+OpenAI 호환 /v1/chat/completions 와 Ollama /api/generate 에 규칙 분류기(기본 rules/v3.6.json,
+classify_with_v36_rules 와 같은 규칙)의 0/1 로 답해, 실제 모델 없이 클라이언트·평가 엔진의
+동시성·재시도·처리량을 측정
+
+  - latency: 지연 분포 ("fixed:0.2", "uniform:0.1,0.5", "normal:0.3,0.1", "lognormal:0.2,0.6", "exp:0.3")
+  - error_rate: 이 비율만큼 error_status(기본 503)로 응답
+  - parallel: 동시에 처리하는 요청 수 (llama.cpp parallel slot 처럼 나머지는 대기)
+  - stream / logprobs / 일괄([번호] 기사) 요청, usage 토큰 수(글자 수 기반 추정) 지원
+
+seed 가 같으면 같은 요청 순서에 대해 지연·오류가 재현됨 (라벨은 항상 규칙대로)
+"""
+
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+from daconprompt.rules import RuleClassifier, load_rules
+from daconprompt.scoring import estimate_tokens
+
+DEFAULT_RULES = "rules/v3.6.json"
+
+# format_article ("제목: …\n본문: …") / test_lmstudio ("제목: …\n내용: …")
+_ARTICLE_RE = re.compile(r"제목:\s*(.*?)\n(?:본문|내용):\s*(.*?)(?=\n\n\[\d+\]\n|\Z)", re.S)
+_BATCH_MARK_RE = re.compile(r"^\[(\d+)\]\n", re.M)
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """지연 분포 문자열 → rng 를 받아 초 단위 지연을 뽑는 함수"""
+    kind, _, args = spec.partition(":")
+    values = [float(v) for v in args.split(",") if v]
+    if kind == "fixed" and len(values) == 1:
+        return lambda rng: values[0]
+    if kind == "uniform" and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "normal" and len(values) == 2:
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1]))
+    if kind == "lognormal" and len(values) == 2:
+        # 중앙값, 로그 표준편차 (꼬리가 긴 실제 서버 지연에 가까움)
+        return lambda rng: rng.lognormvariate(math.log(values[0]), values[1])
+    if kind == "exp" and len(values) == 1:
+        return lambda rng: rng.expovariate(1 / values[0]) if values[0] > 0 else 0.0
+    raise ValueError(f"알 수 없는 지연 분포: {spec} (fixed:S, uniform:A,B, normal:M,SD, lognormal:MEDIAN,SIGMA, exp:M)")
+
+
+def split_articles(text: str) -> List[Tuple[str, str]]:
+    """사용자 입력 → [(제목, 본문)] (일괄 요청이면 번호 순서대로, 형식이 없으면 전체를 본문으로)"""
+    # 시스템 프롬프트 예시 등에 같은 형식이 있어도 실제 기사(첫 [1] 이후, 단건이면 마지막)만
+    batch = _BATCH_MARK_RE.search(text)
+    text = text[batch.start():] if batch else text[max(0, text.rfind("제목:")):]
+    articles = [(m.group(1).strip(), m.group(2).strip()) for m in _ARTICLE_RE.finditer(text)]
+    return articles or [("", text)]
+
+
+class MockLLMServer:
+    """모의 LLM 서버 - start() 로 백그라운드 실행, 또는 serve_forever()
+
+    classifier: (제목, 본문) → 0/1 (기본: rules/v3.6.json 규칙)
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 classifier: Optional[Callable[[str, str], int]] = None,
+                 latency: str = "fixed:0", error_rate: float = 0.0, error_status: int = 503,
+                 parallel: int = 4, seed: int = 0):
+        if classifier is None:
+            classifier = load_rules(DEFAULT_RULES).predict
+        elif isinstance(classifier, RuleClassifier):
+            classifier = classifier.predict
+        self.classifier = classifier
+        self.latency = parse_latency(latency)
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.stats = {'requests': 0, 'errors': 0, 'articles': 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._slots = threading.Semaphore(parallel)
+        self._thread: Optional[threading.Thread] = None
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1/chat/completions"
+
+    @property
+    def ollama_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/api/generate"
+
+    def start(self) -> "MockLLMServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self.httpd.serve_forever()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "MockLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ---- 응답 생성 ----
+
+    def _draw(self) -> Tuple[float, bool]:
+        """요청 1건의 (지연, 오류 여부) - seed 재현을 위해 잠금 안에서 순서대로 뽑음"""
+        with self._lock:
+            self.stats['requests'] += 1
+            return self.latency(self._rng), self._rng.random() < self.error_rate
+
+    def answer(self, text: str) -> str:
+        """입력 → 응답 텍스트 (일괄 요청이면 "번호: 라벨" 줄들)"""
+        articles = split_articles(text)
+        with self._lock:
+            self.stats['articles'] += len(articles)
+        labels = [self.classifier(title, content) for title, content in articles]
+        if _BATCH_MARK_RE.search(text) and len(articles) > 1:
+            return "\n".join(f"{i}: {label}" for i, label in enumerate(labels, 1))
+        return str(labels[0])
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True  # 헤더·본문 분리 전송 시 delayed ACK 로 ~40ms 씩 밀리는 것 방지
+
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, status: int, body: Dict):
+                data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path.rstrip("/") == "/v1/models":
+                    self._send_json(200, {"object": "list", "data": [{"id": "mock", "object": "model"}]})
+                else:
+                    self._send_json(404, {"error": "not found"})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                try:
+                    payload = json.loads(self.rfile.read(length) or b"{}")
+                except json.JSONDecodeError:
+                    self._send_json(400, {"error": "invalid json"})
+                    return
+
+                delay, failed = server._draw()
+                with server._slots:
+                    time.sleep(delay)
+                if failed:
+                    with server._lock:
+                        server.stats['errors'] += 1
+                    self._send_json(server.error_status, {"error": "mock failure"})
+                    return
+
+                path = self.path.rstrip("/")
+                if path == "/api/generate":
+                    self._ollama(payload)
+                elif path == "/v1/chat/completions":
+                    self._chat(payload)
+                else:
+                    self._send_json(404, {"error": "not found"})
+
+            def _ollama(self, payload: Dict):
+                prompt = payload.get("prompt", "")
+                text = server.answer(prompt)
+                self._send_json(200, {"model": payload.get("model", "mock"), "response": text, "done": True,
+                                      "prompt_eval_count": estimate_tokens(prompt), "eval_count": 1})
+
+            def _chat(self, payload: Dict):
+                messages = payload.get("messages", [])
+                user = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+                text = server.answer(user)
+                usage = {"prompt_tokens": sum(estimate_tokens(m.get("content", "")) for m in messages),
+                         "completion_tokens": estimate_tokens(text) if "\n" in text else 1}
+                usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+                logprobs = None
+                if payload.get("logprobs") and text in ("0", "1"):
+                    # 규칙 라벨에 P=0.9 (임계값 분석에 쓸 수 있도록 두 후보 모두)
+                    other = "1" if text == "0" else "0"
+                    top = [{"token": text, "logprob": math.log(0.9)}, {"token": other, "logprob": math.log(0.1)}]
+                    logprobs = {"content": [{"token": text, "logprob": math.log(0.9), "top_logprobs": top}]}
+
+                if payload.get("stream"):
+                    self._stream(text, usage)
+                    return
+                self._send_json(200, {
+                    "id": "mock", "object": "chat.completion", "model": payload.get("model", "mock"),
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": text},
+                                 "logprobs": logprobs, "finish_reason": "stop"}],
+                    "usage": usage,
+                })
+
+            def _stream(self, text: str, usage: Dict):
+                """SSE 스트리밍 (내용 1조각 + usage + [DONE])"""
+                chunks = [
+                    {"choices": [{"index": 0, "delta": {"content": text}}]},
+                    {"choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}], "usage": usage},
+                ]
+                data = "".join(f"data: {json.dumps(c, ensure_ascii=False)}\n\n" for c in chunks) + "data: [DONE]\n\n"
+                body = data.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
@@ -0,0 +1,225 @@
+"""
+여러 엔드포인트 부하 분산 (LM Studio / Ollama / 원격 OpenAI 호환 서버)
+엔드포인트마다 동시 처리 한도·모델·상태를 두고, 진행 중 요청이 가장 적은(한도 대비)
+엔드포인트로 보내며, 오류가 나면 다른 엔드포인트로 넘겨 재시도
+
+LLMClient 와 같은 호출 계약(call / complete / call_binary / call_timed)이라
+EvaluationEngine 에 그대로 넣어 사용 (engine concurrency 는 pool.capacity 로)
+
+설정 JSON 예:
+  [
+    {"endpoint": "http://localhost:1234/v1/chat/completions", "concurrency": 4},
+    {"endpoint": "http://localhost:11434/v1/chat/completions", "model": "llama3.2:3b", "concurrency": 2},
+    {"endpoint": "http://203.234.62.45:1234/v1/chat/completions", "model": "openai/gpt-oss-20b",
+     "api_key": "lm-studio", "concurrency": 8}
+  ]
+"""
+
+import json
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from daconprompt.client import LLMClient
+
+
+def _shared(name: str) -> property:
+    """모든 엔드포인트 클라이언트에 함께 적용되는 설정 (읽기는 첫 엔드포인트 기준)"""
+
+    def get(self):
+        return getattr(self.members[0].client, name)
+
+    def set(self, value):
+        for member in self.members:
+            setattr(member.client, name, value)
+
+    return property(get, set)
+
+
+class _Member:
+    """풀 안의 엔드포인트 1개 상태"""
+
+    def __init__(self, client: LLMClient, limit: int):
+        self.client = client
+        self.limit = limit
+        self.outstanding = 0
+        self.failures = 0          # 연속 실패 수
+        self.down_until = 0.0      # 이 시각까지 제외
+        self.served = 0
+        self.errors = 0
+
+    def available(self, now: float) -> bool:
+        return self.down_until <= now and self.outstanding < self.limit
+
+
+class EndpointPool:
+    """least-outstanding-requests 분산 + 장애 조치
+
+    members: [(LLMClient, 동시 처리 한도)]
+    max_failures: 연속 실패가 이만큼 쌓이면 cooldown 초 동안 제외
+    """
+
+    endpoint = "pool"  # EvaluationEngine 의 엔드포인트별 한도 키 (풀 전체를 하나로)
+
+    def __init__(self, members: Sequence[Tuple[LLMClient, int]], max_failures: int = 3,
+                 cooldown: float = 30.0, verbose: bool = True):
+        if not members:
+            raise ValueError("엔드포인트가 하나 이상 필요함")
+        self.members = [_Member(client, limit) for client, limit in members]
+        self.max_failures = max_failures
+        self.cooldown = cooldown
+        self.verbose = verbose
+        self._cond = threading.Condition()
+
+    @classmethod
+    def from_config(cls, config, max_failures: int = 3, cooldown: float = 30.0,
+                    **client_kwargs) -> "EndpointPool":
+        """설정(JSON 경로 또는 dict 목록) → 풀 (client_kwargs 는 모든 엔드포인트 공통 LLMClient 인자)"""
+        if isinstance(config, str):
+            with open(config, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+        members = []
+        for entry in config:
+            entry = dict(entry)
+            limit = entry.pop('concurrency', 4)
+            members.append((LLMClient(**{**client_kwargs, **entry}), limit))
+        return cls(members, max_failures, cooldown, verbose=client_kwargs.get('verbose', True))
+
+    # ---- 엔드포인트 선택 ----
+
+    @property
+    def capacity(self) -> int:
+        """풀 전체 동시 처리 한도"""
+        return sum(m.limit for m in self.members)
+
+    constrain = _shared('constrain')
+    cache_prompt = _shared('cache_prompt')
+    slot_hints = _shared('slot_hints')
+
+    def _home(self, slot: Optional[int]) -> Tuple[Optional[_Member], Optional[int]]:
+        """풀 전체 슬롯 번호 → (엔드포인트, 그 서버의 슬롯 번호)
+
+        grouped 평가의 슬롯 워커가 항상 같은 서버·슬롯으로 가야 prefix 캐시가 재사용됨
+        """
+        if slot is None:
+            return None, None
+        slot %= self.capacity
+        for member in self.members:
+            if slot < member.limit:
+                return member, slot
+            slot -= member.limit
+        return None, None
+
+    def _acquire(self, exclude: List[_Member], home: Optional[_Member] = None) -> Optional[_Member]:
+        """진행 중 요청 비율이 가장 낮은 엔드포인트 확보 (모두 한도면 대기, 후보 없으면 None)
+
+        home 이 사용 가능하면 그 엔드포인트 우선
+        """
+        with self._cond:
+            while True:
+                now = time.time()
+                candidates = [m for m in self.members if m not in exclude]
+                if not candidates:
+                    return None
+                if all(m.down_until > now for m in candidates):
+                    # 전부 장애 상태면 가장 먼저 복귀할 엔드포인트를 시험 삼아 사용
+                    min(candidates, key=lambda m: m.down_until).down_until = 0.0
+                ready = [m for m in candidates if m.available(now)]
+                if home in ready:
+                    home.outstanding += 1
+                    return home
+                if ready:
+                    member = min(ready, key=lambda m: (m.outstanding / m.limit, m.outstanding))
+                    member.outstanding += 1
+                    return member
+                self._cond.wait(timeout=1.0)
+
+    def _release(self, member: _Member, error: Optional[Exception]):
+        with self._cond:
+            member.outstanding -= 1
+            if error is None:
+                member.failures = 0
+                member.served += 1
+            else:
+                member.failures += 1
+                member.errors += 1
+                if member.failures >= self.max_failures:
+                    member.down_until = time.time() + self.cooldown
+                    if self.verbose:
+                        print(f"    엔드포인트 제외 ({self.cooldown:.0f}초): {member.client.endpoint} - {error}")
+            self._cond.notify_all()
+
+    def _dispatch(self, method: str, prompt: str, user_input: str, slot: Optional[int], *args):
+        """요청 1건 - 실패하면 아직 안 써 본 엔드포인트로 넘김 (모두 실패 시 마지막 예외)"""
+        home, home_slot = self._home(slot)
+        tried: List[_Member] = []
+        last_error: Optional[Exception] = None
+        while True:
+            member = self._acquire(tried, home)
+            if member is None:
+                raise last_error or RuntimeError("사용 가능한 엔드포인트 없음")
+            tried.append(member)
+            # 다른 서버로 넘어가면 슬롯 힌트는 의미 없음
+            local_slot = home_slot if member is home else None
+            try:
+                result = getattr(member.client, method)(prompt, user_input, local_slot, *args)
+            except Exception as e:
+                self._release(member, e)
+                last_error = e
+                continue
+            self._release(member, None)
+            return result
+
+    # ---- LLMClient 호출 계약 ----
+
+    def complete(self, prompt: str, user_input: str, slot: Optional[int] = None,
+                 max_tokens: Optional[int] = None) -> str:
+        """단일 호출 - 모든 엔드포인트 실패 시 예외"""
+        return self._dispatch('complete', prompt, user_input, slot, max_tokens)
+
+    def call(self, prompt: str, user_input: str, slot: Optional[int] = None,
+             max_tokens: Optional[int] = None) -> str:
+        """(레거시) 단일 호출 - 모든 엔드포인트 실패 시 "0" (LLMClient.call 과 동일, 평가에는 complete)"""
+        try:
+            return self.complete(prompt, user_input, slot, max_tokens)
+        except Exception as e:
+            if self.verbose:
+                print(f"    API 에러: {e}")
+            return "0"
+
+    __call__ = call
+
+    def classify_binary(self, prompt: str, user_input: str,
+                        slot: Optional[int] = None) -> Tuple[int, Optional[float], str]:
+        return self._dispatch('classify_binary', prompt, user_input, slot)
+
+    def call_binary(self, prompt: str, user_input: str,
+                    slot: Optional[int] = None) -> Tuple[int, Optional[float], str]:
+        """(레거시) classify_binary - 실패 시 (0, None, "0")"""
+        try:
+            return self.classify_binary(prompt, user_input, slot)
+        except Exception as e:
+            if self.verbose:
+                print(f"    API 에러: {e}")
+            return 0, None, "0"
+
+    def complete_timed(self, prompt: str, user_input: str, slot: Optional[int] = None,
+                       max_tokens: Optional[int] = None) -> Tuple[str, Dict]:
+        return self._dispatch('complete_timed', prompt, user_input, slot, max_tokens)
+
+    def call_timed(self, prompt: str, user_input: str, slot: Optional[int] = None,
+                   max_tokens: Optional[int] = None) -> Tuple[str, Optional[Dict]]:
+        """(레거시) complete_timed - 실패 시 ("0", None)"""
+        try:
+            return self.complete_timed(prompt, user_input, slot, max_tokens)
+        except Exception as e:
+            if self.verbose:
+                print(f"    API 에러: {e}")
+            return "0", None
+
+    def stats(self) -> List[Dict]:
+        """엔드포인트별 처리·오류 수와 상태"""
+        now = time.time()
+        return [{'endpoint': m.client.endpoint, 'model': m.client.model, 'limit': m.limit,
+                 'served': m.served, 'errors': m.errors, 'healthy': m.down_until <= now}
+                for m in self.members]
@@ -0,0 +1,131 @@
+"""
+프롬프트 레지스트리
+prompts/ 아래 파일(버전별 단일 프롬프트, 여러 프롬프트를 묶은 제출·작업 파일)과 스크립트 사전의
+프롬프트를 본문 해시(checkpoint.prompt_hash) 하나로 묶어 한 번만 적재
+
+  - 길이·토큰 수는 본문에서 계산 (손으로 적어 둔 "length" 대신)
+  - 같은 본문이 여러 파일·이름에 있으면 항목 1개에 이름·출처를 모음
+  - 결과 저장소 prompt_results.prompt_hash 로 저장된 평가 결과를 연결
+  - 이름·해시 조회는 dict 1회
+
+묶음 파일 형식 (prompts/final, prompts/working):
+  [수정1] 김경태 스타일 유지 - 안전 버전 (560자)
+  ------------------------------------------------
+  본문 …  (다음 [..] 머리줄 또는 ==== 줄까지)
+"""
+
+import re
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from daconprompt.checkpoint import prompt_hash
+from daconprompt.scoring import estimate_tokens
+
+DEFAULT_PROMPT_ROOTS = ("prompts/versions", "prompts/final", "prompts/generated", "prompts/working")
+
+# [라벨] 설명 + 다음 줄 ---- 로 시작하는 구역 (설명 구역의 "[최적화1 - 470자]" 요약 줄은 제외)
+_SECTION_RE = re.compile(r"^\[([^\]\n]+)\][^\n]*\n-{10,}[ \t]*\n(.*?)(?=^\[[^\]\n]+\][^\n]*\n-{10,}|^={10,}|\Z)",
+                         re.M | re.S)
+
+
+def split_sections(text: str) -> List[Tuple[str, str]]:
+    """묶음 파일 → [(라벨, 본문)] (묶음 형식이 아니면 빈 목록)"""
+    return [(label.strip(), body.strip()) for label, body in _SECTION_RE.findall(text) if body.strip()]
+
+
+class PromptRegistry:
+    """본문 해시 → 항목 {'hash', 'text', 'length', 'tokens', 'names', 'sources', 'results'}
+
+    roots: 처음에 적재할 파일·디렉터리 (빈 목록이면 add 로만 등록)
+    tokenizer: 본문 → 토큰 수 (기본: 글자 수 기반 추정)
+    """
+
+    def __init__(self, roots: Sequence[str] = DEFAULT_PROMPT_ROOTS,
+                 tokenizer: Callable[[str], int] = estimate_tokens):
+        self.tokenizer = tokenizer
+        self.by_hash: Dict[str, Dict] = {}
+        self.by_name: Dict[str, str] = {}
+        for root in roots:
+            self.load(root)
+
+    def add(self, name: str, text: str, source: Optional[str] = None) -> Dict:
+        """프롬프트 1개 등록 (같은 본문이 이미 있으면 그 항목에 이름만 추가)"""
+        text = text.strip()
+        key = prompt_hash(text)
+        if self.by_name.get(name, key) != key:
+            raise ValueError(f"프롬프트 이름 중복 (본문 다름): {name}")
+
+        entry = self.by_hash.get(key)
+        if entry is None:
+            entry = self.by_hash[key] = {'hash': key, 'text': text, 'length': len(text),
+                                         'tokens': self.tokenizer(text), 'names': [], 'sources': [],
+                                         'results': []}
+        if name not in entry['names']:
+            entry['names'].append(name)
+            entry['sources'].append(source or name)
+        self.by_name[name] = key
+        return entry
+
+    def load(self, path: str) -> List[Dict]:
+        """파일(.txt) 또는 디렉터리 적재 - 묶음 파일은 "파일이름:라벨" 로 구역마다 등록"""
+        path = Path(path)
+        files = sorted(path.glob("*.txt")) if path.is_dir() else [path]
+        entries = []
+        for file in files:
+            text = file.read_text(encoding="utf-8")
+            sections = split_sections(text)
+            if not sections:
+                entries.append(self.add(file.stem, text, str(file)))
+                continue
+            for label, body in sections:
+                entries.append(self.add(f"{file.stem}:{label}", body, f"{file}#{label}"))
+        return entries
+
+    def get(self, key: str) -> Optional[Dict]:
+        """이름 또는 본문 해시로 조회"""
+        return self.by_hash.get(self.by_name.get(key, key))
+
+    def __getitem__(self, key: str) -> Dict:
+        entry = self.get(key)
+        if entry is None:
+            raise KeyError(key)
+        return entry
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        return len(self.by_hash)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.by_hash.values())
+
+    def prompts(self, max_length: Optional[int] = None) -> Dict[str, str]:
+        """{대표 이름(처음 등록된 이름): 본문} - 같은 본문은 한 번만"""
+        return {entry['names'][0]: entry['text'] for entry in self
+                if max_length is None or entry['length'] <= max_length}
+
+    def duplicates(self) -> List[Dict]:
+        """이름이 2개 이상인 (여러 곳에 복사된) 항목"""
+        return [entry for entry in self if len(entry['names']) > 1]
+
+    def link_results(self, store, include_partial: bool = False) -> int:
+        """결과 저장소의 prompt_results 를 본문 해시로 연결 → 결과가 있는 항목 수
+
+        조기 중단·선별 탈락처럼 일부 샘플만 평가한 행(partial)은 점수가 부풀 수 있어 기본 제외
+        """
+        if not self.by_hash:
+            return 0
+        keys = list(self.by_hash)
+        partial = "" if include_partial else " AND p.partial = 0"
+        rows = store.query(
+            "SELECT p.prompt_hash, p.run_id, p.prompt, p.accuracy, p.dacon_score, p.total, p.partial,"
+            " r.model, r.script FROM prompt_results p JOIN runs r ON r.run_id = p.run_id"
+            f" WHERE p.prompt_hash IN ({', '.join('?' * len(keys))}){partial} ORDER BY r.started",
+            keys
+        )
+        for entry in self:
+            entry['results'] = []
+        for row in rows.to_dict('records'):
+            self.by_hash[row.pop('prompt_hash')]['results'].append(row)
+        return sum(1 for entry in self if entry['results'])
@@ -0,0 +1,150 @@
+"""
+요청 재시도·서킷 브레이커
+일시적 오류(연결 실패, 타임아웃, 429, 5xx)는 지수 백오프로 다시 시도하고,
+엔드포인트별로 연속 실패가 쌓이면 일정 시간 요청을 바로 거절해 죽은 서버를 기다리지 않음
+
+재시도를 다 써도 실패한 요청은 예외로 올림 - 호출한 쪽이 "0" 예측으로 바꾸지 않고
+실패로 따로 기록 (EvaluationEngine 결과의 'failed')
+"""
+
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional, TypeVar
+
+import requests
+
+T = TypeVar("T")
+
+# 다시 시도할 HTTP 상태 (요청 자체가 잘못된 4xx 는 재시도해도 같은 결과)
+RETRY_STATUS = frozenset({408, 429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(Exception):
+    """서킷이 열려 있어 요청을 보내지 않음"""
+
+    def __init__(self, endpoint: str, retry_in: float):
+        super().__init__(f"서킷 열림: {endpoint} ({retry_in:.0f}초 후 재시도)")
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+def is_transient(error: Exception) -> bool:
+    """재시도·서킷 집계 대상 오류인지 (연결·타임아웃·429·5xx)"""
+    if isinstance(error, requests.HTTPError):
+        response = error.response
+        return response is not None and response.status_code in RETRY_STATUS
+    return isinstance(error, (requests.ConnectionError, requests.Timeout,
+                              requests.exceptions.ChunkedEncodingError))
+
+
+class RetryPolicy:
+    """지수 백오프 재시도 (attempts: 첫 시도 포함 총 시도 수)
+
+    n 번째 재시도 대기: min(max_delay, base_delay × 2^(n-1)) × (1 ± jitter)
+    """
+
+    def __init__(self, attempts: int = 3, base_delay: float = 0.5, max_delay: float = 8.0,
+                 jitter: float = 0.2):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+
+    def delay(self, retry: int) -> float:
+        wait = min(self.max_delay, self.base_delay * 2 ** (retry - 1))
+        return wait * (1 + random.uniform(-self.jitter, self.jitter))
+
+
+class CircuitBreaker:
+    """엔드포인트 1개의 서킷 (closed → 연속 실패 failure_threshold 회 → open → reset_timeout 후 half-open)
+
+    half-open 에서는 시험 요청 1건만 통과 - 성공하면 closed, 실패하면 다시 open
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.time() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def retry_in(self) -> float:
+        """서킷이 열려 있으면 남은 시간 (초)"""
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.opened_at + self.reset_timeout - time.time())
+
+    def allow(self) -> bool:
+        """요청을 보내도 되는지 (half-open 이면 시험 요청 1건만)"""
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.failure_threshold:
+                self.opened_at = time.time()
+            self._probing = False
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(endpoint: str) -> CircuitBreaker:
+    """엔드포인트별 서킷 브레이커 (프로세스 내 공유 - 같은 서버를 쓰는 클라이언트끼리 상태 공유)"""
+    with _breakers_lock:
+        breaker = _breakers.get(endpoint)
+        if breaker is None:
+            breaker = _breakers[endpoint] = CircuitBreaker()
+        return breaker
+
+
+def call_with_retry(send: Callable[[], T], retry: Optional[RetryPolicy] = None,
+                    breaker: Optional[CircuitBreaker] = None, endpoint: str = "") -> T:
+    """send() 실행 - 일시적 오류는 retry 정책대로 재시도, 결과는 breaker 에 기록
+
+    서킷이 열려 있으면 CircuitOpenError, 재시도를 다 쓰거나 일시적 오류가 아니면 마지막 예외
+    """
+    attempts = retry.attempts if retry is not None else 1
+    for attempt in range(1, attempts + 1):
+        if breaker is not None and not breaker.allow():
+            raise CircuitOpenError(endpoint, breaker.retry_in())
+        try:
+            result = send()
+        except Exception as e:
+            transient = is_transient(e)
+            if breaker is not None:
+                if transient:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()  # 서버는 응답함 (요청 쪽 문제)
+            if not transient or attempt == attempts:
+                raise
+            time.sleep(retry.delay(attempt))
+            continue
+        if breaker is not None:
+            breaker.record_success()
+        return result
@@ -0,0 +1,238 @@
+"""
+평가 결과 저장소 (SQLite)
+스크립트마다 results/<name>_<timestamp>.json 을 통째로 쓰던 방식 대신
+(실행, 프롬프트, 모델, 샘플) 단위 행을 하나의 DB 에 덧붙이고, 여러 실행에 걸친
+샘플별 결과를 SQL 로 바로 조회
+
+테이블:
+  runs            실행 1회 (스크립트, 모델, 시작 시각, 메타데이터)
+  prompt_results  실행 × 프롬프트 요약 (정확도, Dacon 점수 등, partial: 일부 샘플만 평가한 결과)
+  outcomes        실행 × 프롬프트 × 샘플 결과 (p_one: logprobs 로 얻은 P(1), 없으면 NULL)
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from daconprompt.checkpoint import _to_builtin, prompt_hash
+
+DEFAULT_RESULTS_DB = "results/results.sqlite"
+
+_FILE_TIMESTAMP_RE = re.compile(r"(\d{8}_\d{6})")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    script TEXT NOT NULL,
+    model TEXT,
+    started REAL NOT NULL,
+    meta TEXT
+);
+CREATE TABLE IF NOT EXISTS prompt_results (
+    run_id TEXT NOT NULL,
+    prompt TEXT NOT NULL,
+    prompt_hash TEXT,
+    length INTEGER,
+    accuracy REAL,
+    correct INTEGER,
+    total INTEGER,
+    dacon_score REAL,
+    extra TEXT,
+    partial INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (run_id, prompt)
+);
+CREATE TABLE IF NOT EXISTS outcomes (
+    run_id TEXT NOT NULL,
+    prompt TEXT NOT NULL,
+    sample_id TEXT NOT NULL,
+    actual INTEGER,
+    predicted INTEGER,
+    correct INTEGER,
+    response TEXT,
+    title TEXT,
+    p_one REAL,
+    PRIMARY KEY (run_id, prompt, sample_id)
+);
+CREATE INDEX IF NOT EXISTS idx_outcomes_sample ON outcomes(sample_id);
+CREATE INDEX IF NOT EXISTS idx_prompt_results_hash ON prompt_results(prompt_hash);
+"""
+
+# prompt_results 에 열로 두는 키 (나머지는 extra JSON)
+_SUMMARY_KEYS = ('name', 'length', 'accuracy', 'correct', 'total', 'dacon_score', 'detailed_results')
+
+
+def is_partial(result: Dict) -> bool:
+    """전체 샘플을 평가하지 않은 결과 (조기 중단, successive halving 탈락)
+
+    점수가 일부 샘플 기준이라 순위·최고점 비교에서 제외
+    """
+    return bool(result.get('stopped_early')) or result.get('eliminated_round') is not None
+
+
+class ResultsStore:
+    """실행·프롬프트·샘플 단위 결과 저장소"""
+
+    def __init__(self, path: str = DEFAULT_RESULTS_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._migrate()
+        self._conn.commit()
+
+    def _migrate(self):
+        """이전 버전 DB 에 없는 열 추가"""
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(outcomes)")}
+        if 'p_one' not in columns:
+            self._conn.execute("ALTER TABLE outcomes ADD COLUMN p_one REAL")
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(prompt_results)")}
+        if 'partial' not in columns:
+            self._conn.execute("ALTER TABLE prompt_results ADD COLUMN partial INTEGER NOT NULL DEFAULT 0")
+            self._conn.execute("UPDATE prompt_results SET partial = 1"
+                               " WHERE json_extract(extra, '$.stopped_early')"
+                               " OR json_extract(extra, '$.eliminated_round') IS NOT NULL")
+
+    # ---- 쓰기 ----
+
+    def start_run(self, script: str, model: Optional[str] = None,
+                  meta: Optional[Dict] = None, run_id: Optional[str] = None,
+                  started: Optional[float] = None) -> str:
+        """실행 등록 후 run_id 반환 (기본: 시작시각_무작위4자리)"""
+        started = started or time.time()
+        run_id = run_id or f"{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:4]}"
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO runs (run_id, script, model, started, meta) VALUES (?, ?, ?, ?, ?)",
+                (run_id, script, model, started,
+                 json.dumps(meta or {}, ensure_ascii=False, default=_to_builtin))
+            )
+            self._conn.commit()
+        return run_id
+
+    def add_result(self, run_id: str, result: Dict, prompt_text: Optional[str] = None):
+        """evaluate_prompt 형식 결과 1개 저장 (detailed_results 는 outcomes 로)"""
+        extra = {k: v for k, v in result.items() if k not in _SUMMARY_KEYS}
+        details = result.get('detailed_results', [])
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO prompt_results"
+                " (run_id, prompt, prompt_hash, length, accuracy, correct, total, dacon_score, extra, partial)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (run_id, result['name'], prompt_hash(prompt_text) if prompt_text else None,
+                 result.get('length'), result.get('accuracy'), result.get('correct'),
+                 result.get('total'), result.get('dacon_score'),
+                 json.dumps(extra, ensure_ascii=False, default=_to_builtin), int(is_partial(result)))
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO outcomes"
+                " (run_id, prompt, sample_id, actual, predicted, correct, response, title, p_one)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, result['name'], str(d['id']), _int(d.get('actual')), _int(d.get('predicted')),
+                  _int(d.get('correct')), d.get('response', d.get('raw_output')), d.get('title'),
+                  d.get('p_one'))
+                 for d in details]
+            )
+            self._conn.commit()
+
+    def add_results(self, run_id: str, results: List[Dict], prompts: Optional[Dict[str, str]] = None):
+        """결과 목록 저장 (prompts: 이름 → 본문, 있으면 본문 해시 기록)"""
+        for result in results:
+            self.add_result(run_id, result, (prompts or {}).get(result['name']))
+
+    def import_json(self, path: str, script: Optional[str] = None, model: Optional[str] = None) -> str:
+        """기존 results/*.json (evaluate_prompt 결과 목록) 가져오기"""
+        with open(path, 'r', encoding='utf-8') as f:
+            results = json.load(f)
+
+        # 파일명 타임스탬프(YYYYmmdd_HHMMSS)를 실행 시각으로
+        match = _FILE_TIMESTAMP_RE.search(Path(path).stem)
+        started = (time.mktime(time.strptime(match.group(1), "%Y%m%d_%H%M%S")) if match
+                   else Path(path).stat().st_mtime)
+        run_id = self.start_run(script or Path(path).stem, model, meta={'imported_from': path},
+                                run_id=Path(path).stem, started=started)
+        self.add_results(run_id, results)
+        return run_id
+
+    # ---- 조회 ----
+
+    def query(self, sql: str, params=()) -> pd.DataFrame:
+        """임의 SQL 조회"""
+        with self._lock:
+            return pd.read_sql_query(sql, self._conn, params=params)
+
+    def runs(self, script: Optional[str] = None) -> pd.DataFrame:
+        """실행 목록 (최신순)"""
+        if script:
+            return self.query("SELECT * FROM runs WHERE script = ? ORDER BY started DESC", (script,))
+        return self.query("SELECT * FROM runs ORDER BY started DESC")
+
+    def latest_run(self, script: Optional[str] = None) -> Optional[str]:
+        """가장 최근 run_id"""
+        runs = self.runs(script)
+        return runs['run_id'].iloc[0] if len(runs) else None
+
+    def outcomes(self, run_id: Optional[str] = None, prompt: Optional[str] = None,
+                 sample_id: Optional[str] = None, model: Optional[str] = None) -> pd.DataFrame:
+        """샘플별 결과 (조건은 모두 선택)"""
+        conditions, params = [], []
+        for column, value in (("o.run_id", run_id), ("o.prompt", prompt),
+                              ("o.sample_id", sample_id), ("r.model", model)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return self.query(
+            "SELECT o.*, r.model, r.script, r.started FROM outcomes o"
+            f" JOIN runs r ON r.run_id = o.run_id{where}"
+            " ORDER BY r.started, o.rowid",
+            params
+        )
+
+    def correctness(self, **filters) -> pd.DataFrame:
+        """샘플 × (실행, 프롬프트) 정오 표"""
+        frame = self.outcomes(**filters)
+        return frame.pivot_table(index='sample_id', columns=['run_id', 'prompt'],
+                                 values='correct', aggfunc='max')
+
+    def load_results(self, run_id: str) -> List[Dict]:
+        """실행 1회를 evaluate_prompt 결과 목록 형식으로 복원"""
+        summaries = self.query(
+            "SELECT * FROM prompt_results WHERE run_id = ? ORDER BY rowid", (run_id,))
+        outcomes = self.outcomes(run_id=run_id)
+
+        results = []
+        for row in summaries.to_dict('records'):
+            rows = outcomes[outcomes['prompt'] == row['prompt']].to_dict('records')
+            detailed = [
+                {'id': r['sample_id'], 'title': r['title'], 'actual': r['actual'],
+                 'predicted': r['predicted'], 'correct': bool(r['correct']), 'response': r['response'],
+                 **({'p_one': r['p_one']} if pd.notna(r['p_one']) else {})}
+                for r in rows
+            ]
+            results.append({
+                'name': row['prompt'],
+                'length': row['length'],
+                'accuracy': row['accuracy'],
+                'correct': row['correct'],
+                'total': row['total'],
+                'dacon_score': row['dacon_score'],
+                **json.loads(row['extra'] or '{}'),
+                'detailed_results': detailed
+            })
+        return results
+
+    def close(self):
+        self._conn.close()
+
+
+def _int(value) -> Optional[int]:
+    return None if value is None else int(value)
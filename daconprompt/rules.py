@@ -0,0 +1,298 @@
+"""
+선언형 규칙 DSL → 분류기 컴파일러
+프롬프트 버전(v1.3, v3.6, 김경태 스코어링 등)을 매번 if/for 함수로 다시 짜지 않고
+키워드 집합·가중치·게이트·단락(short-circuit) 단계를 dict/JSON 으로 적으면
+하나의 파이썬 함수로 컴파일해 평가
+
+규칙 형식 (rules/*.json 참고):
+{
+  "name": "v3.6",
+  "lowercase": true,                       # 키워드/본문 소문자 비교 (기본 true)
+  "sets": {"A": ["현대차", ...], ...},      # 키워드 집합
+  "tiers": [                               # 위에서부터 처음 참인 단계의 label 로 즉시 판정
+    {"if": "danger", "label": 0, "reason": "위험케이스: {danger}"}
+  ],
+  "scores": [{"if": "A", "weight": 3}, ...],  # 조건이 참이면 total 에 가산 (규칙당 1회)
+  "decision": "total >= 3 & (차량용 | A~Act)",  # 참이면 1, 거짓이면 0
+  "default": 0,                            # decision 이 없을 때 기본 label
+  "default_reason": "확실하지 않음"          # 어느 단계에도 걸리지 않았을 때 근거
+}
+
+조건식:
+  A            집합 A 의 키워드가 제목+본문에 등장
+  title:A      제목에 등장
+  A~Act        A 와 Act 가 같은 문장에 함께 등장
+  total >= 3   scores 합계 비교 (>=, <=, >, <, ==)
+  ! & | ( )    부정/그리고/또는/괄호 (¬ ∧ ∨ ≥ ≤ 표기도 허용)
+"""
+
+import bisect
+import json
+import re
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from daconprompt.matcher import KeywordMatcher, first_found
+
+_TOKEN_RE = re.compile(
+    r"\s*(?:(?P<op>>=|<=|==|>|<|&|\||!|\(|\))"
+    r"|(?P<num>-?\d+(?:\.\d+)?)"
+    r"|(?P<ref>(?:title:)?[^\s&|!()<>=~]+(?:~[^\s&|!()<>=~]+)?))"
+)
+_ALIASES = {"∧": "&", "∨": "|", "¬": "!", "≥": ">=", "≤": "<=", "&&": "&", "||": "|"}
+_SENTENCE_RE = re.compile(r"[.!?。\n]+")
+_EMPTY: Set[int] = set()
+
+
+class RuleSyntaxError(ValueError):
+    """규칙 조건식 오류"""
+
+
+class _ExprCompiler:
+    """조건식 → 파이썬 식 문자열 (재귀 하강 파서)
+
+    출력 형식은 클래스 속성으로 정해 스칼라(bool)/벡터(NumPy) 판정이 같은 파서를 공유
+    """
+
+    OR = " or "
+    AND = " and "
+    NOT = "(not {})"
+    SET = "({!r} in p)"
+    TITLE = "({!r} in t)"
+    COOCCUR = "c({!r}, {!r})"
+
+    def __init__(self, expr: str, sets: Set[str]):
+        for alias, op in _ALIASES.items():
+            expr = expr.replace(alias, op)
+        self.expr = expr
+        self.sets = sets
+        self.tokens = self._tokenize(expr)
+        self.pos = 0
+        self.uses_title = False
+        self.uses_cooccur = False
+        self.uses_total = False
+        self.cooccur_sets: Set[str] = set()
+
+    def _tokenize(self, expr: str) -> List[Tuple[str, str]]:
+        tokens, i = [], 0
+        while i < len(expr):
+            m = _TOKEN_RE.match(expr, i)
+            if not m or m.end() == i:
+                if expr[i:].strip() == "":
+                    break
+                raise RuleSyntaxError(f"해석할 수 없는 조건식: {expr!r} (위치 {i})")
+            kind = m.lastgroup
+            tokens.append((kind, m.group(kind)))
+            i = m.end()
+        return tokens
+
+    def _peek(self) -> Optional[Tuple[str, str]]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _take(self, value: Optional[str] = None) -> Tuple[str, str]:
+        token = self._peek()
+        if token is None or (value is not None and token[1] != value):
+            raise RuleSyntaxError(f"조건식 오류: {self.expr!r} ({value or '토큰'} 필요)")
+        self.pos += 1
+        return token
+
+    def compile(self) -> str:
+        source = self._or()
+        if self._peek() is not None:
+            raise RuleSyntaxError(f"조건식 오류: {self.expr!r} (남은 토큰 {self._peek()[1]!r})")
+        return source
+
+    def _or(self) -> str:
+        parts = [self._and()]
+        while self._peek() == ("op", "|"):
+            self._take()
+            parts.append(self._and())
+        return parts[0] if len(parts) == 1 else "(" + self.OR.join(parts) + ")"
+
+    def _and(self) -> str:
+        parts = [self._not()]
+        while self._peek() == ("op", "&"):
+            self._take()
+            parts.append(self._not())
+        return parts[0] if len(parts) == 1 else "(" + self.AND.join(parts) + ")"
+
+    def _not(self) -> str:
+        if self._peek() == ("op", "!"):
+            self._take()
+            return self.NOT.format(self._not())
+        return self._atom()
+
+    def _atom(self) -> str:
+        kind, value = self._take()
+        if (kind, value) == ("op", "("):
+            inner = self._or()
+            self._take(")")
+            return inner
+        if kind == "ref" and value == "total":
+            op = self._take()
+            if op[0] != "op" or op[1] not in (">=", "<=", "==", ">", "<"):
+                raise RuleSyntaxError(f"조건식 오류: {self.expr!r} (total 뒤 비교 연산자 필요)")
+            num = self._take()
+            if num[0] != "num":
+                raise RuleSyntaxError(f"조건식 오류: {self.expr!r} (total 비교 값 필요)")
+            self.uses_total = True
+            return f"(total {op[1]} {num[1]})"
+        if kind == "ref":
+            return self._ref(value)
+        raise RuleSyntaxError(f"조건식 오류: {self.expr!r} ({value!r} 위치)")
+
+    def _check_set(self, name: str):
+        if name not in self.sets:
+            raise RuleSyntaxError(f"정의되지 않은 집합: {name!r} ({self.expr!r})")
+
+    def _ref(self, value: str) -> str:
+        if value.startswith("title:"):
+            name = value[len("title:"):]
+            self._check_set(name)
+            self.uses_title = True
+            return self.TITLE.format(name)
+        if "~" in value:
+            left, right = value.split("~", 1)
+            self._check_set(left)
+            self._check_set(right)
+            self.uses_cooccur = True
+            self.cooccur_sets.update((left, right))
+            return self.COOCCUR.format(left, right)
+        self._check_set(value)
+        return self.SET.format(value)
+
+
+class RuleClassifier:
+    """규칙 dict 를 컴파일한 분류기 - classify(title, content) -> (label, reason)"""
+
+    def __init__(self, spec: Dict):
+        self.spec = spec
+        self.name = spec.get("name", "rules")
+        self.lowercase = spec.get("lowercase", True)
+        self.sets: Dict[str, List[str]] = spec["sets"]
+        self.tiers: List[Dict] = spec.get("tiers", [])
+        self.scores: List[Dict] = spec.get("scores", [])
+        self.decision: Optional[str] = spec.get("decision")
+        self.default = int(spec.get("default", 0))
+        self.default_reason = spec.get("default_reason", "기본값")
+
+        self.matcher = KeywordMatcher(self.sets, lowercase=self.lowercase)
+        self._cooccur_sets: Set[str] = set()
+        self._func, self.uses_title, self.uses_cooccur = self._compile()
+
+    def _compile(self) -> Tuple[Callable, bool, bool]:
+        """tiers/scores/decision 을 파이썬 함수 1개로 컴파일"""
+        names = set(self.sets)
+        compilers = []
+
+        def cond(expr: str) -> str:
+            compiler = _ExprCompiler(expr, names)
+            source = compiler.compile()
+            compilers.append(compiler)
+            return source
+
+        tier_sources = [cond(tier["if"]) for tier in self.tiers]
+        score_sources = [(cond(score["if"]), score["weight"]) for score in self.scores]
+        decision_source = cond(self.decision) if self.decision else None
+
+        lines = ["def _rule(p, t, c):", "    total = 0"]
+        # tier 가 total 을 참조하면 점수를 먼저 계산
+        tiers_need_total = any(c.uses_total for c in compilers[:len(tier_sources)])
+        score_lines = [f"    if {src}: total += {weight!r}" for src, weight in score_sources]
+        if tiers_need_total:
+            lines += score_lines
+        for i, src in enumerate(tier_sources):
+            lines.append(f"    if {src}: return {int(self.tiers[i]['label'])}, {i}, total")
+        if not tiers_need_total:
+            lines += score_lines
+        if decision_source:
+            lines.append(f"    return (1 if {decision_source} else 0), -1, total")
+        else:
+            lines.append(f"    return {self.default}, -1, total")
+
+        for compiler in compilers:
+            self._cooccur_sets |= compiler.cooccur_sets
+
+        namespace: Dict = {}
+        exec(compile("\n".join(lines), f"<rules:{self.name}>", "exec"), namespace)
+        return (namespace["_rule"],
+                any(c.uses_title for c in compilers),
+                any(c.uses_cooccur for c in compilers))
+
+    def _present_sets(self, found: Set[str]) -> Set[str]:
+        """등장 키워드 → 등장 집합 이름"""
+        categories = self.matcher.keyword_categories
+        return {name for keyword in found for name in categories[keyword]}
+
+    def _scan(self, title: str, content: str) -> Tuple[Set[str], Set[str], Set[str], Optional[Callable]]:
+        """본문 1회 스캔 → (등장 키워드, 등장 집합, 제목 등장 집합, 동시문장 판정 함수)"""
+        text = title + " " + content
+        in_title = self._present_sets(self.matcher.found(title)) if self.uses_title else set()
+        if not self.uses_cooccur:
+            found = self.matcher.found(text)
+            return found, self._present_sets(found), in_title, None
+
+        # 같은 문장 판정이 필요하면 위치까지 한 번에 수집
+        if self.lowercase:
+            text = text.lower()
+        bounds = [m.end() for m in _SENTENCE_RE.finditer(text)]
+        found: Set[str] = set()
+        sentences: Dict[str, Set[int]] = {}
+        categories = self.matcher.keyword_categories
+        cooccur_sets = self._cooccur_sets
+        for pos, keyword in self.matcher.iter_matches(text):
+            found.add(keyword)
+            for name in categories[keyword]:
+                if name in cooccur_sets:
+                    sentences.setdefault(name, set()).add(bisect.bisect_right(bounds, pos))
+
+        def cooccur(left: str, right: str) -> bool:
+            return bool(sentences.get(left, _EMPTY) & sentences.get(right, _EMPTY))
+
+        return found, self._present_sets(found), in_title, cooccur
+
+    def explain(self, title: str, content: str) -> Tuple[int, str, float]:
+        """(label, 판정 근거, total)"""
+        found, present, in_title, cooccur = self._scan(title, content)
+        label, tier, total = self._func(present, in_title, cooccur)
+        if tier < 0:
+            return label, f"total={total}" if self.scores else self.default_reason, total
+
+        reason = self.tiers[tier].get("reason", self.tiers[tier]["if"])
+        if "{" in reason:
+            reason = reason.format_map({
+                name: first_found(self.matcher.categories[name], found) for name in self.sets
+            })
+        return label, reason, total
+
+    def classify(self, title: str, content: str) -> Tuple[int, str]:
+        """classify_with_*_rules 와 같은 (label, reason) 반환"""
+        label, reason, _ = self.explain(title, content)
+        return label, reason
+
+    def predict(self, title: str, content: str) -> int:
+        """label 만 반환"""
+        _, present, in_title, cooccur = self._scan(title, content)
+        return self._func(present, in_title, cooccur)[0]
+
+    def evaluate(self, samples: List[Dict]) -> Dict:
+        """샘플 목록(title/content/label) 정확도 평가"""
+        predictions = [self.predict(s['title'], s['content']) for s in samples]
+        correct = sum(1 for s, p in zip(samples, predictions) if p == int(s['label']))
+        return {
+            'name': self.name,
+            'accuracy': correct / len(samples) if samples else 0.0,
+            'correct': correct,
+            'total': len(samples),
+            'predictions': predictions
+        }
+
+
+def load_spec(path: str) -> Dict:
+    """JSON 규칙 파일 로드"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_rules(path: str) -> RuleClassifier:
+    """JSON 규칙 파일 로드 + 컴파일"""
+    return RuleClassifier(load_spec(path))
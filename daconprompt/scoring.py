@@ -0,0 +1,84 @@
+"""
+점수 계산 / 응답 파싱 공용 함수
+"""
+
+import math
+import re
+from typing import List, Optional, Sequence, Tuple
+
+
+def calculate_dacon_score(accuracy: float, prompt_length: int) -> float:
+    """Dacon 점수 계산 (300자 이하 길이점수 1.0, 평가 스크립트 기준)"""
+    if prompt_length <= 300:
+        length_score = 1.0
+    else:
+        length_score = math.sqrt(1 - ((prompt_length - 300) / 2700) ** 2)
+    return 0.9 * accuracy + 0.1 * length_score
+
+
+def calculate_length_score(length: int) -> float:
+    """데이콘 공식: sqrt(1 - (L/3000)^2)"""
+    return math.sqrt(1 - (length / 3000) ** 2)
+
+
+def calculate_final_score(accuracy: float, length: int) -> float:
+    """최종 점수 = 0.9 × 정확도 + 0.1 × 길이점수"""
+    return 0.9 * accuracy + 0.1 * calculate_length_score(length)
+
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 추정 (한국어 위주 본문 기준 대략 2글자/토큰)"""
+    return max(1, len(text) // 2)
+
+
+def parse_prediction(response: str) -> int:
+    """응답 처음 10자에서 0/1 추출 (판별 불가 시 0)"""
+    if "1" in response[:10]:
+        return 1
+    return 0
+
+
+def format_article(title: str, content: str) -> str:
+    """LLM 사용자 입력 형식"""
+    return f"제목: {title}\n본문: {content}"
+
+
+# 일괄 분류 응답 한 줄: "3: 1", "[3] 0", "3. 1", "기사 3 - 0"
+_BATCH_LINE_RE = re.compile(r"^\W*(?:기사\s*)?(\d+)\s*[\]:.)\-=]\s*([01])\s*$")
+
+
+def format_batch(articles: Sequence[Tuple[str, str]]) -> str:
+    """기사 K건을 번호 붙여 한 요청으로 (출력 형식 지시 포함)"""
+    k = len(articles)
+    header = (f"아래 기사 {k}건을 각각 분류. 다른 말 없이 {k}줄만 출력, "
+              f"각 줄은 \"번호: 1\" 또는 \"번호: 0\" (1~{k} 순서대로)")
+    body = "\n\n".join(f"[{i}]\n{format_article(title, content)}"
+                        for i, (title, content) in enumerate(articles, 1))
+    return f"{header}\n\n{body}"
+
+
+def parse_batch_predictions(response: str, k: int) -> List[Optional[int]]:
+    """일괄 응답 → 기사별 0/1 (번호 누락·중복 충돌·범위 밖은 None)
+
+    번호 줄이 하나도 없고 응답이 정확히 0/1 k개로만 이뤄졌으면 순서대로 사용
+    """
+    labels: List[Optional[int]] = [None] * k
+    conflicts = set()
+    for line in response.splitlines():
+        match = _BATCH_LINE_RE.match(line.strip())
+        if not match:
+            continue
+        number, label = int(match.group(1)), int(match.group(2))
+        if not 1 <= number <= k:
+            continue
+        if labels[number - 1] is not None and labels[number - 1] != label:
+            conflicts.add(number - 1)
+        labels[number - 1] = label
+
+    if all(label is None for label in labels):
+        tokens = re.findall(r"[^\s,]+", response)
+        if len(tokens) == k and all(t in ("0", "1") for t in tokens):
+            return [int(t) for t in tokens]
+    for i in conflicts:
+        labels[i] = None
+    return labels
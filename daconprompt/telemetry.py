@@ -0,0 +1,194 @@
+"""
+요청별 지연·토큰 계측
+LLMClient 가 HTTP 요청마다 첫 바이트 시간(TTFB)·전체 지연·프롬프트/생성 토큰 수(usage)를
+엔드포인트별 HDR 방식 히스토그램에 기록하고, 가장 느린 요청(기사 앞부분 포함)을 따로 남김
+
+히스토그램은 로그-선형 버킷(값 크기와 무관하게 상대 오차 ≤ 2^-precision_bits)이라
+기록이 O(1) 이고 메모리는 값 범위의 로그에 비례 - 수만 건 평가에도 부담 없음
+
+기본 레지스트리 REGISTRY 를 모든 클라이언트가 공유하고, 스크립트가 실행 끝에 dump()
+"""
+
+import heapq
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# 지표별 정수 변환 배율 (초 → µs, 처리량은 0.1 단위)
+_SCALES = {
+    'ttfb': 1e6,
+    'latency': 1e6,
+    'prompt_tokens': 1,
+    'completion_tokens': 1,
+    'prefill_tokens_per_s': 10,
+    'completion_tokens_per_s': 10,
+}
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+class Histogram:
+    """HDR 방식 로그-선형 히스토그램 (값 ≥ 0)
+
+    2^precision_bits 미만은 정확히, 그 이상은 상위 precision_bits 비트만 남겨 버킷 지정
+    """
+
+    def __init__(self, precision_bits: int = 7, scale: float = 1.0):
+        self.precision_bits = precision_bits
+        self.scale = scale
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def _index(self, value: int) -> int:
+        shift = max(0, value.bit_length() - self.precision_bits)
+        return (shift << self.precision_bits) | (value >> shift)
+
+    def _value_at(self, index: int) -> float:
+        """버킷 중앙값 (원래 단위)"""
+        shift, mantissa = index >> self.precision_bits, index & ((1 << self.precision_bits) - 1)
+        low = mantissa << shift
+        return (low + ((1 << shift) - 1) / 2) / self.scale
+
+    def record(self, value: float):
+        index = self._index(max(0, int(value * self.scale)))
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = max(1, round(q / 100 * self.count))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(max(self._value_at(index), self.min), self.max)
+        return self.max
+
+    def merge(self, other: "Histogram"):
+        for index, n in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + n
+        self.count += other.count
+        self.total += other.total
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    def summary(self) -> Dict:
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else None,
+            'min': self.min,
+            'max': self.max,
+            **{f"p{q:g}": self.percentile(q) for q in PERCENTILES},
+        }
+
+    def to_dict(self) -> Dict:
+        """요약 + 버킷 [(버킷 중앙값, 개수)] (다른 실행과 합치거나 그릴 때)"""
+        return {**self.summary(),
+                'buckets': [[self._value_at(i), n] for i, n in sorted(self.buckets.items())]}
+
+
+class MetricsRegistry:
+    """엔드포인트별 히스토그램·카운터 + 느린 요청 상위 slowest 개"""
+
+    def __init__(self, slowest: int = 20):
+        self.slowest_size = slowest
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.histograms: Dict[str, Dict[str, Histogram]] = {}
+            self.counters: Dict[str, Dict[str, int]] = {}
+            self._slowest: List = []
+            self._sequence = 0
+
+    def count(self, endpoint: str, name: str, n: int = 1):
+        with self._lock:
+            counters = self.counters.setdefault(endpoint, {})
+            counters[name] = counters.get(name, 0) + n
+
+    def record_request(self, endpoint: str, ttfb: float, latency: float,
+                       prompt_tokens: Optional[int] = None, completion_tokens: Optional[int] = None,
+                       input_chars: int = 0, input_head: str = ""):
+        """성공한 HTTP 요청 1건 (토큰 수는 서버가 준 경우만)"""
+        values = {'ttfb': ttfb, 'latency': latency,
+                  'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens}
+        if prompt_tokens and ttfb > 0:
+            values['prefill_tokens_per_s'] = prompt_tokens / ttfb
+        if completion_tokens and latency > 0:
+            values['completion_tokens_per_s'] = completion_tokens / latency
+
+        with self._lock:
+            histograms = self.histograms.setdefault(endpoint, {})
+            for name, value in values.items():
+                if value is None:
+                    continue
+                if name not in histograms:
+                    histograms[name] = Histogram(scale=_SCALES[name])
+                histograms[name].record(value)
+            counters = self.counters.setdefault(endpoint, {})
+            counters['requests'] = counters.get('requests', 0) + 1
+
+            self._sequence += 1
+            entry = (latency, self._sequence, {'endpoint': endpoint, 'latency': latency, 'ttfb': ttfb,
+                                               'prompt_tokens': prompt_tokens, 'input_chars': input_chars,
+                                               'input_head': input_head})
+            if len(self._slowest) < self.slowest_size:
+                heapq.heappush(self._slowest, entry)
+            elif latency > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, entry)
+
+    def slowest(self) -> List[Dict]:
+        """가장 느린 요청 (느린 순)"""
+        with self._lock:
+            return [entry for _, _, entry in sorted(self._slowest, reverse=True)]
+
+    def summary(self) -> List[Dict]:
+        """(엔드포인트, 지표) 별 요약 행"""
+        with self._lock:
+            return [{'endpoint': endpoint, 'metric': name, **histogram.summary()}
+                    for endpoint, histograms in self.histograms.items()
+                    for name, histogram in histograms.items()]
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            endpoints = {
+                endpoint: {
+                    'counters': dict(self.counters.get(endpoint, {})),
+                    'histograms': {name: h.to_dict() for name, h in self.histograms.get(endpoint, {}).items()},
+                }
+                for endpoint in set(self.histograms) | set(self.counters)
+            }
+        return {'endpoints': endpoints, 'slowest': self.slowest()}
+
+    def dump(self, path: str, meta: Optional[Dict] = None):
+        """실행 1회 계측 결과를 JSON 으로 저장"""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'meta': meta or {}, **self.snapshot()}, f, ensure_ascii=False, indent=2)
+
+
+# 프로세스 공용 레지스트리 (LLMClient 기본값)
+REGISTRY = MetricsRegistry()
+
+
+def format_summary(registry: MetricsRegistry, metrics=('ttfb', 'latency', 'prompt_tokens')) -> str:
+    """엔드포인트별 주요 지표 표 (시간은 ms)"""
+    lines = []
+    for row in registry.summary():
+        if row['metric'] not in metrics or not row['count']:
+            continue
+        unit, factor = ("ms", 1000) if row['metric'] in ('ttfb', 'latency') else ("", 1)
+        cells = " / ".join(f"{key} {row[key] * factor:.0f}{unit}"
+                           for key in ('p50', 'p90', 'p99', 'max') if row[key] is not None)
+        lines.append(f"  {row['endpoint']} {row['metric']}: {row['count']}건, {cells}")
+    return "\n".join(lines)
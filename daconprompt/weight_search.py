@@ -0,0 +1,159 @@
+"""
+규칙 가중치·게이트 임계값 탐색
+김경태 스코어링(+3/+2/+1/-3/-2, total≥3) 같은 가중치 규칙을 VectorizedRules 위에서
+설정 수천~수십만 개씩 일괄 채점하고, 시뮬레이션 정확도 vs 프롬프트 길이의
+파레토 프런트만 남겨 LLM 검증 대상을 좁힘
+
+프롬프트 길이는 규칙 JSON 의 "prompt" 템플릿으로 계산:
+  {scores}    → 가중치 0이 아닌 항을 "주체∈A(+3) 행위∈Act(+2) ..." 로 나열
+  {threshold} → 게이트 임계값
+"""
+
+import itertools
+import re
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from daconprompt.incidence import VectorizedRules
+from daconprompt.scoring import calculate_dacon_score
+
+_THRESHOLD_RE = re.compile(r"total\s*(?:>=|≥)\s*(-?\d+)")
+
+
+def base_threshold(spec: Dict) -> int:
+    """decision 의 total 임계값 (예: "total >= 3" → 3)"""
+    match = _THRESHOLD_RE.search(spec.get("decision", ""))
+    if not match:
+        raise ValueError(f"decision 에 total 임계값이 없음: {spec.get('decision')!r}")
+    return int(match.group(1))
+
+
+def render_scores(terms: Sequence[str], weights: Sequence[int]) -> str:
+    """점수 줄 - 가중치 0 항은 생략"""
+    return " ".join(f"{term}({int(w):+d})" for term, w in zip(terms, weights) if w != 0)
+
+
+def render_prompt(spec: Dict, weights: Sequence[int], threshold: int) -> str:
+    """가중치/임계값을 채운 프롬프트 본문"""
+    terms = [score["term"] for score in spec["scores"]]
+    return (spec["prompt"]
+            .replace("{scores}", render_scores(terms, weights))
+            .replace("{threshold}", str(int(threshold))))
+
+
+def _digits(values: np.ndarray) -> np.ndarray:
+    """정수 자릿수 (부호 제외)"""
+    return np.floor(np.log10(np.maximum(np.abs(values), 1))).astype(int) + 1
+
+
+class WeightSearch:
+    """가중치 행렬 × 임계값 후보 일괄 채점기
+
+    weights: (설정, 특징) 정수 행렬, thresholds: (설정,) 정수 벡터
+    """
+
+    def __init__(self, spec: Dict, titles: Sequence[str], contents: Sequence[str],
+                 labels: Sequence[int], chunk_size: int = 50_000):
+        if "prompt" not in spec:
+            raise ValueError("규칙 JSON 에 prompt 템플릿이 필요함")
+        self.spec = spec
+        self.rules = VectorizedRules(spec, titles, contents)
+        self.labels = np.asarray(labels, dtype=int)
+        self.chunk_size = chunk_size
+        self.base_weights = self.rules.weights.astype(int)
+        self.base_threshold = base_threshold(spec)
+
+        # 길이 계산용 상수: 템플릿 고정부, 항 이름 길이
+        terms = [score["term"] for score in spec["scores"]]
+        self._term_lengths = np.array([len(term) for term in terms])
+        empty = render_prompt(spec, np.zeros(len(terms), dtype=int), 0)
+        self._fixed_length = len(empty) - 1  # 임계값 "0" 1자 제외
+
+    def prompt_lengths(self, weights: np.ndarray, thresholds: np.ndarray) -> np.ndarray:
+        """render_prompt 결과 길이를 문자열 생성 없이 계산"""
+        active = weights != 0
+        # 항 길이 + "(" + 부호 + 숫자 + ")"
+        term_lengths = np.where(active, self._term_lengths + 3 + _digits(weights), 0).sum(axis=1)
+        separators = np.maximum(active.sum(axis=1) - 1, 0)
+        threshold_lengths = _digits(thresholds) + (thresholds < 0)
+        return self._fixed_length + term_lengths + separators + threshold_lengths
+
+    def evaluate(self, weights: np.ndarray, thresholds: np.ndarray) -> Dict[str, np.ndarray]:
+        """설정별 정확도·길이·Dacon 점수"""
+        weights = np.atleast_2d(np.asarray(weights, dtype=int))
+        thresholds = np.broadcast_to(np.asarray(thresholds, dtype=int), (len(weights),))
+
+        accuracy = np.empty(len(weights))
+        for start in range(0, len(weights), self.chunk_size):
+            end = start + self.chunk_size
+            # total ≥ t  ⇔  total + (기준 임계값 - t) ≥ 기준 임계값
+            bias = self.base_threshold - thresholds[start:end]
+            accuracy[start:end] = self.rules.accuracy(self.labels, weights[start:end], bias)
+
+        lengths = self.prompt_lengths(weights, thresholds)
+        scores = np.array([calculate_dacon_score(a, int(n)) for a, n in zip(accuracy, lengths)])
+        return {
+            "weights": weights,
+            "thresholds": np.asarray(thresholds),
+            "accuracy": accuracy,
+            "length": lengths,
+            "dacon_score": scores,
+        }
+
+    def grid(self, values: Optional[Sequence[Iterable[int]]] = None,
+             thresholds: Iterable[int] = range(1, 7), span: int = 1) -> Dict[str, np.ndarray]:
+        """격자 탐색
+
+        values: 특징별 후보 가중치 목록. None 이면 기존 가중치 ±span (부호 유지, 0 포함)
+        """
+        if values is None:
+            values = [self._neighbourhood(w, span) for w in self.base_weights]
+        combos = np.array(list(itertools.product(*values)), dtype=int)
+        threshold_list = list(thresholds)
+        weights = np.repeat(combos, len(threshold_list), axis=0)
+        threshold_array = np.tile(threshold_list, len(combos))
+        return self.evaluate(weights, threshold_array)
+
+    def random(self, n: int, low: int = -4, high: int = 4,
+               thresholds: Iterable[int] = range(1, 7), seed: int = 0) -> Dict[str, np.ndarray]:
+        """무작위 탐색 - 기존 부호를 유지한 채 |가중치| ≤ high 범위에서 n개 추출"""
+        rng = np.random.default_rng(seed)
+        magnitudes = rng.integers(0, max(abs(low), high) + 1, size=(n, len(self.base_weights)))
+        weights = magnitudes * np.where(self.base_weights < 0, -1, 1)
+        threshold_array = rng.choice(list(thresholds), size=n)
+        return self.evaluate(weights, threshold_array)
+
+    @staticmethod
+    def _neighbourhood(weight: int, span: int) -> List[int]:
+        """기존 가중치 주변 후보 (부호 반전 없음)"""
+        candidates = range(weight - span, weight + span + 1)
+        if weight >= 0:
+            return sorted({max(0, c) for c in candidates})
+        return sorted({min(0, c) for c in candidates})
+
+    def describe(self, result: Dict[str, np.ndarray], index: int) -> Dict:
+        """설정 1개를 사람이 읽을 수 있는 dict 로"""
+        weights = result["weights"][index]
+        threshold = int(result["thresholds"][index])
+        return {
+            "weights": {score["if"]: int(w) for score, w in zip(self.spec["scores"], weights)},
+            "threshold": threshold,
+            "accuracy": float(result["accuracy"][index]),
+            "length": int(result["length"][index]),
+            "dacon_score": float(result["dacon_score"][index]),
+            "prompt": render_prompt(self.spec, weights, threshold),
+        }
+
+
+def pareto_front(accuracy: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """정확도↑·길이↓ 기준 비지배 설정 인덱스 (길이 오름차순)"""
+    # 길이 오름차순, 같은 길이는 정확도 내림차순
+    order = np.lexsort((-accuracy, lengths))
+    front = []
+    best = -np.inf
+    for i in order:
+        if accuracy[i] > best:
+            front.append(i)
+            best = accuracy[i]
+    return np.array(front, dtype=int)
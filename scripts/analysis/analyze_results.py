@@ -3,55 +3,68 @@
 각 샘플별로 어떤 프롬프트가 성공/실패했는지 분석
 """
 
-import json
+import sys
 import pandas as pd
-from typing import Dict, List
+from pathlib import Path
+from typing import Dict, List, Optional
 import glob
 
-def load_latest_results() -> List[Dict]:
-    """가장 최근 결과 파일 로드"""
-    result_files = glob.glob("results/local_llm_results_*.json")
-    if not result_files:
-        print("결과 파일이 없습니다.")
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from daconprompt.bitset import CorrectnessMatrix
+from daconprompt.results_store import DEFAULT_RESULTS_DB, ResultsStore
+
+def load_latest_results(script: Optional[str] = 'local_llm_evaluation',
+                        run_id: Optional[str] = None) -> List[Dict]:
+    """결과 저장소에서 가장 최근(또는 지정한) 실행 로드
+
+    저장소가 비어 있으면 기존 results/local_llm_results_*.json 을 한 번 가져옴
+    """
+    store = ResultsStore()
+    if store.latest_run() is None:
+        for path in sorted(glob.glob("results/local_llm_results_*.json")):
+            print(f"기존 결과 가져오기: {path}")
+            store.import_json(path, script='local_llm_evaluation')
+
+    run_id = run_id or store.latest_run(script)
+    if run_id is None:
+        print("결과가 없습니다.")
         return []
 
-    latest_file = sorted(result_files)[-1]
-    print(f"로드 중: {latest_file}")
-
-    with open(latest_file, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    print(f"로드 중: {DEFAULT_RESULTS_DB} (run {run_id})")
+    results = store.load_results(run_id)
+    store.close()
+    return results
 
 def analyze_sample_performance(results: List[Dict]) -> pd.DataFrame:
-    """각 샘플별 성능 분석"""
-    # 샘플별 결과 수집
-    sample_analysis = {}
-
+    """각 샘플별 성능 분석 (정오 비트 행렬 기반)"""
+    matrix = CorrectnessMatrix.from_results(results)
+    predictions = matrix.predictions()  # (프롬프트, 샘플), 평가하지 않은 샘플은 -1
+    known = predictions >= 0
+    correct = known & (predictions == matrix.labels)
+    wrong = known & ~correct  # 누락·실패 샘플은 정답도 오답도 아님
+    all_correct = matrix.ids(matrix.success_intersection())
+    all_wrong = matrix.ids(matrix.failure_intersection())
+
+    titles = {}
     for prompt_result in results:
-        prompt_name = prompt_result['name']
         for sample in prompt_result['detailed_results']:
-            sample_id = sample['id']
-
-            if sample_id not in sample_analysis:
-                sample_analysis[sample_id] = {
-                    'id': sample_id,
-                    'title': sample['title'],
-                    'actual': sample['actual'],
-                    'prompts_correct': [],
-                    'prompts_wrong': [],
-                    'all_correct': True,
-                    'all_wrong': True
-                }
-
-            if sample['correct']:
-                sample_analysis[sample_id]['prompts_correct'].append(prompt_name)
-                sample_analysis[sample_id]['all_wrong'] = False
-            else:
-                sample_analysis[sample_id]['prompts_wrong'].append(prompt_name)
-                sample_analysis[sample_id]['all_correct'] = False
+            titles.setdefault(str(sample['id']), sample['title'])
+
+    rows = []
+    for s, sample_id in enumerate(matrix.sample_ids):
+        rows.append({
+            'id': sample_id,
+            'title': titles[sample_id],
+            'actual': int(matrix.labels[s]),
+            'prompts_correct': [p for i, p in enumerate(matrix.prompts) if correct[i, s]],
+            'prompts_wrong': [p for i, p in enumerate(matrix.prompts) if wrong[i, s]],
+            'all_correct': sample_id in all_correct,
+            'all_wrong': sample_id in all_wrong
+        })
 
     # DataFrame으로 변환
-    df = pd.DataFrame.from_dict(sample_analysis, orient='index')
-    df['success_rate'] = df['prompts_correct'].apply(len) / len(results)
+    df = pd.DataFrame(rows, index=matrix.sample_ids)
+    df['success_rate'] = correct.sum(axis=0) / len(results)
 
     return df.sort_values('id')
 
@@ -125,8 +138,9 @@ def save_sample_analysis_csv(df: pd.DataFrame, filename: str = "data/sample_anal
 
 def main():
     """메인 실행"""
-    # 최신 결과 로드
-    results = load_latest_results()
+    # 최신 결과 로드 (--run RUN_ID: 특정 실행)
+    run_id = sys.argv[sys.argv.index('--run') + 1] if '--run' in sys.argv else None
+    results = load_latest_results(run_id=run_id)
     if not results:
         return
 
@@ -139,6 +153,14 @@ def main():
     # CSV 저장
     save_sample_analysis_csv(df)
 
+    # 서로의 오답을 메우는 프롬프트 쌍
+    print("\n" + "=" * 80)
+    print("[상호보완] 둘 중 하나라도 맞춘 샘플이 많은 프롬프트 쌍")
+    print("=" * 80)
+    matrix = CorrectnessMatrix.from_results(results)
+    for a, b, covered, both_wrong in matrix.complementary_pairs(top=5):
+        print(f"  {a} + {b}: {covered}/{matrix.n_samples} (함께 틀림 {both_wrong}개)")
+
     # 문제 샘플 집중 분석
     print("\n" + "=" * 80)
     print("[집중분석] 문제 샘플 집중 분석 (성공률 50% 이하)")
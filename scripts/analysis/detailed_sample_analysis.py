@@ -3,9 +3,15 @@
 """
 
 import json
+import sys
 import pandas as pd
+from pathlib import Path
 from typing import Dict, List
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from daconprompt.bitset import CorrectnessMatrix
+from daconprompt.ensemble import EnsemblePlanner, combinations_count, print_plan
+
 def load_results():
     """결과 파일 로드"""
     with open('results/local_llm_results_Llama-3.2-3B-Instruct-GGUF_20250915_165743.json', 'r', encoding='utf-8') as f:
@@ -169,6 +175,15 @@ def find_best_prompt_combination():
             data = sample_perf[sample_id]
             print(f"  {sample_id}: {data['title'][:50]}... (정답={data['actual']})")
 
+    # 저장된 예측으로 앙상블 조합 전수 평가 (추가 LLM 호출 없음)
+    results = load_results()
+    planner = EnsemblePlanner(CorrectnessMatrix.from_results(results),
+                              lengths={r['name']: r['length'] for r in results if 'length' in r})
+    max_size = min(3, len(planner.prompts))
+    print(f"\n[앙상블 조합] {combinations_count(len(planner.prompts), max_size)}개 조합 평가 "
+          f"(가중 투표·오라클은 같은 샘플 기준이라 낙관적)")
+    print_plan(planner, planner.search(max_size=max_size))
+
 if __name__ == "__main__":
     print_detailed_analysis()
     find_best_prompt_combination()
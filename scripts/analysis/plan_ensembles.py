@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+앙상블 조합 탐색
+결과 저장소(results/results.sqlite)의 샘플별 예측으로 크기 k 이하 프롬프트 조합의
+다수결/가중 투표/오라클 정확도를 일괄 계산 → 추가 호출 비용 대비 이득 확인
+
+사용법:
+  python scripts/analysis/plan_ensembles.py                      # 최근 local_llm_evaluation 실행
+  python scripts/analysis/plan_ensembles.py --run 20250915_165743_ab12 --max-size 4
+  python scripts/analysis/plan_ensembles.py --script qwen_full_test --output results/ensemble_plan.json
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from daconprompt.bitset import CorrectnessMatrix
+from daconprompt.ensemble import EnsemblePlanner, combinations_count, print_plan
+from daconprompt.results_store import DEFAULT_RESULTS_DB, ResultsStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description="저장된 예측으로 앙상블 조합 탐색")
+    parser.add_argument("--db", default=DEFAULT_RESULTS_DB)
+    parser.add_argument("--script", default="local_llm_evaluation", help="--run 없을 때 최근 실행을 고를 스크립트")
+    parser.add_argument("--run", help="run_id (기본: 최근 실행)")
+    parser.add_argument("--max-size", type=int, default=3, help="조합 최대 크기")
+    parser.add_argument("--top", type=int, default=5, help="규칙별 저장할 상위 조합 수")
+    parser.add_argument("--tie", type=int, choices=[0, 1], default=0, help="다수결 동률 시 예측")
+    parser.add_argument("--output", help="전체 결과 JSON 경로")
+    args = parser.parse_args()
+
+    store = ResultsStore(args.db)
+    run_id = args.run or store.latest_run(args.script)
+    if run_id is None:
+        print(f"❌ 저장된 실행이 없습니다: {args.db}")
+        return
+
+    results = store.load_results(run_id)
+    store.close()
+    planner = EnsemblePlanner(CorrectnessMatrix.from_results(results, run_id),
+                              lengths={r['name']: r['length'] for r in results if r.get('length')})
+    max_size = min(args.max_size, len(planner.prompts))
+    print(f"실행 {run_id}: 프롬프트 {len(planner.prompts)}개, 샘플 {len(planner.labels)}개, "
+          f"조합 {combinations_count(len(planner.prompts), max_size):,}개")
+    print("(가중 투표 가중치와 평가가 같은 샘플이라 가중·오라클 수치는 낙관적)")
+
+    report = planner.search(max_size=max_size, top=args.top, tie=args.tie)
+    print_plan(planner, report)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'run_id': run_id, 'best_single': planner.best_single,
+                       'combinations': {str(size): by_rule for size, by_rule in report.items()}},
+                      f, ensure_ascii=False, indent=2)
+        print(f"\n💾 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+P(1) 임계값 탐색
+결과 저장소의 샘플별 P(1)(--constrain 으로 평가한 실행)로 프롬프트마다 임계값별 정확도를
+계산해 운영점을 고르고, 임계값 근처 샘플(확신 낮은 샘플)을 출력 - 모델 재실행 없음
+
+사용법:
+  python scripts/analysis/threshold_sweep.py                       # 최근 local_llm_evaluation 실행
+  python scripts/analysis/threshold_sweep.py --run 20250915_165743_ab12 --prompt 김경태_원본 --top 15
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from daconprompt.calibration import best_threshold, calibration_stats, low_margin, threshold_sweep
+from daconprompt.results_store import DEFAULT_RESULTS_DB, ResultsStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description="P(1) 임계값 탐색")
+    parser.add_argument("--db", default=DEFAULT_RESULTS_DB)
+    parser.add_argument("--script", default="local_llm_evaluation", help="--run 없을 때 최근 실행을 고를 스크립트")
+    parser.add_argument("--run", help="run_id (기본: 최근 실행)")
+    parser.add_argument("--prompt", help="특정 프롬프트만")
+    parser.add_argument("--top", type=int, default=10, help="확신 낮은 샘플 출력 수")
+    args = parser.parse_args()
+
+    store = ResultsStore(args.db)
+    run_id = args.run or store.latest_run(args.script)
+    if run_id is None:
+        print(f"❌ 저장된 실행이 없습니다: {args.db}")
+        return
+    outcomes = store.outcomes(run_id=run_id, prompt=args.prompt)
+    store.close()
+
+    print(f"실행 {run_id}")
+    for prompt, frame in outcomes.groupby('prompt', sort=False):
+        scored = frame[frame['p_one'].notna()]
+        if scored.empty:
+            print(f"\n[{prompt}] P(1) 없음 (--constrain 없이 평가된 실행)")
+            continue
+
+        sweep = threshold_sweep(scored['p_one'], scored['actual'])
+        default = sweep.iloc[(sweep['threshold'] - 0.5).abs().argmin()]
+        best = best_threshold(sweep)
+        stats = calibration_stats(scored['p_one'], scored['actual'])
+        missing = len(frame) - len(scored)
+
+        print(f"\n[{prompt}] P(1) {len(scored)}개" + (f" (없음 {missing}개 제외)" if missing else ""))
+        print(f"  임계값 0.5: 정확도 {default['accuracy']:.2%}")
+        print(f"  최적 {best['threshold']:.3f}: 정확도 {best['accuracy']:.2%}")
+        print(f"  Brier {stats['brier']:.4f}, ECE {stats['ece']:.4f}")
+        print(f"  확신 낮은 샘플 (|P(1) - {best['threshold']:.3f}| 작은 순):")
+        for row in low_margin(scored, best['threshold'], args.top).itertuples():
+            mark = "✅" if row.correct else "❌"
+            print(f"    {mark} {row.sample_id}: P(1)={row.p_one:.3f} 정답={row.actual} {str(row.title)[:40]}")
+
+
+if __name__ == "__main__":
+    main()
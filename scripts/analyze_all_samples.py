@@ -6,44 +6,65 @@ GPT-4o mini | temperature: 0.4 기준 최적화
 
 import csv
 import json
+import sys
 from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from daconprompt.matcher import KeywordMatcher, first_found
+
+# v1.3 키워드 목록
+# T1급-확실한 자동차(→1)
+T1_COMPANIES = ["현대차", "기아", "삼성sdi", "lg이노텍", "lg에너지솔루션", "한온시스템", "포티투닷", "채비", "코오롱인더", "한국타이어", "넥센타이어"]
+T1_PRODUCTS = ["전기차", "ev", "suv", "세단", "하이브리드", "승용차", "상용차", "트럭", "버스"]
+T1_TECH = ["자율주행", "adas", "완성차", "oem", "충전인프라", "급속충전", "차량용"]
+T1_PARTS = ["타이어", "모터", "엔진", "브레이크", "에어백"]
+T1_ALL = T1_COMPANIES + T1_PRODUCTS + T1_TECH + T1_PARTS
+
+# T3급-확실한 비자동차(→0)
+T3_FIELDS = ["부동산", "금융", "정치", "군사", "우주", "의료", "교육", "게임", "요리", "패션", "문화", "스포츠"]
+T3_INDUSTRIES = ["통신", "포털", "유통", "건설", "조선", "항공", "화학", "석유", "철강"]
+T3_ALL = T3_FIELDS + T3_INDUSTRIES
+
+# T2 배터리 맥락
+BATTERY_AUTO = ["전기차", "차량용", "ev", "자동차"]
+BATTERY_NON_AUTO = ["가전", "ess", "태양광", "산업용"]
+
+# 모든 키워드 목록을 한 번에 찾는 매처 (본문 1회 스캔)
+V13_MATCHER = KeywordMatcher({
+    "t1": T1_ALL,
+    "t3": T3_ALL,
+    "battery": ["배터리"] + BATTERY_AUTO + BATTERY_NON_AUTO,
+    "trick": ["현대중공업", "기아대학교"]
+})
 
 # v1.3 규칙을 Python 함수로 변환
 def classify_with_v13_rules(title, content):
     """v1.3 규칙으로 분류 (수동)"""
     text = (title + " " + content).lower()
-    
-    # T1급-확실한 자동차(→1)
-    t1_companies = ["현대차", "기아", "삼성sdi", "lg이노텍", "lg에너지솔루션", "한온시스템", "포티투닷", "채비", "코오롱인더", "한국타이어", "넥센타이어"]
-    t1_products = ["전기차", "ev", "suv", "세단", "하이브리드", "승용차", "상용차", "트럭", "버스"]
-    t1_tech = ["자율주행", "adas", "완성차", "oem", "충전인프라", "급속충전", "차량용"]
-    t1_parts = ["타이어", "모터", "엔진", "브레이크", "에어백"]
-    
-    # T3급-확실한 비자동차(→0)  
-    t3_fields = ["부동산", "금융", "정치", "군사", "우주", "의료", "교육", "게임", "요리", "패션", "문화", "스포츠"]
-    t3_industries = ["통신", "포털", "유통", "건설", "조선", "항공", "화학", "석유", "철강"]
+    found = V13_MATCHER.found(text)
     
     # T1 키워드 체크
-    for keyword in t1_companies + t1_products + t1_tech + t1_parts:
-        if keyword in text:
-            return 1, f"T1키워드: {keyword}"
+    keyword = first_found(T1_ALL, found)
+    if keyword:
+        return 1, f"T1키워드: {keyword}"
     
     # 배터리 맥락 판단
-    if "배터리" in text:
-        if any(x in text for x in ["전기차", "차량용", "ev", "자동차"]):
+    if "배터리" in found:
+        if any(x in found for x in BATTERY_AUTO):
             return 1, "T2-배터리: 전기차용"
-        elif any(x in text for x in ["가전", "ess", "태양광", "산업용"]):
+        elif any(x in found for x in BATTERY_NON_AUTO):
             return 0, "T2-배터리: 비자동차용"
     
     # T3 키워드 체크
-    for keyword in t3_fields + t3_industries:
-        if keyword in text:
-            return 0, f"T3키워드: {keyword}"
+    keyword = first_found(T3_ALL, found)
+    if keyword:
+        return 0, f"T3키워드: {keyword}"
     
     # 트릭케이스 체크
-    if "현대중공업" in text:
+    if "현대중공업" in found:
         return 0, "트릭케이스: 현대중공업≠현대차"
-    if "기아대학교" in text:
+    if "기아대학교" in found:
         return 0, "트릭케이스: 기아대학교≠기아"
     
     # 불명확한 경우 보수적 0
@@ -3,36 +3,18 @@ Llama-3.2에 최적화된 영어 프롬프트 테스트
 단순하고 명확한 규칙 사용
 """
 
+import sys
+from pathlib import Path
 import pandas as pd
-import requests
 import json
 import time
 import math
 
-def call_lm_studio(prompt: str, user_input: str) -> str:
-    """LM Studio API 호출"""
-    headers = {"Content-Type": "application/json"}
-    payload = {
-        "messages": [
-            {"role": "system", "content": prompt},
-            {"role": "user", "content": f"[Article]\n{user_input}"}
-        ],
-        "temperature": 0.1,
-        "max_tokens": 10,
-        "stream": False
-    }
-
-    try:
-        response = requests.post(
-            "http://localhost:1234/v1/chat/completions",
-            headers=headers,
-            json=payload,
-            timeout=30
-        )
-        result = response.json()
-        return result['choices'][0]['message']['content'].strip()
-    except Exception as e:
-        return "0"
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from daconprompt.client import LLMClient
+
+# LM Studio API 호출 - 공용 keep-alive 클라이언트
+client = LLMClient(timeout=30, user_prefix="[Article]\n", verbose=False)
 
 # 영어 기반 단순 프롬프트들
 prompts = {
@@ -124,11 +106,18 @@ def test_prompts():
 
         correct = 0
         predictions = []
+        failed = []  # 요청 실패 샘플 (채점 제외)
 
         for idx, row in df_test.iterrows():
             # 영어로 테스트하되 제목/본문은 그대로
             user_input = f"Title: {row['title']}\nContent: {row['content']}"
-            response = call_lm_studio(prompt, user_input)
+            try:
+                response = client.complete(prompt, user_input)
+            except Exception as e:
+                print(f"\n  [!] {idx+1:2}: 요청 실패 - {e}")
+                failed.append({'id': row.get('ID', row.get('id', idx)), 'actual': row['label'],
+                               'error': f"{type(e).__name__}: {e}"[:200]})
+                continue
 
             predicted = 1 if "1" in response[:10] else 0
             actual = row['label']
@@ -150,18 +139,22 @@ def test_prompts():
             if (idx + 1) % 10 == 0:
                 print()
 
-        accuracy = correct / len(df_test)
+        answered = len(predictions)
+        accuracy = correct / answered if answered else 0.0
 
         results.append({
             'name': name,
             'accuracy': accuracy,
             'correct': correct,
-            'total': len(df_test),
+            'total': answered,
             'length': len(prompt),
-            'predictions': predictions
+            'predictions': predictions,
+            'failed': failed
         })
 
-        print(f"\n정확도: {accuracy:.1%} ({correct}/{len(df_test)})")
+        print(f"\n정확도: {accuracy:.1%} ({correct}/{answered})")
+        if failed:
+            print(f"요청 실패: {len(failed)}건 (채점 제외)")
 
     return results
 
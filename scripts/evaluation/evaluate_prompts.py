@@ -1,9 +1,14 @@
+import sys
 import pandas as pd
 import json
 import re
+from pathlib import Path
 from typing import Dict, List, Tuple
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from daconprompt.matcher import KeywordMatcher
+
 # 평가 규칙 JSON
 EVALUATION_RULES = {
     "automotive_keywords": {
@@ -55,6 +60,12 @@ EVALUATION_RULES = {
     }
 }
 
+# 키워드 규칙 전체를 한 번에 찾는 매처 (본문 1회 스캔)
+KEYWORD_MATCHER = KeywordMatcher({
+    category: rules["keywords"]
+    for category, rules in EVALUATION_RULES["automotive_keywords"].items()
+})
+
 class PromptEvaluator:
     def __init__(self, prompt_text: str, prompt_name: str):
         self.prompt = prompt_text
@@ -77,9 +88,10 @@ class PromptEvaluator:
         matched_rules = []
 
         # 키워드 기반 스코어링
+        found = KEYWORD_MATCHER.found(text)
         for category, rules in EVALUATION_RULES["automotive_keywords"].items():
             for keyword in rules["keywords"]:
-                if keyword.lower() in text:
+                if keyword.lower() in found:
                     score += rules["weight"]
                     matched_rules.append({
                         "category": category,
@@ -4,6 +4,14 @@ import re
 import math
 from typing import Dict, List, Tuple
 from datetime import datetime
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from daconprompt.incidence import VectorizedRules
+from daconprompt.registry import PromptRegistry
+from daconprompt.results_store import DEFAULT_RESULTS_DB, ResultsStore
+from daconprompt.rules import load_spec
 
 # 올바른 데이콘 평가 산식
 def calculate_length_score(length):
@@ -33,7 +41,6 @@ ALL_PROMPTS = {
 
 판정: total≥3 & (차량용명시|A와Act동시)→1, 나머지→0
 출력: 0|1""",
-        "length": 364,
         "actual_score": 0.5132611818,
         "status": "submitted"
     },
@@ -58,7 +65,6 @@ PRIMARY BUSINESS가 자동차산업→1
 
 최종판정: 3개관점중 2개이상 동일값→채택
 출력: 0|1""",
-        "length": 348,
         "actual_score": 0.0993249213,
         "status": "submitted"
     },
@@ -89,7 +95,6 @@ LG가정용배터리→가전→0
 LG차량용배터리→자동차→1
 
 출력: 0|1""",
-        "length": 283,
         "actual_score": 0.7115540668,
         "status": "submitted"
     },
@@ -114,7 +119,6 @@ B=정책·무역·금융·외교·원자재·에너지·ESS·전력·UAM·항공
 -1 자동차 키워드 부차적
 [판정 규칙]
 total = 합계 게이트: total≥3 이면서 (① OEM/차종/차량용/규제·인증 신호 중 하나 명시 또는 ② A∧Act 동시문장) 일 때만 1, 그 외 0. (모호하면 0)""",
-        "length": 581,
         "actual_score": 0.9801067389,
         "status": "submitted"
     },
@@ -143,7 +147,6 @@ total = 합계 게이트: total≥3 이면서 (① OEM/차종/차량용/규제·
 "전기차 배터리 제조"→자동차 산업→1
 
 출력: 0 또는 1만""",
-        "length": 340,
         "actual_score": 0.9453557022,
         "status": "submitted"
     },
@@ -168,7 +171,6 @@ B=정책·무역·금융·원자재·에너지·ESS·전력·UAM·항공·철도
 -1 자동차 키워드 부차적
 [판정 규칙]
 total≥3 이면서 (차량용 명시 또는 A와Act 동시문장) 일 때만 1, 그 외 0""",
-        "length": 501,
         "actual_score": 0.7825956896,
         "status": "submitted"
     },
@@ -193,7 +195,6 @@ B=정책·무역·금융·에너지·ESS·UAM·항공·철도·조선·로봇
 -1 차 키워드 부차적
 [판정]
 total≥3 & (차량용 명시|A와Act 동시)→1, 나머지→0""",
-        "length": 423,
         "actual_score": 0.873,
         "status": "submitted"
     },
@@ -218,7 +219,6 @@ B=정책·무역·금융·외교·원자재·에너지·ESS·전력·UAM·항공
 -1 자동차 키워드 부차적
 [판정 규칙]
 total = 합계 게이트: total≥3 이면서 (① OEM/차종/차량용/규제·인증 신호 중 하나 명시 또는 ② A와 Act 동시문장) 일 때만 1, 그 외 0. (모호하면 0)""",
-        "length": 591,
         "actual_score": 0.9800403488,
         "status": "submitted"
     },
@@ -246,7 +246,6 @@ B=정책·무역·금융·외교·원자재·에너지·ESS·전력·UAM·항공
 
 [판정 규칙]
 total = 합계 게이트: total≥3 이면서 (① OEM/차종/차량용/규제·인증 신호 중 하나 명시 또는 ② A∧Act 동시문장) 일 때만 1, 그 외 0. (모호하면 0)""",
-        "length": 575,
         "actual_score": 0.9801,
         "status": "reference"
     },
@@ -271,7 +270,6 @@ B=정책·무역·금융·외교·원자재·에너지·ESS·전력·UAM·항공
 -1 자동차 키워드 부차적
 [판정 규칙]
 total = 합계 게이트: total≥3 이면서 (① OEM/차종/차량용/규제·인증 신호 중 하나 명시 또는 ② A와 Act 동시문장) 일 때만 1, 그 외 0.""",
-        "length": 560,
         "actual_score": None,
         "status": "pending"
     },
@@ -296,7 +294,6 @@ B=정책·무역·금융·원자재·에너지·ESS·전력·UAM·항공·철도
 -1 자동차 키워드 부차적
 [판정]
 total≥3 이면서 (OEM/차종/차량용/규제·인증 중 하나 또는 A와Act 동시) 일 때만 1, 그 외 0""",
-        "length": 540,
         "actual_score": None,
         "status": "pending"
     },
@@ -321,65 +318,40 @@ B=정책·무역·금융·에너지·ESS·UAM·항공·철도·조선·로봇
 -1 차 키워드 부차적
 [판정]
 total≥3 이면서 (OEM/차종/차량용/인증 중 하나 또는 A와Act 동시) 일 때만 1, 그 외 0""",
-        "length": 520,
         "actual_score": None,
         "status": "pending"
     }
 }
 
+# 길이·토큰 수·본문 해시는 레지스트리가 본문에서 계산 (prompts/ 파일과 같은 본문이면 한 항목)
+PROMPTS = PromptRegistry()
+for _name, _data in ALL_PROMPTS.items():
+    PROMPTS.add(_name, _data['prompt'], source=f"full_evaluation.py:{_name}")
+
 class PromptEvaluator:
     def __init__(self):
         self.df = pd.read_csv('data/samples.csv')
         self.results = {}
 
+        # 저장된 LLM 평가 결과를 본문 해시로 연결
+        if Path(DEFAULT_RESULTS_DB).exists():
+            store = ResultsStore(DEFAULT_RESULTS_DB)
+            PROMPTS.link_results(store)
+            store.close()
+
+        # 규칙 기반 근사 (rules/kimgyeongtae_sim.json) - 출현 행렬 1회 구축 후 모든 프롬프트 공유
+        self.simulator = VectorizedRules(load_spec('rules/kimgyeongtae_sim.json'),
+                                         self.df['title'].tolist(), self.df['content'].tolist())
+        self.predictions = self.simulator.predict()
+
     def evaluate_prompt(self, name: str, prompt_data: dict) -> dict:
         """단일 프롬프트 평가"""
-        prompt = prompt_data['prompt']
-        length = prompt_data['length']
+        entry = PROMPTS[name]
+        length = entry['length']
 
         # 간단한 규칙 기반 평가 (실제 GPT-4o mini 시뮬레이션)
-        correct = 0
-        predictions = []
-
-        for idx, row in self.df.iterrows():
-            text = f"{row['Title']} {row['Content']}".lower()
-
-            # 점수 계산
-            score = 0
-
-            # A집합 체크
-            a_keywords = ['현대차', '기아', '테슬라', 'bmw', '도요타', 'gm', '포드', 'byd',
-                         '완성차', 'oem', '전장', '부품', '타이어', '충전', '차량용', '배터리']
-            for keyword in a_keywords:
-                if keyword in text:
-                    score += 3
-                    break
-
-            # Act집합 체크
-            act_keywords = ['출시', '양산', '증설', '생산', '투자', '수주', '공급', '판매',
-                           '수출', '수입', '실적', '리콜', '인증']
-            for keyword in act_keywords:
-                if keyword in text:
-                    score += 2
-                    break
-
-            # 차량용 명시
-            if '차량용' in text or '자동차용' in text or '전기차' in text:
-                score += 2
-
-            # B집합 체크 (마이너스)
-            b_keywords = ['ess', '태양광', 'uam', '항공', '조선', '정책', '무역']
-            for keyword in b_keywords:
-                if keyword in text and '자동차' not in text and '차량' not in text:
-                    score -= 3
-                    break
-
-            # 예측
-            predicted = 1 if score >= 3 else 0
-            predictions.append(predicted)
-
-            if predicted == row['Label']:
-                correct += 1
+        predictions = self.predictions
+        correct = int((predictions == self.df['label'].to_numpy()).sum())
 
         # 정확도 계산
         accuracy = correct / len(self.df)
@@ -396,9 +368,15 @@ class PromptEvaluator:
             # actual_score = 0.9 * actual_accuracy + 0.1 * length_score
             actual_accuracy = (prompt_data['actual_score'] - 0.1 * length_score) / 0.9
 
+        stored = [r['dacon_score'] for r in entry['results'] if r['dacon_score'] is not None]
+
         return {
             "name": name,
             "length": length,
+            "tokens": entry['tokens'],
+            "prompt_hash": entry['hash'],
+            "same_as": [n for n in entry['names'] if n != name],
+            "stored_best_score": max(stored) if stored else None,
             "length_score": length_score,
             "self_eval_accuracy": accuracy,
             "self_eval_score": estimated_score,
@@ -427,8 +405,8 @@ class PromptEvaluator:
                 "sample_data": {
                     "file": "data/samples.csv",
                     "count": len(self.df),
-                    "label_1": sum(self.df['Label'] == 1),
-                    "label_0": sum(self.df['Label'] == 0)
+                    "label_1": int((self.df['label'] == 1).sum()),
+                    "label_0": int((self.df['label'] == 0).sum())
                 },
                 "results": self.results
             }, f, ensure_ascii=False, indent=2)
@@ -3,38 +3,19 @@
 김경태 프롬프트의 핵심 성공 요인을 반영한 버전들
 """
 
+import sys
+from pathlib import Path
 import pandas as pd
-import requests
 import json
 import time
 from datetime import datetime
 import math
 
-def call_lm_studio(prompt: str, user_input: str) -> str:
-    """LM Studio API 호출"""
-    headers = {"Content-Type": "application/json"}
-    payload = {
-        "messages": [
-            {"role": "system", "content": prompt},
-            {"role": "user", "content": f"[기사]\n{user_input}"}
-        ],
-        "temperature": 0.1,
-        "max_tokens": 10,
-        "stream": False
-    }
-
-    try:
-        response = requests.post(
-            "http://localhost:1234/v1/chat/completions",
-            headers=headers,
-            json=payload,
-            timeout=60
-        )
-        result = response.json()
-        return result['choices'][0]['message']['content'].strip()
-    except Exception as e:
-        print(f"    API 에러: {e}")
-        return "0"
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from daconprompt.client import LLMClient
+
+# LM Studio API 호출 - 공용 keep-alive 클라이언트
+client = LLMClient(timeout=60)
 
 def calculate_dacon_score(accuracy: float, prompt_length: int) -> float:
     """실제 Dacon 점수 계산"""
@@ -209,12 +190,19 @@ def evaluate_prompts():
 
         correct = 0
         predictions = []
+        failed = []  # 요청 실패 샘플 (채점 제외)
 
         for idx, row in df.iterrows():
             user_input = f"제목: {row['title']}\n본문: {row['content']}"
 
-            # API 호출
-            response = call_lm_studio(prompt, user_input)
+            # API 호출 (재시도까지 실패하면 채점 제외)
+            try:
+                response = client.complete(prompt, user_input)
+            except Exception as e:
+                print(f"  [!] {idx+1}: 요청 실패 - {e}")
+                failed.append({'id': row.get('ID', row.get('id', idx)), 'actual': row['label'],
+                               'error': f"{type(e).__name__}: {e}"[:200]})
+                continue
 
             # 예측값 추출
             predicted = 1 if "1" in response[:10] else 0
@@ -235,22 +223,26 @@ def evaluate_prompts():
             if (idx + 1) % 10 == 0:
                 print(f"  진행: {idx+1}/{len(df)}")
 
-        accuracy = correct / len(df)
+        answered = len(predictions)
+        accuracy = correct / answered if answered else 0.0
         dacon_score = calculate_dacon_score(accuracy, len(prompt))
 
         result = {
             'name': name,
             'prompt_length': len(prompt),
             'correct': correct,
-            'total': len(df),
+            'total': answered,
             'accuracy': accuracy,
             'dacon_score': dacon_score,
-            'predictions': predictions
+            'predictions': predictions,
+            'failed': failed
         }
 
         results.append(result)
 
-        print(f"  정확도: {accuracy:.1%} ({correct}/{len(df)})")
+        print(f"  정확도: {accuracy:.1%} ({correct}/{answered})")
+        if failed:
+            print(f"  요청 실패: {len(failed)}건 (채점 제외)")
         print(f"  예상 Dacon 점수: {dacon_score:.4f}")
 
     return results
@@ -1,14 +1,28 @@
 """
 로컬 LLM을 사용한 프롬프트 평가
 GPT-4o mini 대신 Ollama/LM Studio 등 로컬 모델 사용
+
+사용법:
+  python scripts/evaluation/local_llm_evaluation.py [--concurrency N [--grouped] [--batch K]] [--resume] [--checkpoint PATH]
+  python scripts/evaluation/local_llm_evaluation.py --bandit [BUDGET] [--seed N]   # successive halving 선별
+  python scripts/evaluation/local_llm_evaluation.py --constrain grammar|logprobs     # 0/1 한 토큰 강제
+  python scripts/evaluation/local_llm_evaluation.py --endpoints endpoints.json       # 여러 서버에 분산 (daconprompt/pool.py 형식)
 """
 
+import sys
 import pandas as pd
-import json
-import requests
 import math
-from typing import Dict, List
-from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from daconprompt.bandit import SuccessiveHalving
+from daconprompt.checkpoint import DEFAULT_CHECKPOINT_DIR, Checkpoint
+from daconprompt.client import LLMClient
+from daconprompt.engine import EvaluationEngine
+from daconprompt.pool import EndpointPool
+from daconprompt.results_store import DEFAULT_RESULTS_DB, ResultsStore, is_partial
+from daconprompt.telemetry import REGISTRY, format_summary
 
 # LM Studio 설정
 USE_LM_STUDIO = True  # LM Studio 사용
@@ -18,49 +32,20 @@ MODEL_NAME = "Llama-3.2-3B-Instruct-GGUF"
 # Ollama 사용 시 (백업)
 OLLAMA_API_URL = "http://localhost:11434/api/generate"
 
-def call_ollama(prompt: str, user_input: str) -> str:
-    """Ollama API 호출"""
-    payload = {
-        "model": MODEL_NAME,
-        "prompt": f"{prompt}\n\n[기사]\n{user_input}",
-        "stream": False,
-        "options": {
-            "temperature": 0.1,  # 일관성을 위해 낮게 설정
-            "top_p": 0.1
-        }
-    }
-
-    try:
-        response = requests.post(OLLAMA_API_URL, json=payload)
-        result = response.json()
-        return result['response'].strip()
-    except Exception as e:
-        print(f"Error calling Ollama: {e}")
-        return "0"
-
-def call_lm_studio(prompt: str, user_input: str) -> str:
-    """LM Studio API 호출 (OpenAI 호환)"""
-    headers = {"Content-Type": "application/json"}
-    payload = {
-        "messages": [
-            {"role": "system", "content": prompt},
-            {"role": "user", "content": f"[기사]\n{user_input}"}
-        ],
-        "temperature": 0.1,
-        "max_tokens": 10
-    }
-
-    try:
-        response = requests.post(
-            "http://localhost:1234/v1/chat/completions",
-            headers=headers,
-            json=payload
-        )
-        result = response.json()
-        return result['choices'][0]['message']['content'].strip()
-    except Exception as e:
-        print(f"Error calling LM Studio: {e}")
-        return "0"
+# 요청당 제한 시간 (연결, 응답 초) - 멈춘 서버를 무한정 기다리지 않음 (일시적 오류는 LLMClient 가 재시도)
+REQUEST_TIMEOUT = (10, 120)
+
+# 공용 keep-alive 클라이언트
+ollama_client = LLMClient(
+    OLLAMA_API_URL,
+    model=MODEL_NAME,
+    backend="ollama",
+    options={"top_p": 0.1},  # 일관성을 위해 낮게 설정
+    timeout=REQUEST_TIMEOUT
+)
+lm_studio_client = LLMClient(LM_STUDIO_API_URL, timeout=REQUEST_TIMEOUT)
+# 평가에 쓰는 클라이언트 (--endpoints 가 있으면 main 에서 엔드포인트 풀로 교체)
+client = lm_studio_client if USE_LM_STUDIO else ollama_client
 
 def calculate_dacon_score(accuracy: float, prompt_length: int) -> float:
     """데이콘 공식 점수 계산"""
@@ -71,12 +56,17 @@ def calculate_dacon_score(accuracy: float, prompt_length: int) -> float:
 
     return 0.9 * accuracy + 0.1 * length_score
 
-def evaluate_prompt(prompt_name: str, prompt_text: str, df: pd.DataFrame) -> Dict:
-    """프롬프트 평가"""
+def evaluate_prompt(prompt_name: str, prompt_text: str, df: pd.DataFrame,
+                    checkpoint: Optional[Checkpoint] = None) -> Dict:
+    """프롬프트 평가 (checkpoint 가 있으면 샘플마다 기록하고 완료된 샘플은 재사용)
+
+    재시도까지 실패한 샘플은 채점하지 않고 'failed' 에 따로 기록 (다음 --resume 때 다시 시도)
+    """
     correct = 0
     predictions = []
     errors = []
     detailed_results = []  # 각 샘플별 상세 결과
+    failed = []  # 요청 실패 샘플
 
     print(f"\n평가 중: {prompt_name} ({len(prompt_text)}자)")
     print("-" * 50)
@@ -85,36 +75,54 @@ def evaluate_prompt(prompt_name: str, prompt_text: str, df: pd.DataFrame) -> Dic
         title = row['title']
         content = row['content']
         actual = row['label']
+        sample_id = row.get('ID', row.get('id', idx))  # ID 또는 id 또는 인덱스
 
-        user_input = f"제목: {title}\n본문: {content}"
-
-        # LLM 호출
-        if USE_LM_STUDIO:
-            response = call_lm_studio(prompt_text, user_input)
-        else:
-            response = call_ollama(prompt_text, user_input)
-
-        # 응답에서 0 또는 1 추출
-        if "1" in response[:10]:  # 처음 10자 내에서 찾기
-            predicted = 1
-        elif "0" in response[:10]:
-            predicted = 0
-        else:
-            predicted = 0  # 기본값
-
+        # 이전 실행에서 끝난 샘플은 기록 재사용
+        record = checkpoint.get(prompt_name, prompt_text, sample_id) if checkpoint is not None else None
+        if record is None:
+            user_input = f"제목: {title}\n본문: {content}"
+
+            # LLM 호출 (--constrain: 0/1 한 토큰 + logprobs 의 P(1))
+            p_one = None
+            try:
+                if client.constrain:
+                    predicted, p_one, response = client.classify_binary(prompt_text, user_input)
+                else:
+                    response = client.complete(prompt_text, user_input)
+            except Exception as e:
+                print(f"  [!] Sample {sample_id:2}: 요청 실패 - {e}")
+                failed.append({'id': sample_id, 'title': title[:80], 'actual': actual,
+                               'error': f"{type(e).__name__}: {e}"[:200]})
+                continue
+
+            if not client.constrain:
+                # 응답에서 0 또는 1 추출
+                if "1" in response[:10]:  # 처음 10자 내에서 찾기
+                    predicted = 1
+                elif "0" in response[:10]:
+                    predicted = 0
+                else:
+                    predicted = 0  # 기본값
+
+            record = {
+                'id': sample_id,
+                'title': title[:80],
+                'actual': actual,
+                'predicted': predicted,
+                'correct': predicted == actual,
+                'response': response[:100]  # LLM 원본 응답 일부
+            }
+            if p_one is not None:
+                record['p_one'] = p_one
+            if checkpoint is not None:
+                checkpoint.append(prompt_name, prompt_text, sample_id, record)
+
+        predicted = record['predicted']
         predictions.append(predicted)
 
         # 각 샘플별 상세 결과 저장
-        is_correct = (predicted == actual)
-        sample_id = row.get('ID', row.get('id', idx))  # ID 또는 id 또는 인덱스
-        detailed_results.append({
-            'id': sample_id,
-            'title': title[:80],
-            'actual': actual,
-            'predicted': predicted,
-            'correct': is_correct,
-            'response': response[:100]  # LLM 원본 응답 일부
-        })
+        is_correct = record['correct']
+        detailed_results.append(record)
 
         if is_correct:
             correct += 1
@@ -132,22 +140,27 @@ def evaluate_prompt(prompt_name: str, prompt_text: str, df: pd.DataFrame) -> Dic
 
         # 10개마다 요약
         if (idx + 1) % 10 == 0:
-            print(f"  >>> 진행: {idx + 1}/{len(df)} - 현재 정확도: {correct/(idx+1):.2%}")
+            print(f"  >>> 진행: {idx + 1}/{len(df)} - 현재 정확도: {correct/len(detailed_results):.2%}")
 
-    accuracy = correct / len(df)
+    # 정확도는 응답받은 샘플 기준
+    total = len(detailed_results)
+    accuracy = correct / total if total else 0.0
     prompt_length = len(prompt_text)
     dacon_score = calculate_dacon_score(accuracy, prompt_length)
 
-    return {
+    result = {
         'name': prompt_name,
         'length': prompt_length,
         'accuracy': accuracy,
         'correct': correct,
-        'total': len(df),
+        'total': total,
         'dacon_score': dacon_score,
         'errors': errors[:5],  # 상위 5개 오류만
         'detailed_results': detailed_results  # 전체 상세 결과
     }
+    if failed:
+        result['failed'] = failed
+    return result
 
 # 테스트할 프롬프트들
 PROMPTS_TO_TEST = {
@@ -213,58 +226,142 @@ Output: "1" or "0" only"""
 
 def main():
     """메인 실행"""
+    global client
+
     # 샘플 데이터 로드
     df = pd.read_csv('data/samples.csv')
     print(f"샘플 데이터 로드: {len(df)}개")
     print(f"레이블 분포: 1={sum(df['label']==1)}개, 0={sum(df['label']==0)}개")
 
+    # --constrain: grammar/logprobs 로 "0"·"1" 한 토큰만 생성 (LM Studio OpenAI 호환 API)
+    if '--constrain' in sys.argv:
+        mode = sys.argv[sys.argv.index('--constrain') + 1]
+        if mode not in ("grammar", "logprobs"):
+            print("--constrain 은 grammar 또는 logprobs (logit_bias 는 토큰 ID 가 필요해 LLMClient 에서 직접 지정)")
+            return
+    # --endpoints: 설정 파일의 서버들(LM Studio/Ollama/원격)에 진행 중 요청이 적은 순으로 분산, 오류 시 다른 서버로
+    pool = None
+    if '--endpoints' in sys.argv:
+        pool = client = EndpointPool.from_config(sys.argv[sys.argv.index('--endpoints') + 1],
+                                                 timeout=REQUEST_TIMEOUT)
+        print(f"엔드포인트 풀: {len(pool.members)}개 서버, 동시 {pool.capacity}개")
+        for member in pool.members:
+            print(f"  - {member.client.endpoint} ({member.client.model}, 동시 {member.limit}개)")
+
+    if '--constrain' in sys.argv:
+        client.constrain = mode
+        print(f"0/1 한 토큰 강제 모드: {mode}")
+
     # 모델 연결 테스트
     print(f"\n모델 연결 테스트 (Model: {MODEL_NAME})...")
-    if USE_LM_STUDIO:
-        test_response = call_lm_studio("답변: 1", "테스트")
-        print(f"LM Studio 연결 성공! 테스트 응답: {test_response}")
-    else:
-        test_response = call_ollama("답변: 1", "테스트")
-        print(f"Ollama 연결 성공! 테스트 응답: {test_response}")
+    try:
+        test_response = client.complete("답변: 1", "테스트")
+    except Exception as e:
+        print(f"연결 실패: {e}")
+        return
+    print(f"연결 성공! 테스트 응답: {test_response}")
+    REGISTRY.reset()  # 계측은 평가 요청만
 
     # 자동 실행 모드
     print("\n평가를 시작합니다...")
-    import sys
     if len(sys.argv) > 1 and sys.argv[1] == '--no-auto':
         if input("계속하시겠습니까? (y/n): ").lower() != 'y':
             return
 
-    # 각 프롬프트 평가
-    results = []
-    for prompt_name, prompt_text in PROMPTS_TO_TEST.items():
-        result = evaluate_prompt(prompt_name, prompt_text, df)
-        results.append(result)
+    # 샘플별 체크포인트 (--resume: 이전 실행에서 끝난 (프롬프트, 샘플)은 건너뜀)
+    checkpoint_path = f"{DEFAULT_CHECKPOINT_DIR}/local_llm_{MODEL_NAME.replace(':', '_')}.jsonl"
+    if '--checkpoint' in sys.argv:
+        checkpoint_path = sys.argv[sys.argv.index('--checkpoint') + 1]
+    checkpoint = Checkpoint(checkpoint_path, resume='--resume' in sys.argv)
+    if checkpoint.resumed:
+        print(f"체크포인트 재개: {checkpoint.resumed}건 완료됨 ({checkpoint_path})")
+
+    # 각 프롬프트 평가 (--concurrency N: 서버 parallel slot 수만큼 동시 요청)
+    with checkpoint:
+        if '--bandit' in sys.argv:
+            # 작은 무작위 샘플 묶음으로 전 후보를 보고 하위 절반씩 탈락 (기본 예산: 10개 전수 평가 분량)
+            position = sys.argv.index('--bandit') + 1
+            budget = int(sys.argv[position]) if position < len(sys.argv) and sys.argv[position].isdigit() else None
+            seed = int(sys.argv[sys.argv.index('--seed') + 1]) if '--seed' in sys.argv else 0
+            concurrency = (int(sys.argv[sys.argv.index('--concurrency') + 1]) if '--concurrency' in sys.argv
+                           else pool.capacity if pool else 4)
+            engine = EvaluationEngine(client, concurrency=concurrency, verbose=False, checkpoint=checkpoint)
+            print(f"예산 배분 모드 (successive halving, seed={seed})")
+            screening = SuccessiveHalving(engine, df, budget=budget, seed=seed).run(PROMPTS_TO_TEST)
+            print(f"호출 {screening['calls']}회 (전수 평가 {screening['full_cost']}회)")
+            results = screening['results']
+        elif '--concurrency' in sys.argv or pool:
+            # 풀이면 기본값은 전체 서버 동시 처리 한도 합 (서버별 한도는 풀이 지킴)
+            concurrency = (int(sys.argv[sys.argv.index('--concurrency') + 1]) if '--concurrency' in sys.argv
+                           else pool.capacity)
+            # --grouped: 슬롯마다 프롬프트 하나의 샘플을 연속 전송 (서버 prefix 캐시 재사용)
+            ordering = "grouped" if '--grouped' in sys.argv else "interleaved"
+            client.cache_prompt = client.slot_hints = ordering == "grouped"
+            # --batch K: 기사 K건을 요청 하나로 분류 (형식이 깨진 칸만 단건 재시도)
+            batch_size = int(sys.argv[sys.argv.index('--batch') + 1]) if '--batch' in sys.argv else 1
+            print(f"동시 평가 모드: {'풀 전체' if pool else '엔드포인트당'} {concurrency}개 동시 요청 ({ordering}"
+                  f"{f', 요청당 기사 {batch_size}건' if batch_size > 1 else ''})")
+            engine = EvaluationEngine(client, concurrency=concurrency, checkpoint=checkpoint,
+                                      ordering=ordering, batch_size=batch_size)
+            results = engine.sweep(PROMPTS_TO_TEST, df)
+            if batch_size > 1:
+                print(f"일괄 요청 {engine.batch_stats['requests']}회, 단건 재시도 {engine.batch_stats['fallbacks']}회")
+        else:
+            results = [evaluate_prompt(name, text, df, checkpoint) for name, text in PROMPTS_TO_TEST.items()]
 
+    if pool:
+        print("\n엔드포인트별 처리:")
+        for stat in pool.stats():
+            print(f"  {stat['endpoint']}: {stat['served']}건, 오류 {stat['errors']}건"
+                  f"{'' if stat['healthy'] else ' (제외됨)'}")
+
+    for result in results:
+        prompt_name = result['name']
         print(f"\n결과: {prompt_name}")
         print(f"  정확도: {result['accuracy']:.2%} ({result['correct']}/{result['total']})")
         print(f"  예상 점수: {result['dacon_score']:.4f}")
+        if result.get('failed'):
+            print(f"  요청 실패: {len(result['failed'])}건 (채점 제외)")
+        if result.get('eliminated_round'):
+            print(f"  {result['eliminated_round']}라운드 탈락 ({result['evaluated']}샘플 기준)")
 
         if result['errors']:
             print("  주요 오류:")
             for err in result['errors'][:3]:
                 print(f"    - ID{err['id']}: {err['title']} (실제:{err['actual']}, 예측:{err['predicted']})")
 
-    # 결과 저장
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"results/local_llm_results_{MODEL_NAME.replace(':', '_')}_{timestamp}.json"
-
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
-
-    print(f"\n결과 저장: {filename}")
+    # 결과 저장 (실행·프롬프트·샘플 단위 결과 저장소)
+    store = ResultsStore()
+    run_id = store.start_run('local_llm_evaluation', MODEL_NAME,
+                             meta={'backend': 'pool' if pool else 'lm_studio' if USE_LM_STUDIO else 'ollama',
+                                   'endpoints': pool.stats() if pool else [client.endpoint]})
+    store.add_results(run_id, results, PROMPTS_TO_TEST)
+    store.close()
+
+    print(f"\n결과 저장: {DEFAULT_RESULTS_DB} (run {run_id})")
+
+    # 요청별 지연·토큰 계측 (엔드포인트별 히스토그램 + 느린 요청)
+    telemetry_path = f"results/telemetry_{run_id}.json"
+    REGISTRY.dump(telemetry_path, meta={'run_id': run_id, 'model': MODEL_NAME})
+    summary = format_summary(REGISTRY)
+    if summary:
+        print(f"\n요청 계측 ({telemetry_path}):\n{summary}")
+        for slow in REGISTRY.slowest()[:3]:
+            print(f"  느린 요청 {slow['latency'] * 1000:.0f}ms ({slow['input_chars']}자): "
+                  f"{slow['input_head'][:40]!r}")
 
     # 최종 순위
     print("\n" + "=" * 60)
     print("최종 순위")
     print("=" * 60)
-    results.sort(key=lambda x: x['dacon_score'], reverse=True)
-    for i, result in enumerate(results, 1):
+    # 전체 샘플을 평가한 후보만 순위 (선별 탈락 후보 점수는 일부 샘플 기준)
+    ranked = sorted((r for r in results if not is_partial(r)), key=lambda x: x['dacon_score'], reverse=True)
+    for i, result in enumerate(ranked, 1):
         print(f"{i}. {result['name']}: {result['dacon_score']:.4f} (정확도: {result['accuracy']:.2%}, 길이: {result['length']}자)")
+    for result in results:
+        if is_partial(result):
+            print(f"-. {result['name']}: {result['eliminated_round']}라운드 탈락 "
+                  f"({result['evaluated']}샘플 기준 정확도 {result['accuracy']:.2%})")
 
 if __name__ == "__main__":
     main()
@@ -3,36 +3,21 @@ Qwen2.5-7B-Instruct 전체 46개 샘플 테스트
 최고 성능 프롬프트들로 최종 평가
 """
 
+import argparse
+import sys
+from pathlib import Path
 import pandas as pd
-import requests
-import json
-import time
 import math
 
-def call_lm_studio(prompt: str, user_input: str) -> str:
-    """LM Studio API 호출"""
-    headers = {"Content-Type": "application/json"}
-    payload = {
-        "messages": [
-            {"role": "system", "content": prompt},
-            {"role": "user", "content": f"[기사]\n{user_input}"}
-        ],
-        "temperature": 0.1,
-        "max_tokens": 10,
-        "stream": False
-    }
-
-    try:
-        response = requests.post(
-            "http://localhost:1234/v1/chat/completions",
-            headers=headers,
-            json=payload,
-            timeout=30
-        )
-        result = response.json()
-        return result['choices'][0]['message']['content'].strip()
-    except Exception as e:
-        return "0"
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from daconprompt.bitset import CorrectnessMatrix
+from daconprompt.client import LLMClient
+from daconprompt.early_stop import EarlyStopper
+from daconprompt.engine import EvaluationEngine
+from daconprompt.results_store import DEFAULT_RESULTS_DB, ResultsStore
+
+# LM Studio API 호출 - 공용 keep-alive 클라이언트 (샘플은 엔진이 평가, 요청 실패는 채점 제외)
+llm = LLMClient(timeout=30, verbose=False)
 
 def calculate_dacon_score(accuracy: float, prompt_length: int) -> float:
     """Dacon 점수 계산"""
@@ -104,74 +89,62 @@ B=정책·무역·ESS·UAM·항공·철도·조선
 모호→0"""
 }
 
-def test_full():
-    """전체 샘플 테스트"""
+def test_full(concurrency: int = 4, early_stop: bool = False, confidence: float = None):
+    """전체 샘플 테스트 (샘플은 엔진으로 동시 요청)
+
+    early_stop: 현재 1위 점수를 넘을 수 없게 된 프롬프트는 남은 샘플 생략
+    confidence: 조기 중단을 신뢰상한 기준으로 판정 (예: 0.95)
+    """
     df = pd.read_csv('data/samples.csv')
+    engine = EvaluationEngine(llm, concurrency=concurrency, verbose=False)
 
     print(f"Qwen2.5-7B 전체 테스트")
     print(f"샘플: {len(df)}개 (자동차 {df['label'].sum()}, 비자동차 {len(df) - df['label'].sum()})")
+    print(f"동시 요청: {concurrency}개")
     print("=" * 70)
 
     results = []
+    incumbent = None
+    calls_saved = 0
 
     for name, prompt in prompts.items():
         print(f"\n[{name}]")
         print(f"프롬프트 길이: {len(prompt)}자")
 
-        correct = 0
-        detailed_results = []
-
-        start_time = time.time()
-
-        for idx, row in df.iterrows():
-            user_input = f"제목: {row['title']}\n본문: {row['content']}"
-            response = call_lm_studio(prompt, user_input)
-
-            predicted = 1 if "1" in response[:10] else 0
-            actual = row['label']
-            is_correct = predicted == actual
-
-            if is_correct:
-                correct += 1
-
-            detailed_results.append({
-                'id': row.get('ID', row.get('id', idx)),
-                'title': row['title'][:50],
-                'predicted': predicted,
-                'actual': actual,
-                'correct': is_correct,
-                'response': response[:20]
-            })
+        stopper = EarlyStopper(len(df), len(prompt), incumbent, confidence) if early_stop else None
+        result = engine.evaluate_prompt(name, prompt, df, stopper)
+        detailed_results = result['detailed_results']
+        print(f"  소요: {result['elapsed']:.1f}초")
 
-            # 진행 표시
-            if (idx + 1) % 10 == 0:
-                elapsed = time.time() - start_time
-                print(f"  진행: {idx+1}/{len(df)} ({elapsed:.1f}초)")
-
-        accuracy = correct / len(df)
-        dacon_score = calculate_dacon_score(accuracy, len(prompt))
+        if result.get('stopped_early'):
+            calls_saved += result['calls_saved']
+            results.append(result)
+            print(f"  조기 중단: {result['total']}/{len(df)}개 평가 후 1위({incumbent:.4f}) 추월 불가 "
+                  f"(최대 {result['upper_bound']:.4f}, {result['calls_saved']}회 절약)")
+            continue
+        if early_stop:
+            incumbent = max(incumbent or 0.0, result['dacon_score'])
 
         # 오류 분석
         fp = sum(1 for r in detailed_results if not r['correct'] and r['actual'] == 0)
         fn = sum(1 for r in detailed_results if not r['correct'] and r['actual'] == 1)
 
-        results.append({
-            'name': name,
-            'accuracy': accuracy,
-            'dacon_score': dacon_score,
-            'correct': correct,
-            'total': len(df),
-            'length': len(prompt),
+        result.update({
             'false_positives': fp,
-            'false_negatives': fn,
-            'detailed_results': detailed_results
+            'false_negatives': fn
         })
+        results.append(result)
 
         print(f"\n결과:")
-        print(f"  정확도: {accuracy:.2%} ({correct}/{len(df)})")
-        print(f"  예상 Dacon 점수: {dacon_score:.4f}")
+        print(f"  정확도: {result['accuracy']:.2%} ({result['correct']}/{result['total']})")
+        if result.get('failed'):
+            print(f"  요청 실패: {len(result['failed'])}건 (채점 제외)")
+        print(f"  예상 Dacon 점수: {result['dacon_score']:.4f}")
         print(f"  오류: FP={fp} (0→1), FN={fn} (1→0)")
 
+    if early_stop:
+        print(f"\n조기 중단으로 절약한 호출: {calls_saved}/{len(df) * len(prompts)}회")
+
     return results
 
 def analyze_final(results):
@@ -180,8 +153,9 @@ def analyze_final(results):
     print("최종 결과 분석")
     print("=" * 70)
 
-    # Dacon 점수 순 정렬
-    sorted_results = sorted(results, key=lambda x: x['dacon_score'], reverse=True)
+    # Dacon 점수 순 정렬 (조기 중단된 프롬프트는 일부 샘플 점수라 순위에서 제외)
+    complete = [r for r in results if not r.get('stopped_early')]
+    sorted_results = sorted(complete, key=lambda x: x['dacon_score'], reverse=True)
 
     print("\n[Dacon 점수 순위]")
     for i, r in enumerate(sorted_results, 1):
@@ -190,43 +164,36 @@ def analyze_final(results):
         print(f"   Dacon 점수: {r['dacon_score']:.4f}")
         print(f"   프롬프트 길이: {r['length']}자")
         print(f"   오류: FP={r['false_positives']}, FN={r['false_negatives']}")
+    for r in results:
+        if r.get('stopped_early'):
+            print(f"-. {r['name']} - 조기 중단 ({r['total']}개 샘플만 평가, 최대 {r['upper_bound']:.4f})")
 
     best = sorted_results[0]
 
-    # 샘플별 분석
-    all_results = {}
-    for r in results:
-        for d in r['detailed_results']:
-            sid = d['id']
-            if sid not in all_results:
-                all_results[sid] = {
-                    'title': d['title'],
-                    'actual': d['actual'],
-                    'correct_count': 0,
-                    'predictions': []
-                }
-            all_results[sid]['predictions'].append({
-                'prompt': r['name'],
-                'predicted': d['predicted'],
-                'correct': d['correct']
-            })
-            if d['correct']:
-                all_results[sid]['correct_count'] += 1
+    # 샘플별 분석 (조기 중단된 프롬프트는 일부 샘플만 있으므로 제외)
+    matrix = CorrectnessMatrix.from_results(complete)
+    samples = {str(d['id']): d for r in complete for d in r['detailed_results']}
 
     # 어려운 샘플 찾기
-    hard_samples = [k for k, v in all_results.items() if v['correct_count'] == 0]
-    easy_samples = [k for k, v in all_results.items() if v['correct_count'] == len(results)]
+    hard_samples = matrix.ids(matrix.failure_intersection())
+    easy_samples = matrix.ids(matrix.success_intersection())
 
     print(f"\n[샘플 난이도 분석]")
-    print(f"모든 프롬프트가 맞춘 샘플: {len(easy_samples)}/{len(all_results)}")
-    print(f"모든 프롬프트가 틀린 샘플: {len(hard_samples)}/{len(all_results)}")
+    print(f"모든 프롬프트가 맞춘 샘플: {len(easy_samples)}/{matrix.n_samples}")
+    print(f"모든 프롬프트가 틀린 샘플: {len(hard_samples)}/{matrix.n_samples}")
 
     if hard_samples:
         print("\n[가장 어려운 샘플]")
         for sid in hard_samples[:3]:
-            sample = all_results[sid]
+            sample = samples[sid]
             print(f"  {sid}: {sample['title']}... (정답={sample['actual']})")
 
+    pairs = matrix.complementary_pairs(top=3)
+    if pairs:
+        print("\n[상호보완 프롬프트 쌍] (둘 중 하나라도 맞춘 샘플 수)")
+        for a, b, covered, both_wrong in pairs:
+            print(f"  {a} + {b}: {covered}/{matrix.n_samples} (함께 틀림 {both_wrong}개)")
+
     # 최종 추천
     print("\n" + "=" * 70)
     print("최종 추천")
@@ -246,11 +213,11 @@ def analyze_final(results):
 
 def save_final_results(results, best):
     """최종 결과 저장"""
-    timestamp = time.strftime("%Y%m%d_%H%M%S")
-
-    # 전체 결과 저장
-    with open(f'results/qwen_final_results_{timestamp}.json', 'w', encoding='utf-8') as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
+    # 전체 결과 저장 (실행·프롬프트·샘플 단위 결과 저장소, 조기 중단 결과는 partial 로 표시)
+    store = ResultsStore()
+    run_id = store.start_run('qwen_full_test', llm.model)
+    store.add_results(run_id, results, prompts)
+    store.close()
 
     # 최고 프롬프트 저장
     with open('prompts/generated/best_qwen_prompt.txt', 'w', encoding='utf-8') as f:
@@ -266,7 +233,7 @@ def save_final_results(results, best):
         f.write(f"GPT-4o mini와 유사한 성능 기대\n")
 
     print(f"\n결과 저장 완료:")
-    print(f"  - results/qwen_final_results_{timestamp}.json")
+    print(f"  - {DEFAULT_RESULTS_DB} (run {run_id})")
     print(f"  - prompts/generated/best_qwen_prompt.txt")
 
 if __name__ == "__main__":
@@ -274,8 +241,14 @@ if __name__ == "__main__":
     print("Qwen2.5-7B 전체 샘플 최종 테스트")
     print("=" * 70)
 
+    parser = argparse.ArgumentParser()
+    parser.add_argument("concurrency", nargs="?", type=int, default=4, help="동시 요청 수")
+    parser.add_argument("--early-stop", action="store_true", help="1위 추월 불가 프롬프트 조기 중단")
+    parser.add_argument("--confidence", type=float, default=None, help="신뢰상한 기반 조기 중단 (예: 0.95)")
+    args = parser.parse_args()
+
     # 전체 테스트
-    results = test_full()
+    results = test_full(args.concurrency, early_stop=args.early_stop, confidence=args.confidence)
 
     # 최종 분석
     best = analyze_final(results)
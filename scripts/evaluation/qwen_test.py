@@ -3,37 +3,19 @@ Qwen2.5-7B-Instruct 모델로 프롬프트 테스트
 GPT-4o mini와 유사한 성능 기대
 """
 
+import sys
+from pathlib import Path
 import pandas as pd
-import requests
 import json
 import time
 import math
 
-def call_lm_studio(prompt: str, user_input: str) -> str:
-    """LM Studio API 호출 - Qwen2.5-7B"""
-    headers = {"Content-Type": "application/json"}
-    payload = {
-        "messages": [
-            {"role": "system", "content": prompt},
-            {"role": "user", "content": f"[기사]\n{user_input}"}
-        ],
-        "temperature": 0.1,
-        "max_tokens": 10,
-        "stream": False
-    }
-
-    try:
-        response = requests.post(
-            "http://localhost:1234/v1/chat/completions",
-            headers=headers,
-            json=payload,
-            timeout=30
-        )
-        result = response.json()
-        return result['choices'][0]['message']['content'].strip()
-    except Exception as e:
-        print(f"    API 에러: {e}")
-        return "0"
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from daconprompt.cache import ResponseCache
+from daconprompt.client import LLMClient
+
+# LM Studio API 호출 - 공용 keep-alive 클라이언트 + 응답 캐시 (results/cache)
+client = LLMClient(timeout=30, cache=ResponseCache())
 
 def calculate_dacon_score(accuracy: float, prompt_length: int) -> float:
     """Dacon 점수 계산"""
@@ -149,12 +131,19 @@ def test_qwen():
         correct = 0
         errors = []
         predictions = []
+        failed = []  # 요청 실패 샘플 (채점 제외)
 
         start_time = time.time()
 
         for idx, row in df_test.iterrows():
             user_input = f"제목: {row['title']}\n본문: {row['content']}"
-            response = call_lm_studio(prompt, user_input)
+            try:
+                response = client.complete(prompt, user_input)
+            except Exception as e:
+                print(f"\n  [!] {idx+1:2}: 요청 실패 - {e}")
+                failed.append({'id': row.get('ID', row.get('id', idx)), 'title': row['title'][:40],
+                               'actual': row['label'], 'error': f"{type(e).__name__}: {e}"[:200]})
+                continue
 
             # 예측값 추출
             predicted = 1 if "1" in response[:10] else 0
@@ -172,6 +161,7 @@ def test_qwen():
                 })
 
             predictions.append({
+                'id': row.get('ID', row.get('id', idx)),
                 'predicted': predicted,
                 'actual': actual,
                 'correct': is_correct
@@ -184,7 +174,8 @@ def test_qwen():
                 print()
 
         elapsed = time.time() - start_time
-        accuracy = correct / len(df_test)
+        answered = len(df_test) - len(failed)
+        accuracy = correct / answered if answered else 0.0
         dacon_score = calculate_dacon_score(accuracy, len(prompt))
 
         results.append({
@@ -192,14 +183,17 @@ def test_qwen():
             'accuracy': accuracy,
             'dacon_score': dacon_score,
             'correct': correct,
-            'total': len(df_test),
+            'total': answered,
             'length': len(prompt),
             'time': elapsed,
             'errors': errors,
-            'predictions': predictions
+            'predictions': predictions,
+            'failed': failed
         })
 
-        print(f"\n  정확도: {accuracy:.1%} ({correct}/{len(df_test)})")
+        print(f"\n  정확도: {accuracy:.1%} ({correct}/{answered})")
+        if failed:
+            print(f"  요청 실패: {len(failed)}건 (채점 제외)")
         print(f"  예상 Dacon 점수: {dacon_score:.4f}")
         print(f"  소요 시간: {elapsed:.1f}초")
 
@@ -252,12 +246,12 @@ def analyze_results(results):
     # 샘플별 성공률
     sample_success = {}
     for r in results:
-        for i, p in enumerate(r['predictions']):
-            if i not in sample_success:
-                sample_success[i] = {'correct': 0, 'total': 0}
-            sample_success[i]['total'] += 1
+        for p in r['predictions']:  # 요청 실패 샘플은 predictions 에 없음
+            if p['id'] not in sample_success:
+                sample_success[p['id']] = {'correct': 0, 'total': 0}
+            sample_success[p['id']]['total'] += 1
             if p['correct']:
-                sample_success[i]['correct'] += 1
+                sample_success[p['id']]['correct'] += 1
 
     all_correct = sum(1 for v in sample_success.values() if v['correct'] == v['total'])
     all_wrong = sum(1 for v in sample_success.values() if v['correct'] == 0)
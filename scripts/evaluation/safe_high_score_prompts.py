@@ -3,36 +3,19 @@
 김경태 원본의 핵심 유지 + 과적합 방지
 """
 
+import sys
+from pathlib import Path
 import pandas as pd
-import requests
 import json
 import time
 import math
 
-def call_lm_studio(prompt: str, user_input: str) -> str:
-    """LM Studio API 호출"""
-    headers = {"Content-Type": "application/json"}
-    payload = {
-        "messages": [
-            {"role": "system", "content": prompt},
-            {"role": "user", "content": f"[기사]\n{user_input}"}
-        ],
-        "temperature": 0.1,
-        "max_tokens": 10,
-        "stream": False
-    }
-
-    try:
-        response = requests.post(
-            "http://localhost:1234/v1/chat/completions",
-            headers=headers,
-            json=payload,
-            timeout=30
-        )
-        result = response.json()
-        return result['choices'][0]['message']['content'].strip()
-    except:
-        return "0"
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from daconprompt.client import LLMClient
+from daconprompt.early_stop import EarlyStopper
+
+# LM Studio API 호출 - 공용 keep-alive 클라이언트
+client = LLMClient(timeout=30, verbose=False)
 
 def calculate_dacon_score(accuracy: float, prompt_length: int) -> float:
     """Dacon 점수 계산"""
@@ -143,8 +126,12 @@ Act={출시,양산,판매,수주,계약,공급,생산,증산,감산,투자,인
 판정:total이3이상이고(OEM/차종/차량용/규제인증중하나또는A와Act동시)일때만1,나머지0"""
 }
 
-def test_safe_prompts():
-    """안전한 프롬프트 테스트"""
+def test_safe_prompts(early_stop: bool = False, confidence: float = None):
+    """안전한 프롬프트 테스트
+
+    early_stop: 남은 샘플을 모두 맞혀도 현재 1위를 넘을 수 없으면 해당 프롬프트 중단
+    confidence: 조기 중단을 신뢰상한 기준으로 판정 (예: 0.95)
+    """
     df = pd.read_csv('data/samples.csv')
 
     print("0.98+ 목표 안전한 프롬프트 테스트")
@@ -152,6 +139,8 @@ def test_safe_prompts():
     print("=" * 70)
 
     results = []
+    incumbent = None
+    calls_saved = 0
 
     for name, prompt in prompts.items():
         print(f"\n[{name}]")
@@ -159,12 +148,22 @@ def test_safe_prompts():
 
         correct = 0
         errors = []
+        failed = []  # 요청 실패 샘플 (채점 제외)
+        stopper = EarlyStopper(len(df), len(prompt), incumbent, confidence) if early_stop else None
 
         start_time = time.time()
 
         for idx, row in df.iterrows():
             user_input = f"제목: {row['title']}\n본문: {row['content']}"
-            response = call_lm_studio(prompt, user_input)
+            try:
+                response = client.complete(prompt, user_input)
+            except Exception as e:
+                print(f"  [!] {idx+1}: 요청 실패 - {e}")
+                failed.append({'id': row.get('ID', idx), 'title': row['title'][:40], 'actual': row['label'],
+                               'error': f"{type(e).__name__}: {e}"[:200]})
+                if stopper:
+                    stopper.record_failure()
+                continue
 
             predicted = 1 if "1" in response[:10] else 0
             actual = row['label']
@@ -182,8 +181,20 @@ def test_safe_prompts():
             if (idx + 1) % 10 == 0:
                 print(f"  진행: {idx+1}/{len(df)}")
 
-        accuracy = correct / len(df)
+            if stopper and stopper.update(predicted == actual):
+                break
+
+        if stopper and stopper.stopped:
+            calls_saved += stopper.calls_saved
+            print(f"  조기 중단: {stopper.done}/{len(df)}개 평가 후 1위({incumbent:.4f}) 추월 불가 "
+                  f"(최대 {stopper.upper_bound:.4f}, {stopper.calls_saved}회 절약)")
+            continue
+
+        answered = len(df) - len(failed)
+        accuracy = correct / answered if answered else 0.0
         dacon_score = calculate_dacon_score(accuracy, len(prompt))
+        if early_stop:
+            incumbent = max(incumbent or 0.0, dacon_score)
 
         # 오류 유형 분석
         fp = sum(1 for e in errors if e['actual'] == 0)
@@ -195,20 +206,26 @@ def test_safe_prompts():
             'dacon_score': dacon_score,
             'length': len(prompt),
             'correct': correct,
-            'total': len(df),
+            'total': answered,
             'false_positives': fp,
             'false_negatives': fn,
-            'errors': errors
+            'errors': errors,
+            'failed': failed
         })
 
         print(f"\n결과:")
-        print(f"  정확도: {accuracy:.2%} ({correct}/{len(df)})")
+        print(f"  정확도: {accuracy:.2%} ({correct}/{answered})")
+        if failed:
+            print(f"  요청 실패: {len(failed)}건 (채점 제외)")
         print(f"  예상 Dacon 점수: {dacon_score:.4f}")
         print(f"  오류: FP={fp}, FN={fn}")
 
         elapsed = time.time() - start_time
         print(f"  소요시간: {elapsed:.1f}초")
 
+    if early_stop:
+        print(f"\n조기 중단으로 절약한 호출: {calls_saved}/{len(df) * len(prompts)}회")
+
     return results
 
 def analyze_safety(results):
@@ -285,8 +302,9 @@ def save_recommendations(results):
     print("\n결과 저장: docs/recommendations/final_safe_recommendations.md")
 
 if __name__ == "__main__":
-    # 테스트
-    results = test_safe_prompts()
+    # 테스트 (--early-stop: 1위 추월 불가 프롬프트 조기 중단, --confidence 0.95: 신뢰상한 기준)
+    confidence = float(sys.argv[sys.argv.index('--confidence') + 1]) if '--confidence' in sys.argv else None
+    results = test_safe_prompts(early_stop='--early-stop' in sys.argv, confidence=confidence)
 
     # 분석
     analyze_safety(results)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+선언형 규칙(rules/*.json) 시뮬레이션
+LLM 호출 없이 규칙 파일만으로 샘플 정확도와 오분류를 확인
+
+사용법:
+  python scripts/evaluation/simulate_rules.py rules/v3.6.json [rules/v1.3.json ...]
+  python scripts/evaluation/simulate_rules.py rules/kimgyeongtae_gate.json --csv data/samples.csv --verbose
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from daconprompt.rules import load_rules
+
+
+def simulate(path: str, samples, verbose: bool = False):
+    """규칙 파일 1개 평가 결과 출력"""
+    classifier = load_rules(path)
+
+    start = time.time()
+    result = classifier.evaluate(samples)
+    elapsed = time.time() - start
+
+    print(f"\n📋 {classifier.name} ({path})")
+    print(f"  정확도: {result['accuracy']:.1%} ({result['correct']}/{result['total']})")
+    print(f"  소요: {elapsed * 1000:.1f}ms")
+
+    errors = [(s, p) for s, p in zip(samples, result['predictions']) if p != int(s['label'])]
+    fn = sum(1 for s, _ in errors if int(s['label']) == 1)
+    print(f"  FN: {fn}개, FP: {len(errors) - fn}개")
+
+    if verbose:
+        for sample, predicted in errors:
+            _, reason, _ = classifier.explain(sample['title'], sample['content'])
+            print(f"    [{sample.get('ID', '')}] 실제 {sample['label']} / 예측 {predicted} "
+                  f"({reason}) {sample['title'][:40]}")
+
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="규칙 파일 샘플 시뮬레이션")
+    parser.add_argument("rules", nargs="+", help="규칙 JSON 경로")
+    parser.add_argument("--csv", default="data/samples.csv", help="샘플 CSV (title/content/label)")
+    parser.add_argument("--verbose", action="store_true", help="오분류 샘플과 판정 근거 출력")
+    args = parser.parse_args()
+
+    samples = pd.read_csv(args.csv).to_dict('records')
+    print(f"샘플 {len(samples)}개")
+
+    results = [simulate(path, samples, args.verbose) for path in args.rules]
+
+    if len(results) > 1:
+        print("\n🏆 정확도 순위:")
+        for rank, result in enumerate(sorted(results, key=lambda r: r['accuracy'], reverse=True), 1):
+            print(f"  {rank}. {result['name']}: {result['accuracy']:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+일괄(K건/요청) 분류 처리량 vs 정확도 측정
+같은 프롬프트를 K=1,2,4,8 로 평가해 소요 시간·요청 수·정확도·단건 재시도 수와
+K=1 대비 예측 일치율을 비교 (응답 캐시 미사용)
+
+사용법:
+  python scripts/experiments/batch_classification_benchmark.py
+  python scripts/experiments/batch_classification_benchmark.py --sizes 1,4,8,16 --prompt M12_축약스코어링 --concurrency 2
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "evaluation"))
+from daconprompt.client import DEFAULT_ENDPOINT, LLMClient
+from daconprompt.engine import EvaluationEngine
+
+
+def main():
+    parser = argparse.ArgumentParser(description="일괄 분류 처리량/정확도 측정")
+    parser.add_argument("--endpoint", default=DEFAULT_ENDPOINT)
+    parser.add_argument("--csv", default="data/samples.csv")
+    parser.add_argument("--prompt", default="김경태_원본", help="local_llm_evaluation 프롬프트 이름")
+    parser.add_argument("--sizes", default="1,2,4,8", help="기사 수/요청 목록")
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    from local_llm_evaluation import PROMPTS_TO_TEST
+    df = pd.read_csv(args.csv)
+    prompt_text = PROMPTS_TO_TEST[args.prompt]
+    sizes = [int(k) for k in args.sizes.split(",")]
+    print(f"{args.prompt} ({len(prompt_text)}자) × 샘플 {len(df)}개, 동시 {args.concurrency}")
+
+    rows = []
+    baseline = None
+    for k in sizes:
+        engine = EvaluationEngine(LLMClient(args.endpoint, verbose=False), concurrency=args.concurrency,
+                                  verbose=False, batch_size=k)
+        start = time.time()
+        result = engine.evaluate_prompt(args.prompt, prompt_text, df)
+        elapsed = time.time() - start
+
+        predictions = [r['predicted'] for r in result['detailed_results']]
+        if baseline is None:
+            baseline = predictions
+        stats = engine.batch_stats
+        requests = (stats['requests'] + (len(df) - stats['articles']) + stats['fallbacks']
+                    if k > 1 else len(df))
+        rows.append({
+            'K': k,
+            '요청 수': requests,
+            '소요(초)': round(elapsed, 2),
+            '기사/초': round(len(df) / elapsed, 2),
+            '정확도': f"{result['accuracy']:.2%}",
+            '재시도': stats['fallbacks'],
+            'K=1 일치율': f"{sum(a == b for a, b in zip(predictions, baseline)) / len(df):.2%}",
+        })
+        print(f"  K={k}: {elapsed:.1f}초, 정확도 {result['accuracy']:.2%}, 재시도 {stats['fallbacks']}건")
+
+    print()
+    print(pd.DataFrame(rows).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+평가 파이프라인 벤치마크 (규칙 분류기 / LLM 클라이언트 / 결과 저장소)
+LLM 은 프로세스 안 모의 서버를 쓰므로 GPU·LM Studio 불필요
+결과는 results/benchmark_<timestamp>.json, --compare 로 이전 결과 대비 회귀 확인
+
+사용법:
+  python scripts/experiments/benchmark_suite.py
+  python scripts/experiments/benchmark_suite.py --quick
+  python scripts/experiments/benchmark_suite.py --scale 50 --concurrency 1,4,16,32 --latency lognormal:0.02,0.5
+  python scripts/experiments/benchmark_suite.py --compare results/benchmark_20250920_101500.json
+"""
+
+import argparse
+import glob
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from daconprompt.benchmark import compare, run_suite
+
+
+def main():
+    parser = argparse.ArgumentParser(description="평가 파이프라인 벤치마크")
+    parser.add_argument("--csv", default="data/samples.csv")
+    parser.add_argument("--rules", nargs="+", default=None, help="규칙 JSON (기본: rules/*.json)")
+    parser.add_argument("--scale", type=int, default=20, help="규칙 벤치마크 샘플 배수")
+    parser.add_argument("--concurrency", default="1,2,4,8,16", help="클라이언트 동시 수준 목록")
+    parser.add_argument("--latency", default="fixed:0.02", help="모의 서버 지연 분포")
+    parser.add_argument("--requests", type=int, default=200, help="동시 수준별 요청 수")
+    parser.add_argument("--quick", action="store_true", help="작은 규모로 빠르게 (변경 확인용)")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: results/benchmark_<timestamp>.json)")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="이 비율 이상 느려지면 회귀로 표시")
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.csv)
+    rule_paths = args.rules or sorted(glob.glob("rules/*.json"))
+    levels = [int(c) for c in args.concurrency.split(",")]
+    if args.quick:
+        args.scale, args.requests, levels = 2, 46, levels[:3]
+
+    report = run_suite(df, rule_paths, scale=args.scale, concurrency_levels=levels, latency=args.latency,
+                       client_samples=args.requests, store_size=(5, 200) if args.quick else (20, 500))
+
+    print("\n규칙 분류기 (기사/초)")
+    print(pd.DataFrame(report['rules']).round(1).to_string(index=False))
+    print("\nLLM 클라이언트")
+    print(pd.DataFrame(report['client']).round(2).to_string(index=False))
+    print("\n결과 저장소 (행/초)")
+    print(pd.Series(report['store']).round(1).to_string())
+
+    output = args.output or f"results/benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        table = compare(report, baseline, args.tolerance)
+        print(f"\n비교: {args.compare} (revision {baseline['meta'].get('revision')})")
+        print(table.round(3).to_string(index=False))
+        regressions = table[table['regression']]
+        if len(regressions):
+            print(f"\n⚠️ 회귀 {len(regressions)}개: {', '.join(regressions['metric'])}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+프롬프트 자동 압축
+줄/항목/괄호 삭제와 축약 치환 후보를 LLM 으로 채점하며 빔 서치 → 같은 정확도의 더 짧은 프롬프트 탐색
+응답 캐시(results/cache)를 쓰므로 같은 후보를 다시 돌려도 서버 호출 없음
+
+사용법:
+  python scripts/experiments/compress_prompt.py                                  # 김경태_원본
+  python scripts/experiments/compress_prompt.py --file prompts/versions/v3.2_COMPRESSED.txt --budget 100
+  python scripts/experiments/compress_prompt.py --beam 6 --max-drop 0.022 --concurrency 4
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "evaluation"))
+from daconprompt.cache import ResponseCache
+from daconprompt.client import LLMClient
+from daconprompt.compression import PromptCompressor, engine_evaluator
+from daconprompt.engine import EvaluationEngine
+
+
+def load_prompt(args) -> str:
+    """--file 본문 또는 local_llm_evaluation.PROMPTS_TO_TEST[--name]"""
+    if args.file:
+        return Path(args.file).read_text(encoding="utf-8").strip()
+    from local_llm_evaluation import PROMPTS_TO_TEST
+    return PROMPTS_TO_TEST[args.name]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="프롬프트 길이-점수 빔 서치 압축")
+    parser.add_argument("--file", help="압축할 프롬프트 파일")
+    parser.add_argument("--name", default="김경태_원본", help="--file 없을 때 local_llm_evaluation 프롬프트 이름")
+    parser.add_argument("--csv", default="data/samples.csv")
+    parser.add_argument("--endpoint", default=None, help="LLM 엔드포인트 (기본: DACON_LLM_ENDPOINT)")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--beam", type=int, default=4, help="빔 폭")
+    parser.add_argument("--budget", type=int, default=60, help="최대 평가 프롬프트 수 (원문 포함)")
+    parser.add_argument("--per-round", type=int, default=None, help="라운드당 평가 수 (기본: 빔×4)")
+    parser.add_argument("--max-drop", type=float, default=0.0, help="허용 정확도 하락")
+    parser.add_argument("--patience", type=int, default=1)
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.csv)
+    text = load_prompt(args)
+
+    client = LLMClient(**({"endpoint": args.endpoint} if args.endpoint else {}),
+                       verbose=False, cache=ResponseCache())
+    engine = EvaluationEngine(client, concurrency=args.concurrency, verbose=False)
+    compressor = PromptCompressor(engine_evaluator(engine, df), beam_width=args.beam,
+                                  budget=args.budget, per_round=args.per_round,
+                                  max_accuracy_drop=args.max_drop, patience=args.patience)
+
+    start = time.time()
+    result = compressor.search(text)
+    elapsed = time.time() - start
+    print(f"\n평가 {result['evaluations']}개 / {result['rounds']}라운드 ({elapsed:.1f}초, "
+          f"캐시 적중 {client.cache.hits}회)")
+
+    original, best = result['original'], result['best']
+    print(f"\n🏆 최고: {original['length']}자 → {best['length']}자, "
+          f"정확도 {original['accuracy']:.2%} → {best['accuracy']:.2%}, "
+          f"점수 {original['score']:.4f} → {best['score']:.4f}")
+    for edit in best['edits']:
+        print(f"  {edit}")
+    print("-" * 60)
+    print(best['text'])
+    print("-" * 60)
+
+    print("\n📈 길이 vs 정확도 프런트:")
+    for candidate in result['front']:
+        print(f"  {candidate['length']}자  정확도 {candidate['accuracy']:.2%}  점수 {candidate['score']:.4f}")
+
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
+    output = f'results/compression_{timestamp}.json'
+    Path('results').mkdir(exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({key: result[key] for key in ('original', 'best', 'front', 'evaluations', 'rounds')},
+                  f, ensure_ascii=False, indent=2)
+    print(f"\n💾 {output}")
+
+
+if __name__ == "__main__":
+    main()
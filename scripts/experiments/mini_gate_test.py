@@ -2,36 +2,18 @@
 게이트 조건 프롬프트 - 샘플 20개만 빠른 테스트
 """
 
+import sys
+from pathlib import Path
 import pandas as pd
-import requests
 import json
 import time
 import math
 
-def call_lm_studio(prompt: str, user_input: str) -> str:
-    """LM Studio API 호출"""
-    headers = {"Content-Type": "application/json"}
-    payload = {
-        "messages": [
-            {"role": "system", "content": prompt},
-            {"role": "user", "content": f"[기사]\n{user_input}"}
-        ],
-        "temperature": 0.1,
-        "max_tokens": 10,
-        "stream": False
-    }
-
-    try:
-        response = requests.post(
-            "http://localhost:1234/v1/chat/completions",
-            headers=headers,
-            json=payload,
-            timeout=30
-        )
-        result = response.json()
-        return result['choices'][0]['message']['content'].strip()
-    except Exception as e:
-        return "0"
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from daconprompt.client import LLMClient
+
+# LM Studio API 호출 - 공용 keep-alive 클라이언트
+call_lm_studio = LLMClient(timeout=30, verbose=False).call
 
 # 가장 유망한 2개 프롬프트
 prompts = {
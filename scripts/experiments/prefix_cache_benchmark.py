@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+시스템 프롬프트 prefix 캐시 재사용 측정
+같은 프롬프트 × 샘플을 (1) 기존처럼 섞어서(interleaved), (2) 슬롯마다 프롬프트 하나씩
+연속으로(grouped, cache_prompt/id_slot 힌트) 보내고 첫 토큰 시간(TTFT)을 비교
+
+llama.cpp server 는 timings.cache_n 으로 재사용한 토큰 수를 돌려주므로 함께 출력
+
+사용법:
+  python scripts/experiments/prefix_cache_benchmark.py --endpoint http://localhost:8080/v1/chat/completions
+  python scripts/experiments/prefix_cache_benchmark.py --concurrency 4 --samples 20 --no-hints
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "evaluation"))
+from daconprompt.client import DEFAULT_ENDPOINT, LLMClient
+from daconprompt.engine import EvaluationEngine
+
+
+def summarize(label: str, timings, elapsed: float):
+    """TTFT 요약 출력 → 평균 TTFT 반환"""
+    ttft = sorted(t['ttft'] for t in timings)
+    if not ttft:
+        print(f"  {label:<12} 측정값 없음")
+        return None
+    p95 = ttft[min(len(ttft) - 1, int(len(ttft) * 0.95))]
+    cached = [t['cached_tokens'] for t in timings if t.get('cached_tokens') is not None]
+    prompt_tokens = [t['prompt_tokens'] for t in timings if t.get('prompt_tokens') is not None]
+    line = (f"  {label:<12} 요청 {len(ttft)}개, 총 {elapsed:.1f}초, TTFT 평균 {statistics.mean(ttft) * 1000:.0f}ms "
+            f"/ p50 {statistics.median(ttft) * 1000:.0f}ms / p95 {p95 * 1000:.0f}ms")
+    if cached:
+        line += f", 재사용 토큰 평균 {statistics.mean(cached):.0f}"
+    if prompt_tokens:
+        line += f", 새로 처리한 토큰 평균 {statistics.mean(prompt_tokens):.0f}"
+    print(line)
+    return statistics.mean(ttft)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="prefix 캐시 재사용 TTFT 측정")
+    parser.add_argument("--endpoint", default=DEFAULT_ENDPOINT)
+    parser.add_argument("--csv", default="data/samples.csv")
+    parser.add_argument("--samples", type=int, default=None, help="샘플 수 (기본: 전체)")
+    parser.add_argument("--concurrency", type=int, default=2, help="서버 parallel slot 수")
+    parser.add_argument("--no-hints", action="store_true", help="grouped 에서도 cache_prompt/id_slot 미전송")
+    args = parser.parse_args()
+
+    from local_llm_evaluation import PROMPTS_TO_TEST
+    df = pd.read_csv(args.csv)
+    if args.samples:
+        df = df.head(args.samples)
+    print(f"프롬프트 {len(PROMPTS_TO_TEST)}개 × 샘플 {len(df)}개, 슬롯 {args.concurrency}개")
+
+    runs = [
+        ("interleaved", LLMClient(args.endpoint, verbose=False)),
+        ("grouped", LLMClient(args.endpoint, verbose=False,
+                              cache_prompt=not args.no_hints, slot_hints=not args.no_hints)),
+    ]
+    means = {}
+    for ordering, client in runs:
+        engine = EvaluationEngine(client, concurrency=args.concurrency, verbose=False,
+                                  ordering=ordering, measure_ttft=True)
+        start = time.time()
+        engine.sweep(PROMPTS_TO_TEST, df)
+        means[ordering] = summarize(ordering, engine.timings, time.time() - start)
+
+    if means.get("interleaved") and means.get("grouped"):
+        saved = 1 - means["grouped"] / means["interleaved"]
+        print(f"\nTTFT 절감: {saved:.1%} (grouped vs interleaved)")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,41 +2,31 @@
 빠른 테스트 - 샘플 5개만 평가
 """
 
+import sys
+from pathlib import Path
 import pandas as pd
-import requests
 import json
 import time
+from typing import Optional
 
-def call_lm_studio(prompt: str, user_input: str) -> str:
-    """LM Studio API 호출"""
-    headers = {"Content-Type": "application/json"}
-    payload = {
-        "messages": [
-            {"role": "system", "content": prompt},
-            {"role": "user", "content": f"[기사]\n{user_input}"}
-        ],
-        "temperature": 0.1,
-        "max_tokens": 10,
-        "stream": False
-    }
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from daconprompt.client import LLMClient
 
+# 공용 keep-alive 클라이언트 (60초 타임아웃)
+llm = LLMClient(timeout=60)
+
+def call_lm_studio(prompt: str, user_input: str) -> Optional[str]:
+    """LM Studio API 호출 - 재시도까지 실패하면 None (채점 제외)"""
     try:
         print("    API 호출 중...", end='')
         start = time.time()
-        response = requests.post(
-            "http://localhost:1234/v1/chat/completions",
-            headers=headers,
-            json=payload,
-            timeout=60  # 60초 타임아웃
-        )
+        response = llm.complete(prompt, user_input)
         elapsed = time.time() - start
         print(f" {elapsed:.1f}초")
-
-        result = response.json()
-        return result['choices'][0]['message']['content'].strip()
+        return response
     except Exception as e:
         print(f"\n    에러: {e}")
-        return "0"
+        return None
 
 # 간단한 프롬프트
 prompt = """[역할] 자동차 뉴스 분류
@@ -50,12 +40,17 @@ print(f"샘플 데이터: {len(df)}개 중 5개만 테스트\n")
 
 # 처음 5개만 테스트
 correct = 0
+answered = 0
 for idx, row in df.head(5).iterrows():
     print(f"\nSample {idx+1}:")
     print(f"  제목: {row['title'][:50]}...")
 
     user_input = f"제목: {row['title']}\n본문: {row['content']}"
     response = call_lm_studio(prompt, user_input)
+    if response is None:
+        print("  [!] 요청 실패 - 채점 제외")
+        continue
+    answered += 1
 
     predicted = 1 if "1" in response[:10] else 0
     actual = row['label']
@@ -68,4 +63,7 @@ for idx, row in df.head(5).iterrows():
     if is_correct:
         correct += 1
 
-print(f"\n정확도: {correct}/5 = {correct/5:.0%}")
\ No newline at end of file
+if answered:
+    print(f"\n정확도: {correct}/{answered} = {correct/answered:.0%}")
+if answered < 5:
+    print(f"요청 실패: {5 - answered}건 (채점 제외)")
\ No newline at end of file
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+김경태 스코어링 가중치·임계값 탐색
+rules/kimgyeongtae_gate.json 의 가중치(+3/+2/+1/-3/-2...)와 total≥N 게이트를 일괄 채점해
+시뮬레이션 정확도 vs 프롬프트 길이 파레토 프런트를 출력 → 상위 몇 개만 LLM 검증
+
+사용법:
+  python scripts/experiments/search_rule_weights.py                  # 기존 가중치 ±1 격자
+  python scripts/experiments/search_rule_weights.py --span 2
+  python scripts/experiments/search_rule_weights.py --mode random --samples 200000 --seed 7
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from daconprompt.rules import load_spec
+from daconprompt.weight_search import WeightSearch, pareto_front
+
+
+def parse_range(text: str) -> range:
+    """"1-6" → range(1, 7)"""
+    low, _, high = text.partition("-")
+    return range(int(low), int(high or low) + 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="규칙 가중치/임계값 탐색")
+    parser.add_argument("--rules", default="rules/kimgyeongtae_gate.json", help="prompt 템플릿이 있는 규칙 JSON")
+    parser.add_argument("--csv", default="data/samples.csv")
+    parser.add_argument("--mode", choices=["grid", "random"], default="grid")
+    parser.add_argument("--span", type=int, default=1, help="격자: 기존 가중치 ±span")
+    parser.add_argument("--samples", type=int, default=100_000, help="무작위: 설정 수")
+    parser.add_argument("--max-weight", type=int, default=4, help="무작위: |가중치| 상한")
+    parser.add_argument("--thresholds", default="1-6", help="임계값 범위 (예: 1-6)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--top", type=int, default=10, help="Dacon 점수 상위 출력 수")
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.csv)
+    spec = load_spec(args.rules)
+    search = WeightSearch(spec, df['title'].tolist(), df['content'].tolist(), df['label'].tolist())
+    thresholds = parse_range(args.thresholds)
+
+    baseline = search.evaluate(search.base_weights, search.base_threshold)
+    print(f"기준: 정확도 {baseline['accuracy'][0]:.1%}, {baseline['length'][0]}자, "
+          f"점수 {baseline['dacon_score'][0]:.4f}")
+
+    start = time.time()
+    if args.mode == "grid":
+        result = search.grid(thresholds=thresholds, span=args.span)
+    else:
+        result = search.random(args.samples, -args.max_weight, args.max_weight,
+                               thresholds=thresholds, seed=args.seed)
+    elapsed = time.time() - start
+    print(f"{args.mode}: 설정 {len(result['accuracy']):,}개 채점 ({elapsed:.2f}초)")
+
+    front = pareto_front(result['accuracy'], result['length'])
+    print(f"\n📈 파레토 프런트 ({len(front)}개):")
+    for i in front:
+        config = search.describe(result, i)
+        print(f"  {config['length']}자  정확도 {config['accuracy']:.1%}  점수 {config['dacon_score']:.4f}  "
+              f"total≥{config['threshold']}  {list(config['weights'].values())}")
+
+    top = np.argsort(-result['dacon_score'], kind='stable')[:args.top]
+    print(f"\n🏆 Dacon 점수 상위 {len(top)}개:")
+    for rank, i in enumerate(top, 1):
+        config = search.describe(result, i)
+        print(f"  {rank}. 점수 {config['dacon_score']:.4f}  정확도 {config['accuracy']:.1%}  "
+              f"{config['length']}자  total≥{config['threshold']}  {list(config['weights'].values())}")
+
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
+    output = f'results/weight_search_{timestamp}.json'
+    Path('results').mkdir(exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'rules': args.rules,
+            'mode': args.mode,
+            'evaluated': int(len(result['accuracy'])),
+            'pareto_front': [search.describe(result, i) for i in front],
+            'top': [search.describe(result, i) for i in top]
+        }, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 {output}")
+
+
+if __name__ == "__main__":
+    main()
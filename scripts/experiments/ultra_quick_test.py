@@ -2,35 +2,17 @@
 초고속 테스트 - 10개 샘플만
 """
 
+import sys
+from pathlib import Path
 import pandas as pd
-import requests
 import json
 import time
 
-def call_lm_studio(prompt: str, user_input: str) -> str:
-    """LM Studio API 호출"""
-    headers = {"Content-Type": "application/json"}
-    payload = {
-        "messages": [
-            {"role": "system", "content": prompt},
-            {"role": "user", "content": f"[Article]\n{user_input}"}
-        ],
-        "temperature": 0.1,
-        "max_tokens": 10,
-        "stream": False
-    }
-
-    try:
-        response = requests.post(
-            "http://localhost:1234/v1/chat/completions",
-            headers=headers,
-            json=payload,
-            timeout=30
-        )
-        result = response.json()
-        return result['choices'][0]['message']['content'].strip()
-    except:
-        return "0"
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from daconprompt.client import LLMClient
+
+# LM Studio API 호출 - 공용 keep-alive 클라이언트
+call_lm_studio = LLMClient(timeout=30, user_prefix="[Article]\n", verbose=False).call
 
 # 가장 유망한 영어 프롬프트
 prompt = """Output "1" or "0" only.
@@ -7,12 +7,28 @@ import pandas as pd
 import json
 import re
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import math
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from daconprompt.incidence import VectorizedRules
+from daconprompt.rules import load_spec
 
 # 샘플 데이터 로드
 df = pd.read_csv('data/samples.csv')
 
+
+def build_simulator(df: pd.DataFrame) -> VectorizedRules:
+    """규칙 기반 근사 (rules/v2_500char_sim.json) - df 의 출현 행렬"""
+    return VectorizedRules(load_spec('rules/v2_500char_sim.json'),
+                           df['title'].tolist(), df['content'].tolist())
+
+
+# 출현 행렬을 한 번만 만들어 모든 프롬프트가 공유
+SIMULATOR = build_simulator(df)
+
 # 다양한 방법론을 적용한 500자 전후 프롬프트들
 PROMPTS_500 = {
     "M1_계층구조": """[역할] 자동차 뉴스 분류
@@ -324,42 +340,16 @@ def simulate_prompt_scoring(prompt_text: str) -> Dict:
         'has_vehicle_specific': '차량용' in prompt_text or '자동차용' in prompt_text
     }
 
-def evaluate_prompt(prompt_name: str, prompt_text: str, df: pd.DataFrame) -> Dict:
-    """프롬프트 평가"""
+def evaluate_prompt(prompt_name: str, prompt_text: str, df: pd.DataFrame,
+                    simulator: Optional[VectorizedRules] = None) -> Dict:
+    """프롬프트 평가 (simulator 는 같은 df 로 만든 것 - 없으면 df 로 새로 만듦)"""
     # 간단한 시뮬레이션 (실제로는 GPT-4o mini API 호출 필요)
     # 여기서는 규칙 기반으로 근사
 
-    correct = 0
-    predictions = []
-
-    for _, row in df.iterrows():
-        title = row['title']
-        content = row['content']
-        actual = row['label']
-
-        # 프롬프트 특성 기반 예측 시뮬레이션
-        text = f"{title} {content}"
-
-        # 핵심 키워드 기반 판정
-        score = 0
-
-        # 긍정 신호
-        if any(comp in text for comp in ['현대차', '기아', '테슬라', 'BMW', '도요타', 'BYD']):
-            score += 3
-        if any(act in text for act in ['출시', '양산', '생산', '판매', '수주']):
-            score += 2
-        if '차량용' in text or '자동차용' in text:
-            score += 2
-
-        # 부정 신호
-        if any(neg in text for neg in ['ESS', 'UAM', '항공', '철도', '조선']):
-            score -= 3
-
-        predicted = 1 if score >= 3 else 0
-        predictions.append(predicted)
-
-        if predicted == actual:
-            correct += 1
+    if simulator is None:
+        simulator = build_simulator(df)
+    predictions = simulator.predict().tolist()
+    correct = sum(1 for predicted, actual in zip(predictions, df['label']) if predicted == actual)
 
     accuracy = correct / len(df)
     prompt_length = len(prompt_text)
@@ -384,7 +374,7 @@ def main():
     print("=" * 60)
 
     for prompt_name, prompt_text in PROMPTS_500.items():
-        result = evaluate_prompt(prompt_name, prompt_text, df)
+        result = evaluate_prompt(prompt_name, prompt_text, df, SIMULATOR)
         results.append(result)
 
         print(f"\n{prompt_name}:")
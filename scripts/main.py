@@ -1,6 +1,16 @@
-def main():
-    print("Hello from daconprompt!")
+"""
+daconprompt 명령줄 도구 (설치 없이 저장소 루트에서 실행)
 
+사용법:
+  python scripts/main.py --help
+  python scripts/main.py simulate rules/v3.6.json
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from daconprompt.cli import main
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+모의 LLM 서버 실행 (GPU·LM Studio 없이 평가 스크립트·엔진 부하 테스트)
+LM Studio 와 같은 localhost:1234 에 띄우면 기존 스크립트를 그대로 돌릴 수 있음
+
+사용법:
+  python scripts/mock_llm_server.py                                   # :1234, 지연 없음, v3.6 규칙
+  python scripts/mock_llm_server.py --latency lognormal:0.3,0.5 --error-rate 0.05 --parallel 4
+  python scripts/mock_llm_server.py --port 8080 --rules rules/v1.3.json --seed 7
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from daconprompt.mock_server import DEFAULT_RULES, MockLLMServer
+from daconprompt.rules import load_rules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="모의 OpenAI 호환 LLM 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1234)
+    parser.add_argument("--rules", default=DEFAULT_RULES, help="라벨을 정할 규칙 JSON")
+    parser.add_argument("--latency", default="fixed:0",
+                        help="지연 분포 (fixed:S, uniform:A,B, normal:M,SD, lognormal:MEDIAN,SIGMA, exp:M)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="오류 응답 비율")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--parallel", type=int, default=4, help="동시 처리 슬롯 수")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = MockLLMServer(args.host, args.port, classifier=load_rules(args.rules),
+                           latency=args.latency, error_rate=args.error_rate,
+                           error_status=args.error_status, parallel=args.parallel, seed=args.seed)
+    print(f"모의 LLM 서버: {server.url} (Ollama: {server.ollama_url})")
+    print(f"  규칙 {args.rules}, 지연 {args.latency}, 오류 {args.error_rate:.1%}, 슬롯 {args.parallel}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        stats = server.stats
+        print(f"\n요청 {stats['requests']}건 (기사 {stats['articles']}건), 오류 응답 {stats['errors']}건")
+
+
+if __name__ == "__main__":
+    main()
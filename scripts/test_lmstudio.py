@@ -5,14 +5,20 @@ v1.3 프롬프트 성능 검증
 """
 
 import os
+import sys
 import csv
-import json
-import requests
 import time
 from datetime import datetime
-from typing import List, Dict, Tuple
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
 import math
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from daconprompt.checkpoint import DEFAULT_CHECKPOINT_DIR, Checkpoint
+from daconprompt.client import LLMClient
+from daconprompt.pool import EndpointPool
+from daconprompt.results_store import DEFAULT_RESULTS_DB, ResultsStore
+
 # LMStudio API 설정
 LMSTUDIO_API_KEY = "lm-studio"  # LMStudio 기본값
 LMSTUDIO_ENDPOINT = "http://203.234.62.45:1234/v1/chat/completions"
@@ -65,86 +71,76 @@ E)소재/부품: 자동차소재/차량부품/완성차납품→1, 건설/가전
 반드시 0또는1만 출력."""
 
 class LMStudioTester:
-    def __init__(self):
+    def __init__(self, constrain: Optional[str] = None, endpoints: Optional[str] = None):
         self.api_key = LMSTUDIO_API_KEY
         self.endpoint = LMSTUDIO_ENDPOINT
         self.results = []
+        self.failed = []  # 요청 실패 샘플 (채점 제외)
         self.test_start_time = None
-        
+        # 공용 keep-alive 클라이언트 (샘플마다 연결 재사용)
+        settings = dict(
+            model=MODEL_NAME,
+            temperature=0,
+            max_tokens=5,
+            user_prefix="",
+            api_key=self.api_key,
+            options={"stop": ["\n", " "]},
+            constrain=constrain  # grammar/logprobs: 0/1 한 토큰만 생성
+        )
+        # endpoints: 여러 서버 설정 파일 (daconprompt/pool.py 형식) - 오류 시 다른 서버로 넘김
+        self.client = (EndpointPool.from_config(endpoints, **settings) if endpoints
+                       else LLMClient(self.endpoint, **settings))
+
     def test_connection(self) -> bool:
-        """LMStudio 서버 연결 테스트"""
-        try:
-            response = requests.post(
-                self.endpoint,
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {self.api_key}"
-                },
-                json={
-                    "model": MODEL_NAME,
-                    "messages": [{"role": "user", "content": "테스트"}],
-                    "max_tokens": 1,
-                    "temperature": 0
-                },
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                print("✅ LMStudio 서버 연결 성공")
-                return True
-            else:
-                print(f"❌ LMStudio 서버 연결 실패: {response.status_code}")
-                print(f"응답: {response.text}")
-                return False
-                
-        except Exception as e:
-            print(f"❌ 연결 테스트 실패: {str(e)}")
-            return False
+        """LMStudio 서버 연결 테스트 (풀이면 한 서버라도 응답하면 성공)"""
+        clients = [m.client for m in self.client.members] if isinstance(self.client, EndpointPool) else [self.client]
+        connected = False
+        for client in clients:
+            try:
+                response = client.session.post(
+                    client.endpoint,
+                    headers=client.headers,
+                    json={
+                        "model": client.model,
+                        "messages": [{"role": "user", "content": "테스트"}],
+                        "max_tokens": 1,
+                        "temperature": 0
+                    },
+                    timeout=10
+                )
+
+                if response.status_code == 200:
+                    print(f"✅ LMStudio 서버 연결 성공: {client.endpoint}")
+                    connected = True
+                else:
+                    print(f"❌ LMStudio 서버 연결 실패: {client.endpoint} {response.status_code}")
+                    print(f"응답: {response.text}")
+
+            except Exception as e:
+                print(f"❌ 연결 테스트 실패: {client.endpoint} {str(e)}")
+        return connected
     
-    def classify_news(self, title: str, content: str) -> Tuple[str, str]:
-        """뉴스 분류 실행"""
+    def classify_news(self, title: str, content: str) -> Tuple[Optional[str], str]:
+        """뉴스 분류 실행 → (분류, 원본 출력) - 요청 실패 시 (None, 오류 내용)"""
         user_message = f"제목: {title}\n내용: {content}"
         
         try:
-            response = requests.post(
-                self.endpoint,
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {self.api_key}"
-                },
-                json={
-                    "model": MODEL_NAME,
-                    "messages": [
-                        {"role": "system", "content": SYSTEM_PROMPT},
-                        {"role": "user", "content": user_message}
-                    ],
-                    "max_tokens": 5,
-                    "temperature": 0,
-                    "stop": ["\n", " "]
-                },
-                timeout=30
-            )
+            raw_output = self.client.complete(SYSTEM_PROMPT, user_message)
             
-            if response.status_code == 200:
-                result = response.json()
-                raw_output = result["choices"][0]["message"]["content"].strip()
-                
-                # 0 또는 1 추출
-                if "1" in raw_output:
-                    classification = "1"
-                elif "0" in raw_output:
-                    classification = "0"
-                else:
-                    classification = "0"  # 보수적 접근
-                    
-                return classification, raw_output
+            # 0 또는 1 추출
+            if "1" in raw_output:
+                classification = "1"
+            elif "0" in raw_output:
+                classification = "0"
             else:
-                print(f"API 요청 실패: {response.status_code}")
-                return "0", "ERROR"
+                classification = "0"  # 보수적 접근
+                
+            return classification, raw_output
                 
         except Exception as e:
+            # 실패를 "0" 예측으로 채점하지 않도록 None 반환 (run_test 가 따로 기록)
             print(f"분류 실패: {str(e)}")
-            return "0", "ERROR"
+            return None, f"{type(e).__name__}: {e}"[:200]
     
     def load_samples(self, csv_path: str) -> List[Dict]:
         """data/samples.csv 로드"""
@@ -165,8 +161,8 @@ class LMStudioTester:
             print(f"❌ CSV 로드 실패: {str(e)}")
             return []
     
-    def run_test(self, samples: List[Dict]) -> Dict:
-        """전체 테스트 실행"""
+    def run_test(self, samples: List[Dict], checkpoint: Optional[Checkpoint] = None) -> Dict:
+        """전체 테스트 실행 (checkpoint 가 있으면 샘플마다 기록하고 완료된 샘플은 재사용)"""
         print(f"\n🚀 테스트 시작: {len(samples)}개 샘플")
         print("=" * 60)
         
@@ -175,12 +171,27 @@ class LMStudioTester:
         total = 0
         
         for i, sample in enumerate(samples):
+            # 이전 실행에서 끝난 샘플
+            result = checkpoint.get(MODEL_NAME, SYSTEM_PROMPT, sample['id']) if checkpoint is not None else None
+            if result is not None:
+                self.results.append(result)
+                correct += int(result['correct'])
+                total += 1
+                print(f"[{i+1:2d}/{len(samples)}] {sample['id']} - 체크포인트 재사용 "
+                      f"({'✅ 정답' if result['correct'] else '❌ 오답'})")
+                continue
+
             print(f"\n[{i+1:2d}/{len(samples)}] {sample['id']}")
             print(f"제목: {sample['title'][:50]}...")
             print(f"실제 라벨: {sample['label']}")
             
             # 분류 실행
             predicted, raw_output = self.classify_news(sample['title'], sample['content'])
+            if predicted is None:
+                self.failed.append({'id': sample['id'], 'title': sample['title'],
+                                    'actual': sample['label'], 'error': raw_output})
+                print("요청 실패 - 채점 제외 (다음 --resume 때 다시 시도)")
+                continue
             predicted_int = int(predicted) if predicted in ['0', '1'] else 0
             
             # 결과 기록
@@ -200,6 +211,8 @@ class LMStudioTester:
                 'timestamp': datetime.now().isoformat()
             }
             self.results.append(result)
+            if checkpoint is not None:
+                checkpoint.append(MODEL_NAME, SYSTEM_PROMPT, sample['id'], result)
             
             print(f"예측: {predicted_int} | 원본출력: '{raw_output}' | {'✅ 정답' if is_correct else '❌ 오답'}")
             print(f"현재 정확도: {correct}/{total} = {correct/total*100:.1f}%")
@@ -208,7 +221,7 @@ class LMStudioTester:
         
         # 최종 통계
         test_duration = datetime.now() - self.test_start_time
-        accuracy = correct / total
+        accuracy = correct / total if total else 0.0
         
         # 길이 점수 계산 (프롬프트 1976자 기준)
         prompt_length = len(SYSTEM_PROMPT)
@@ -225,7 +238,8 @@ class LMStudioTester:
             'length_score': length_score,
             'final_score': final_score,
             'test_duration': str(test_duration),
-            'target_score': 0.935
+            'target_score': 0.935,
+            'failed_samples': len(self.failed)
         }
         
         return stats
@@ -262,23 +276,28 @@ class LMStudioTester:
         """결과 저장"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        # 상세 결과 저장
-        with open(f'results/test_results_{timestamp}.json', 'w', encoding='utf-8') as f:
-            json.dump({
-                'statistics': stats,
-                'error_analysis': {
-                    'false_positives': len(error_analysis['false_positives']),
-                    'false_negatives': len(error_analysis['false_negatives']),
-                    'total_errors': error_analysis['total_errors']
-                },
-                'detailed_results': self.results
-            }, f, ensure_ascii=False, indent=2)
+        # 상세 결과 저장 (실행·프롬프트·샘플 단위 결과 저장소)
+        store = ResultsStore()
+        run_id = store.start_run('test_lmstudio', MODEL_NAME, meta={'statistics': stats})
+        store.add_result(run_id, {
+            'name': 'v1.3',
+            'length': stats['prompt_length'],
+            'accuracy': stats['accuracy'],
+            'correct': stats['correct_predictions'],
+            'total': stats['total_samples'],
+            'dacon_score': stats['final_score'],
+            'false_positives': len(error_analysis['false_positives']),
+            'false_negatives': len(error_analysis['false_negatives']),
+            'failed': self.failed,
+            'detailed_results': self.results
+        }, SYSTEM_PROMPT)
+        store.close()
         
         # 요약 리포트 저장
         report = f"""# DACON 자동차 뉴스 분류 테스트 결과
 
 ## 📊 성능 통계
-- **테스트 샘플**: {stats['total_samples']}개
+- **테스트 샘플**: {stats['total_samples']}개 (요청 실패 {stats['failed_samples']}개 제외)
 - **정답 수**: {stats['correct_predictions']}개
 - **정확도**: {stats['accuracy']:.1%} ({stats['accuracy']:.4f})
 - **프롬프트 길이**: {stats['prompt_length']}자
@@ -301,7 +320,7 @@ class LMStudioTester:
             f.write(report)
         
         print(f"\n💾 결과 저장 완료:")
-        print(f"- results/test_results_{timestamp}.json")
+        print(f"- {DEFAULT_RESULTS_DB} (run {run_id})")
         print(f"- results/test_report_{timestamp}.md")
 
 def main():
@@ -309,8 +328,11 @@ def main():
     print("🎯 DACON 자동차 뉴스 분류 테스트 - LMStudio")
     print("=" * 60)
     
-    # 테스터 초기화
-    tester = LMStudioTester()
+    # 테스터 초기화 (--constrain grammar|logprobs: 0/1 한 토큰 강제)
+    constrain = sys.argv[sys.argv.index('--constrain') + 1] if '--constrain' in sys.argv else None
+    # --endpoints PATH: 단일 원격 서버 대신 여러 서버 풀 사용
+    endpoints = sys.argv[sys.argv.index('--endpoints') + 1] if '--endpoints' in sys.argv else None
+    tester = LMStudioTester(constrain, endpoints)
     
     # 연결 테스트
     if not tester.test_connection():
@@ -327,8 +349,12 @@ def main():
         print("data/samples.csv 파일을 확인하세요.")
         return
     
-    # 테스트 실행
-    stats = tester.run_test(samples)
+    # 테스트 실행 (--resume: 이전 실행에서 끝난 샘플은 건너뜀)
+    checkpoint_path = f"{DEFAULT_CHECKPOINT_DIR}/test_lmstudio_{MODEL_NAME.replace('/', '_')}.jsonl"
+    with Checkpoint(checkpoint_path, resume='--resume' in sys.argv) as checkpoint:
+        if checkpoint.resumed:
+            print(f"체크포인트 재개: {checkpoint.resumed}건 완료됨 ({checkpoint_path})")
+        stats = tester.run_test(samples, checkpoint)
     
     # 결과 출력
     print("\n" + "=" * 60)
@@ -46,7 +46,7 @@ E)소재/부품: 자동차소재/차량부품/완성차납품→1, 건설/가전
 반드시 0또는1만 출력."""
 
 def test_single(title, content=""):
-    """단일 테스트 실행"""
+    """단일 테스트 실행 → (분류, content, reasoning) - 요청 실패 시 분류는 None"""
     user_message = f"제목: {title}"
     if content:
         user_message += f"\n내용: {content}"
@@ -90,11 +90,11 @@ def test_single(title, content=""):
             return classification, content_response, reasoning_response
         else:
             print(f"API 오류: {response.status_code}")
-            return "0", "ERROR", "ERROR"
+            return None, "ERROR", "ERROR"
             
     except Exception as e:
         print(f"요청 실패: {str(e)}")
-        return "0", "ERROR", "ERROR"
+        return None, "ERROR", "ERROR"
 
 def main():
     print("🎯 openai/gpt-oss-20b 모델 테스트")
@@ -130,6 +130,7 @@ def main():
     ]
     
     correct = 0
+    failed = 0  # 요청 실패 (채점 제외)
     total = len(test_cases)
     
     for i, case in enumerate(test_cases, 1):
@@ -137,6 +138,10 @@ def main():
         print(f"예상 답: {case['expected']}")
         
         classification, content, reasoning = test_single(case['title'], case['content'])
+        if classification is None:
+            failed += 1
+            time.sleep(1)
+            continue
         
         is_correct = classification == case['expected']
         if is_correct:
@@ -150,9 +155,15 @@ def main():
     
     print(f"\n" + "=" * 50)
     print(f"🎉 테스트 완료!")
-    print(f"정확도: {correct}/{total} = {correct/total*100:.1f}%")
+    answered = total - failed
+    if failed:
+        print(f"요청 실패: {failed}건 (채점 제외)")
+    if answered == 0:
+        print("❌ 모든 요청 실패 - 서버 상태 확인 필요")
+        return
+    print(f"정확도: {correct}/{answered} = {correct/answered*100:.1f}%")
     
-    if correct/total >= 0.8:
+    if correct/answered >= 0.8:
         print("✅ 기본 성능 확인! 전체 테스트 진행 가능")
     else:
         print("❌ 성능 부족. 프롬프트 조정 필요")
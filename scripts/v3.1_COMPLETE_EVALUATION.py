@@ -6,64 +6,85 @@ v3.1 IMPROVED 프롬프트 완전 자체 평가
 
 import csv
 import math
+import sys
+from pathlib import Path
 from typing import List, Dict, Tuple
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from daconprompt.matcher import KeywordMatcher, first_found
+
+# v3.1 즉시1 회사명 (해외회사 추가)
+V31_AUTO_COMPANIES = [
+    "현대차", "현대자동차", "기아", "삼성sdi", "lg에너지솔루션", 
+    "한온", "포티투", "채비", "한국타이어",
+    "닛산", "혼다", "토요타", "테슬라", "byd", "bmw", "폭스바겐", "gm", "포드"
+]
+
+# v3.1 즉시1 제품/기술/시장 키워드 (확장)
+V31_AUTO_KEYWORDS = [
+    "전기차", "ev", "suv", "하이브리드", "자율주행", "adas", 
+    "완성차", "oem", "충전인프라", "자동차시장", "전기차시장", 
+    "자동차산업", "완성차업계", "자동차업계", "차판매", "자동차연구원"
+]
+
+# 즉시0 주제 (순수 비자동차)
+V31_NON_AUTO_TOPICS = [
+    "정치", "국방", "우주", "의료", "교육", "게임", "문화",
+    "통신", "포털", "유통", "건설", "조선", "항공", "부동산", "금융"
+]
+
+# 위험케이스 (무조건 0)
+V31_RISK_CASES = [
+    "uam", "항공", "선박", "우주", "가전배터리", "ess배터리", "산업용배터리",
+    "서버반도체", "스마트폰반도체", "검색ai", "챗봇"
+]
+
+V31_AUTO_MENTIONS = ["자동차", "전기차", "완성차", "자율주행"]
+V31_GOV = ["정부", "정책", "지원", "투자"]
+V31_BATTERY_AUTO = ["전기차", "차량용", "ev"]
+V31_CHIP_AUTO = ["차량용", "자율주행"]
+
+# 모든 키워드 목록을 한 번에 찾는 매처 (본문 1회 스캔)
+V31_MATCHER = KeywordMatcher({
+    "companies": V31_AUTO_COMPANIES,
+    "keywords": V31_AUTO_KEYWORDS,
+    "non_auto": V31_NON_AUTO_TOPICS,
+    "risk": V31_RISK_CASES,
+    "auto_mentions": V31_AUTO_MENTIONS,
+    "gov": V31_GOV,
+    "context": ["배터리", "반도체"] + V31_BATTERY_AUTO + V31_CHIP_AUTO
+})
+
 def classify_with_v31_rules(title: str, content: str, sample_id: str) -> Tuple[int, str]:
     """v3.1 IMPROVED 규칙으로 분류"""
     text = (title + " " + content).lower()
-    
-    # v3.1 즉시1 회사명 (해외회사 추가)
-    auto_companies = [
-        "현대차", "현대자동차", "기아", "삼성sdi", "lg에너지솔루션", 
-        "한온", "포티투", "채비", "한국타이어",
-        "닛산", "혼다", "토요타", "테슬라", "byd", "bmw", "폭스바겐", "gm", "포드"
-    ]
-    
-    # v3.1 즉시1 제품/기술/시장 키워드 (확장)
-    auto_keywords = [
-        "전기차", "ev", "suv", "하이브리드", "자율주행", "adas", 
-        "완성차", "oem", "충전인프라", "자동차시장", "전기차시장", 
-        "자동차산업", "완성차업계", "자동차업계", "차판매", "자동차연구원"
-    ]
-    
-    # 즉시0 주제 (순수 비자동차)
-    non_auto_topics = [
-        "정치", "국방", "우주", "의료", "교육", "게임", "문화",
-        "통신", "포털", "유통", "건설", "조선", "항공", "부동산", "금융"
-    ]
-    
-    # 위험케이스 (무조건 0)
-    risk_cases = [
-        "uam", "항공", "선박", "우주", "가전배터리", "ess배터리", "산업용배터리",
-        "서버반도체", "스마트폰반도체", "검색ai", "챗봇"
-    ]
+    found = V31_MATCHER.found(text)
     
     # 위험케이스 체크
-    for risk in risk_cases:
-        if risk in text:
-            return 0, f"위험케이스: {risk}"
+    risk = first_found(V31_RISK_CASES, found)
+    if risk:
+        return 0, f"위험케이스: {risk}"
     
     # 즉시0 주제 체크 (자동차 언급 없음)
-    auto_mentioned = any(k in text for k in ["자동차", "전기차", "완성차", "자율주행"])
-    for topic in non_auto_topics:
-        if topic in text and not auto_mentioned:
-            return 0, f"즉시0주제: {topic} (자동차 언급 없음)"
+    auto_mentioned = any(k in found for k in V31_AUTO_MENTIONS)
+    topic = first_found(V31_NON_AUTO_TOPICS, found)
+    if topic and not auto_mentioned:
+        return 0, f"즉시0주제: {topic} (자동차 언급 없음)"
     
     # 즉시1 회사명 체크
-    has_company = any(company in text for company in auto_companies)
+    has_company = any(company in found for company in V31_AUTO_COMPANIES)
     if has_company:
         return 1, f"즉시1: 자동차회사명"
     
     # 즉시1 키워드 체크
-    has_keyword = any(keyword in text for keyword in auto_keywords)
+    has_keyword = any(keyword in found for keyword in V31_AUTO_KEYWORDS)
     if has_keyword:
         return 1, f"즉시1: 자동차키워드"
     
     # 정부정책 특별규칙
-    gov_keywords = ["정부", "정책", "지원", "투자"]
     auto_title_keywords = ["자동차", "전기차", "완성차", "자율주행"]
     
-    has_gov = any(k in text for k in gov_keywords)
+    has_gov = any(k in found for k in V31_GOV)
     has_auto_in_title = any(k in title.lower() for k in auto_title_keywords)
     
     if has_gov and has_auto_in_title:
@@ -72,13 +93,13 @@ def classify_with_v31_rules(title: str, content: str, sample_id: str) -> Tuple[i
         return 0, "정부정책: 제목에 자동차 미명시"
     
     # 배터리/반도체 규칙
-    if "배터리" in text:
-        if any(x in text for x in ["전기차", "차량용", "ev"]) or has_company:
+    if "배터리" in found:
+        if any(x in found for x in V31_BATTERY_AUTO) or has_company:
             return 1, "배터리: 전기차용/자동차회사"
         return 0, "배터리: 용도불명확"
     
-    if "반도체" in text:
-        if any(x in text for x in ["차량용", "자율주행"]) or has_company:
+    if "반도체" in found:
+        if any(x in found for x in V31_CHIP_AUTO) or has_company:
             return 1, "반도체: 차량용/자동차회사"
         return 0, "반도체: 용도불명확"
     
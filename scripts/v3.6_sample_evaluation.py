@@ -5,63 +5,83 @@ v3.6 SAMPLE_VERIFIED 프롬프트로 전체 샘플 323개 자체 평가
 
 import csv
 import math
+import sys
+from pathlib import Path
 from typing import List, Dict, Tuple
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from daconprompt.matcher import KeywordMatcher, first_found
+
+# v3.6 회사명
+V36_COMPANIES = [
+    "현대차", "현대자동차", "기아", "삼성sdi", "lg에너지솔루션", 
+    "한온", "포티투", "채비", "한국타이어", "닛산", "혼다", "토요타", 
+    "테슬라", "byd", "bmw", "폭스바겐", "gm", "포드"
+]
+
+# v3.6 키워드
+V36_KEYWORDS = [
+    "전기차", "ev", "suv", "하이브리드", "수소차", "자율주행", "adas", 
+    "완성차", "oem", "충전인프라", "자동차시장", "전기차시장", 
+    "자동차산업", "완성차업계", "자동차업계", "차판매", "모빌리티", "자동차연구원"
+]
+
+# 비자동차 분야
+V36_NON_AUTO = [
+    "정치", "국방", "우주", "의료", "교육", "게임", "문화", 
+    "통신", "포털", "유통", "건설", "조선", "항공", "부동산", "금융"
+]
+
+# 위험 케이스 (무조건 0)
+V36_DANGER = [
+    "uam", "항공", "선박", "우주", "가전배터리", "ess배터리", 
+    "서버반도체", "스마트폰반도체", "검색ai", "챗봇"
+]
+
+V36_AUTO_MENTIONS = ["자동차", "전기차", "완성차", "자율주행", "모빌리티"]
+V36_GOV = ["정부", "정책", "지원", "투입"]
+V36_BATTERY_AUTO = ["전기차용", "차량용", "ev용"]
+
+# 모든 키워드 목록을 한 번에 찾는 매처 (본문 1회 스캔)
+V36_MATCHER = KeywordMatcher({
+    "companies": V36_COMPANIES,
+    "keywords": V36_KEYWORDS,
+    "non_auto": V36_NON_AUTO,
+    "danger": V36_DANGER,
+    "auto_mentions": V36_AUTO_MENTIONS,
+    "gov": V36_GOV,
+    "battery": ["배터리"] + V36_BATTERY_AUTO
+})
+
 def classify_with_v36_rules(title: str, content: str, sample_id: str) -> Tuple[int, str]:
     """v3.6 규칙으로 분류"""
     text = (title + " " + content).lower()
     title_lower = title.lower()
-    
-    # v3.6 회사명
-    companies = [
-        "현대차", "현대자동차", "기아", "삼성sdi", "lg에너지솔루션", 
-        "한온", "포티투", "채비", "한국타이어", "닛산", "혼다", "토요타", 
-        "테슬라", "byd", "bmw", "폭스바겐", "gm", "포드"
-    ]
-    
-    # v3.6 키워드
-    keywords = [
-        "전기차", "ev", "suv", "하이브리드", "수소차", "자율주행", "adas", 
-        "완성차", "oem", "충전인프라", "자동차시장", "전기차시장", 
-        "자동차산업", "완성차업계", "자동차업계", "차판매", "모빌리티", "자동차연구원"
-    ]
-    
-    # 비자동차 분야
-    non_auto = [
-        "정치", "국방", "우주", "의료", "교육", "게임", "문화", 
-        "통신", "포털", "유통", "건설", "조선", "항공", "부동산", "금융"
-    ]
-    
-    # 위험 케이스 (무조건 0)
-    danger = [
-        "uam", "항공", "선박", "우주", "가전배터리", "ess배터리", 
-        "서버반도체", "스마트폰반도체", "검색ai", "챗봇"
-    ]
+    found = V36_MATCHER.found(text)
     
     # 위험케이스 체크
-    for d in danger:
-        if d in text:
-            return 0, f"위험케이스: {d}"
+    danger = first_found(V36_DANGER, found)
+    if danger:
+        return 0, f"위험케이스: {danger}"
     
     # 회사명이나 키워드 체크
-    found_company = [c for c in companies if c in text]
-    found_keyword = [k for k in keywords if k in text]
+    found_company = [c for c in V36_COMPANIES if c in found]
+    found_keyword = [k for k in V36_KEYWORDS if k in found]
     
     if found_company or found_keyword:
         return 1, f"회사명/키워드: {found_company + found_keyword}"
     
     # 순수 비자동차 + 자동차 언급 없음 체크
-    auto_mentions = any(x in text for x in ["자동차", "전기차", "완성차", "자율주행", "모빌리티"])
-    non_auto_found = [n for n in non_auto if n in text]
+    auto_mentions = any(x in found for x in V36_AUTO_MENTIONS)
+    non_auto_found = [n for n in V36_NON_AUTO if n in found]
     
     if non_auto_found and not auto_mentions:
         return 0, f"순수 비자동차: {non_auto_found}, 자동차 언급 없음"
     
     # 정부정책 특별규칙
-    gov_keywords = ["정부", "정책", "지원", "투입"]
     auto_title_keywords = ["자동차", "전기차", "완성차", "자율주행", "모빌리티"]
     
-    has_gov = any(k in text for k in gov_keywords)
+    has_gov = any(k in found for k in V36_GOV)
     has_auto_in_title = any(k in title_lower for k in auto_title_keywords)
     
     if has_gov:
@@ -71,9 +91,8 @@ def classify_with_v36_rules(title: str, content: str, sample_id: str) -> Tuple[i
             return 0, "정부정책: 제목에 자동차 키워드 없음"
     
     # 배터리 특별규칙
-    if "배터리" in text:
-        battery_auto = ["전기차용", "차량용", "ev용"]
-        if any(b in text for b in battery_auto) or found_company:
+    if "배터리" in found:
+        if any(b in found for b in V36_BATTERY_AUTO) or found_company:
             return 1, "배터리: 전기차용/차량용 또는 자동차회사 언급"
         return 0, "배터리: 용도 불명확"
     